@@ -1,13 +1,16 @@
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from .models import db
+from .logging_utils import ActivityLogWriter
+from .render_jobs import RenderQueue
 #from .auth import auth_bp, init_ssl_context
-from .auth import auth_bp
+from .auth import auth_bp, init_auth
 from .user_routes import user_bp
 from .admin_routes import admin_bp
 from .user_management import user_management_bp
 from .zone_routes import zone_bp
+from .render_routes import render_bp
 
 def create_app(config_object):
     app = Flask(__name__)
@@ -15,13 +18,24 @@ def create_app(config_object):
     
     # Initialize extensions
     CORS(app)
-    JWTManager(app)
+    init_auth(app, JWTManager(app))
     db.init_app(app)
+    ActivityLogWriter(app)
+    RenderQueue(app)
     
     # Create database tables
     with app.app_context():
         from .models import User, Zone
+        from .database import configure_sqlite
+        from .schema import upgrade_schema, create_activity_log_fts
+        configure_sqlite(app, db)
         db.create_all()
+        upgrade_schema(db)
+        app.extensions['activity_log_fts'] = create_activity_log_fts(db)
+        
+        # Blobs released by a process that stopped before collecting them
+        from .storage import collect_blobs
+        collect_blobs()
         
         # Create admin user if none exists
         if not User.query.filter_by(is_admin=True).first():
@@ -40,6 +54,23 @@ def create_app(config_object):
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     app.register_blueprint(user_management_bp, url_prefix='/api/user-management')
     app.register_blueprint(zone_bp, url_prefix='/api/zone')
+    app.register_blueprint(render_bp, url_prefix='/api/render')
+    
+    from .schema import register_commands
+    register_commands(app, db)
+    
+    @app.after_request
+    def add_json_etag(response):
+        # JSON reads get an ETag so clients can revalidate with If-None-Match
+        # and receive an empty 304 when nothing changed
+        if (request.method == 'GET' and response.status_code == 200
+                and response.mimetype == 'application/json'
+                and not response.direct_passthrough and 'ETag' not in response.headers):
+            response.add_etag()
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Authorization')
+            response = response.make_conditional(request)
+        return response
     
     @app.route('/chrome')
     def chrome_debug():
@@ -1,23 +1,13 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from .models import User
-from functools import wraps
 from .models import db
 from werkzeug.security import generate_password_hash
+from .auth import admin_required, current_identity
 from .logging_utils import log_user_creation, log_user_deletion, log_zone_creation, log_zone_deletion
 
 admin_bp = Blueprint('admin', __name__)
 
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        user_id = get_jwt_identity()
-        user = User.query.get(int(user_id))
-        if not user or not user.is_admin:
-            return jsonify({'error': 'Admin privileges required'}), 403
-        return f(*args, **kwargs)
-    return decorated_function
-
 @admin_bp.route('/users', methods=['GET'])
 @jwt_required()
 @admin_required
@@ -37,8 +27,7 @@ def get_users():
 @jwt_required()
 def create_user():
     """Create a new user (admin only)"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user or current_user.role != 'Responsable':
         return jsonify({'error': 'Insufficient privileges'}), 403
@@ -64,7 +53,7 @@ def create_user():
         db.session.commit()
         
         # Log user creation
-        log_user_creation(int(user_id), current_user.email, email)
+        log_user_creation(current_user.id, current_user.email, email)
         
         return jsonify({'message': 'User created successfully'}), 201
         
@@ -1,14 +1,116 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app, g
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 #from OpenSSL import SSL, crypto
-from .models import db, User
+from .models import db, User, TokenRevocation
 from functools import wraps
 from werkzeug.security import check_password_hash
-from datetime import timedelta
+from datetime import datetime, timedelta
+from collections import namedtuple
+import calendar
+import threading
+import time
 from .logging_utils import log_login_success, log_login_failure
 
 auth_bp = Blueprint('auth', __name__)
 
+# Who is making the request, as carried by the token claims
+Identity = namedtuple('Identity', ['id', 'email', 'role', 'is_admin'])
+
+class RevocationCache:
+    """
+    In-process copy of the token_revocation table.
+
+    A row means every token of that user issued before revoked_at must be
+    refused (the user was deleted or their role changed). The table is
+    re-read at most every AUTH_REVOCATION_REFRESH seconds, so checking a
+    token is a dict lookup; revocations made by this process apply at once,
+    those made by other workers within the refresh interval.
+    """
+
+    def __init__(self):
+        self._revoked = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        interval = current_app.config.get('AUTH_REVOCATION_REFRESH', 30)
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < interval:
+            return
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < interval:
+                return
+            rows = db.session.query(TokenRevocation.user_id, TokenRevocation.revoked_at).all()
+            self._revoked = {user_id: calendar.timegm(revoked_at.utctimetuple()) for user_id, revoked_at in rows}
+            self._loaded_at = time.monotonic()
+
+    def is_revoked(self, user_id, issued_at):
+        self._refresh()
+        revoked_at = self._revoked.get(user_id)
+        return revoked_at is not None and issued_at < revoked_at
+
+    def revoke(self, user_id):
+        """Refuse the user's existing tokens; the row is committed by the caller."""
+        now = datetime.utcnow().replace(microsecond=0)
+        entry = db.session.get(TokenRevocation, user_id)
+        if entry is None:
+            db.session.add(TokenRevocation(user_id=user_id, revoked_at=now))
+        else:
+            entry.revoked_at = now
+        self._revoked[user_id] = calendar.timegm(now.utctimetuple())
+
+def init_auth(app, jwt):
+    """Give the app its revocation cache and hook it into flask_jwt_extended."""
+    app.extensions['revocation_cache'] = RevocationCache()
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        cache = current_app.extensions['revocation_cache']
+        return cache.is_revoked(int(jwt_payload['sub']), jwt_payload.get('iat', 0))
+
+def revoke_user_tokens(user_id):
+    """Invalidate every token issued so far to a user (after deletion or a role change)."""
+    current_app.extensions['revocation_cache'].revoke(user_id)
+
+def get_current_user():
+    """Return the User behind the current token, loading it at most once per request."""
+    if 'current_user' not in g:
+        g.current_user = db.session.get(User, int(get_jwt_identity()))
+    return g.current_user
+
+def current_identity():
+    """
+    Return the Identity of the current token from its claims, without a
+    database round trip. Tokens issued before role claims existed fall back
+    to loading the user; returns None if that user no longer exists.
+    """
+    claims = get_jwt()
+    if 'role' in claims:
+        return Identity(int(claims['sub']), claims.get('email'), claims['role'], claims.get('is_admin', False))
+    user = get_current_user()
+    if user is None:
+        return None
+    return Identity(user.id, user.email, user.role, user.is_admin)
+
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        identity = current_identity()
+        if not identity or not identity.is_admin:
+            return jsonify({'error': 'Admin privileges required'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+def role_required(roles):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            identity = current_identity()
+            if not identity or identity.role not in roles:
+                return jsonify({'error': 'Insufficient privileges'}), 403
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
 #def verify_certificate(cert_str):
 #    """Verify client certificate against CA"""
 #    try:
@@ -53,8 +155,14 @@ def login():
     user = User.query.filter_by(email=email).first()
     
     if user and check_password_hash(user.password_hash, password):
+        # Role claims let handlers authorize without looking the user up again
         access_token = create_access_token(
             identity=str(user.id),
+            additional_claims={
+                'email': user.email,
+                'role': user.role,
+                'is_admin': user.is_admin
+            },
             expires_delta=timedelta(hours=24)
         )
         
@@ -0,0 +1,20 @@
+from sqlalchemy import event
+
+def configure_sqlite(app, db):
+    """
+    Apply SQLITE_PRAGMAS to every new SQLite connection.
+
+    WAL lets readers run while a writer holds the lock, synchronous=NORMAL
+    is safe under WAL and avoids an fsync per commit, busy_timeout makes
+    writers wait for the lock instead of failing with "database is locked".
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+
+    @event.listens_for(db.engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
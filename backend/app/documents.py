@@ -0,0 +1,19 @@
+"""
+.sincus documents on the server.
+
+The .sincus reader (utils.sincus_file), the document snapshot
+(functions.snapshot) and the PDF layout (functions.pdf_layout) are the
+desktop client's own Tk-free modules, imported from main/ next to the
+backend (where REPORT_LOGO already points), so the server reads and
+renders documents with exactly the client's code.
+"""
+import os
+import sys
+
+CLIENT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'main'))
+if CLIENT_DIR not in sys.path:
+    sys.path.append(CLIENT_DIR)
+
+from utils.sincus_file import SincusReader, SincusFormatError
+from functions.snapshot import snapshot_from_project
+from functions.pdf_layout import PDFLayout
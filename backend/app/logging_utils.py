@@ -1,12 +1,157 @@
-from flask import request, g
+from flask import request, g, current_app, has_request_context
 from .models import db, ActivityLog, User
 from datetime import datetime
+import atexit
 import json
+import os
+import queue
+import threading
+import time
+
+class ActivityLogWriter:
+    """
+    Writes ActivityLog rows from a background thread.
+
+    Requests only put a plain dict on a bounded queue; the writer thread
+    inserts them in batches, flushing when ``batch_size`` entries are waiting
+    or ``flush_interval`` seconds have passed. When the queue is full the
+    entry is dropped and counted rather than blocking the request.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.batch_size = 100
+        self.flush_interval = 1.0
+        self.max_queue_size = 10000
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.batch_size = app.config.get('ACTIVITY_LOG_BATCH_SIZE', self.batch_size)
+        self.flush_interval = app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL', self.flush_interval)
+        self.max_queue_size = app.config.get('ACTIVITY_LOG_QUEUE_SIZE', self.max_queue_size)
+        app.extensions['activity_log_writer'] = self
+        atexit.register(self.stop)
+
+    def _ensure_started(self):
+        # The thread is started lazily, and restarted in a forked worker
+        # process, since threads do not survive fork()
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+                self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, entry):
+        """Queue one log entry (a dict of ActivityLog columns) without blocking."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _next_batch(self):
+        """Block until a batch is ready (by size or by interval) and return it."""
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval))
+        except queue.Empty:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        if not batch:
+            return
+        with self.app.app_context():
+            try:
+                db.session.execute(ActivityLog.__table__.insert(), batch)
+                db.session.commit()
+                self.written += len(batch)
+            except Exception as e:
+                print(f"Error writing activity logs: {e}")
+                db.session.rollback()
+                self.failed += len(batch)
+            finally:
+                db.session.remove()
+            for _ in batch:
+                self._queue.task_done()
+
+    def _drain(self):
+        """Write out whatever is still queued, in batch_size chunks."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._write(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._write(self._next_batch())
+        self._drain()
+
+    def flush(self, timeout=None):
+        """Block until every entry queued so far has been written."""
+        if self._queue is None or self._pid != os.getpid():
+            return
+        if timeout is None:
+            self._queue.join()
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stop(self, timeout=5.0):
+        """Stop the writer thread after draining the queue."""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'backlog': self._queue.qsize() if self._queue is not None else 0,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'queue_size': self.max_queue_size,
+            'running': bool(self._thread and self._thread.is_alive())
+        }
 
 def log_activity(action, details=None, status="success", user_id=None, user_email=None):
     """
     Log user activity to the database
     
+    The entry is handed to the app's ActivityLogWriter and written in the
+    background; with ACTIVITY_LOG_ASYNC disabled it is committed inline.
+    
     Args:
         action (str): The action performed (e.g., "File Upload", "User Login")
         details (str, optional): Additional details about the action
@@ -21,21 +166,26 @@ def log_activity(action, details=None, status="success", user_id=None, user_emai
             user_email = g.user.email
         
         # Get request info
-        ip_address = request.remote_addr if request else None
-        user_agent = request.headers.get('User-Agent') if request else None
+        ip_address = request.remote_addr if has_request_context() else None
+        user_agent = request.headers.get('User-Agent') if has_request_context() else None
         
-        # Create log entry
-        log_entry = ActivityLog(
-            user_id=user_id,
-            user_email=user_email or "Unknown",
-            action=action,
-            details=details,
-            status=status,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
+        entry = {
+            'user_id': user_id,
+            'user_email': user_email or "Unknown",
+            'action': action,
+            'details': details,
+            'status': status,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'created_at': datetime.utcnow()
+        }
         
-        db.session.add(log_entry)
+        writer = current_app.extensions.get('activity_log_writer')
+        if writer is not None and current_app.config.get('ACTIVITY_LOG_ASYNC', True):
+            writer.enqueue(entry)
+            return
+        
+        db.session.add(ActivityLog(**entry))
         db.session.commit()
         
     except Exception as e:
@@ -93,6 +243,30 @@ def log_file_share(user_id, user_email, filename, shared_with_users, status="suc
         user_email=user_email
     )
 
+def log_bulk_file_share(user_id, user_email, action, filenames, user_emails, changed, status="success"):
+    """Log a bulk share/unshare as a single entry"""
+    verb = "Shared" if action == "share" else "Unshared"
+    details = (f"{verb} {len(filenames)} file(s) with {len(user_emails)} user(s), "
+               f"{changed} access change(s): files [{', '.join(filenames)}] users [{', '.join(user_emails)}]")
+    log_activity(
+        action="File Share" if action == "share" else "File Unshare",
+        details=details,
+        status=status,
+        user_id=user_id,
+        user_email=user_email
+    )
+
+def log_pdf_render(user_id, user_email, filename, status="success", error=None):
+    """Log the outcome of a server-side PDF render job"""
+    details = f"Rendered PDF: {filename}" if error is None else f"Failed to render PDF {filename}: {error}"
+    log_activity(
+        action="PDF Render",
+        details=details,
+        status=status,
+        user_id=user_id,
+        user_email=user_email
+    )
+
 def log_file_delete(user_id, user_email, filename, status="success"):
     """Log file deletion activity"""
     log_activity(
@@ -9,7 +9,7 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
-    role = db.Column(db.String(32), nullable=False, default='Geologue')  # 'Geologue', 'Geophysicien', 'Responsable'
+    role = db.Column(db.String(32), nullable=False, default='Geologue', index=True)  # 'Geologue', 'Geophysicien', 'Responsable'
     certificate_dn = db.Column(db.String(256), unique=True)  # Distinguished Name from client cert
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -26,21 +26,58 @@ class User(db.Model):
 # Association table for file access
 file_access = db.Table('file_access',
     db.Column('file_id', db.Integer, db.ForeignKey('file.id'), primary_key=True),
-    db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
+    # The primary key covers lookups by file_id; this one covers "files shared with a user"
+    db.Index('ix_file_access_user_id', 'user_id')
 )
 
 class File(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
     path = db.Column(db.String(512), nullable=False)
-    owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    sha256 = db.Column(db.String(64), db.ForeignKey('blob.sha256'))  # Content blob (None for files stored before the blob store)
+    size = db.Column(db.Integer)  # Size in bytes
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Keyset pagination order of the admin file listing
+    __table_args__ = (db.Index('ix_file_created_at_id', 'created_at', 'id'),)
+    
     # Many-to-many relationship for file access
     users_with_access = db.relationship('User', secondary=file_access,
                                       lazy='subquery',
                                       backref=db.backref('accessible_files', lazy=True))
 
+class Blob(db.Model):
+    """Content-addressed file bytes, shared by every File with the same SHA-256"""
+    sha256 = db.Column(db.String(64), primary_key=True)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class RenderJob(db.Model):
+    """A .sincus document queued for server-side PDF rendering"""
+    __tablename__ = 'render_job'
+    id = db.Column(db.Integer, primary_key=True)
+    owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    filename = db.Column(db.String(255), nullable=False)  # Name of the resulting File
+    status = db.Column(db.String(16), nullable=False, default='queued')  # 'queued', 'done', 'error'
+    error = db.Column(db.Text)
+    file_id = db.Column(db.Integer, db.ForeignKey('file.id', ondelete='SET NULL'))  # Set once done
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'error': self.error,
+            'file_id': self.file_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
 class Zone(db.Model):
     __tablename__ = 'zone'
     zoneId = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -49,19 +86,25 @@ class Zone(db.Model):
     bloc = db.Column(db.String(64), nullable=False)
     permis = db.Column(db.String(64), nullable=False) 
 
+class TokenRevocation(db.Model):
+    """Tokens of user_id issued before revoked_at are refused (no FK: outlives deleted users)"""
+    __tablename__ = 'token_revocation'
+    user_id = db.Column(db.Integer, primary_key=True)
+    revoked_at = db.Column(db.DateTime, nullable=False)
+
 class ActivityLog(db.Model):
     """Model for tracking user activities"""
     __tablename__ = 'activity_logs'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'), nullable=True, index=True)
     user_email = db.Column(db.String(120), nullable=False)  # Store email for quick access
-    action = db.Column(db.String(200), nullable=False)  # e.g., "File Upload", "User Login", "File Share"
+    action = db.Column(db.String(200), nullable=False, index=True)  # e.g., "File Upload", "User Login", "File Share"
     details = db.Column(db.Text)  # Additional details about the action
     status = db.Column(db.String(50), nullable=False)  # "success", "error", "warning"
     ip_address = db.Column(db.String(45))  # IPv4 or IPv6
     user_agent = db.Column(db.String(500))  # Browser/client info
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Relationship
     user = db.relationship('User', backref=db.backref('activity_logs', passive_deletes=True))
@@ -0,0 +1,155 @@
+import atexit
+import os
+import threading
+import concurrent.futures
+from datetime import datetime
+from .models import db, File, RenderJob, User
+from .rendering import render_to_file
+from .storage import StoredUpload, blob_tmp_dir, store_temp, abandon_blob, collect_blobs
+from .logging_utils import log_pdf_render
+
+# Error recorded on jobs the server stopped before rendering
+INTERRUPTED_ERROR = 'Interrupted by a server restart, submit the document again'
+
+
+class RenderQueue:
+    """
+    Runs PDF render jobs in a process pool.
+
+    The request only records a RenderJob row and submits the document; a
+    worker process lays out the PDF into the blob store's scratch directory
+    and the completion callback, back in this process, moves it into the
+    blob store, creates the File row and marks the job done. The pool is
+    created lazily and recreated in a forked server worker, so there is one
+    pool of max_workers processes per server process.
+
+    Documents are only kept in memory until rendered: jobs a stopped server
+    left queued are marked as failed by fail_interrupted(), which only the
+    server entry points (run.py, serve.py) call, not create_app(): CLI
+    commands such as db-upgrade also create the app, next to a live server.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.max_workers = 1
+        self.logo_path = None
+        self._executor = None
+        self._pid = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.max_workers = app.config.get('RENDER_WORKERS', self.max_workers)
+        self.logo_path = app.config.get('REPORT_LOGO')
+        app.extensions['render_queue'] = self
+        atexit.register(self.shutdown)
+
+    def fail_interrupted(self):
+        """Mark jobs still queued from an earlier server run as failed; returns how many."""
+        with self.app.app_context():
+            count = RenderJob.query.filter_by(status='queued').update({
+                'status': 'error',
+                'error': INTERRUPTED_ERROR,
+                'finished_at': datetime.utcnow()
+            }, synchronize_session=False)
+            db.session.commit()
+            return count
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+                self._pid = os.getpid()
+                self._pending = set()
+            return self._executor
+
+    def submit(self, job_id, document):
+        """Queue the rendering of document for RenderJob job_id."""
+        future = self._get_executor().submit(render_to_file, document, blob_tmp_dir(), self.logo_path)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return future
+
+    def _finish(self, job_id, future):
+        try:
+            self._record_result(job_id, future)
+        finally:
+            with self._done:
+                self._pending.discard(future)
+                self._done.notify_all()
+
+    def _record_result(self, job_id, future):
+        with self.app.app_context():
+            rendered = error = None
+            try:
+                rendered = StoredUpload(*future.result())
+                job = db.session.get(RenderJob, job_id)
+                stored = store_temp(rendered)
+                new_file = File(
+                    filename=job.filename,
+                    path=stored.path,
+                    owner_id=job.owner_id,
+                    sha256=stored.sha256,
+                    size=stored.size
+                )
+                db.session.add(new_file)
+                db.session.flush()
+                job.file_id = new_file.id
+                job.status = 'done'
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                error = str(e) or type(e).__name__
+                self._record_error(job_id, error, rendered)
+
+            job = db.session.get(RenderJob, job_id)
+            if job is not None:
+                user = db.session.get(User, job.owner_id)
+                log_pdf_render(job.owner_id, user.email if user else None, job.filename,
+                               status='success' if error is None else 'error', error=error)
+
+    def _record_error(self, job_id, error, rendered):
+        """Mark a job failed and drop its PDF (the rollback already undid its blob reference)."""
+        try:
+            if rendered is not None:
+                # Still in the scratch directory, or already moved into the blob store
+                if os.path.exists(rendered.path):
+                    os.remove(rendered.path)
+                abandon_blob(rendered.sha256, rendered.size)
+            job = db.session.get(RenderJob, job_id)
+            job.status = 'error'
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            # Left 'queued': fail_interrupted() reports it at the next start
+            db.session.rollback()
+            self.app.logger.error(f"Render job {job_id} failed and could not be recorded: {e}")
+            return
+        if rendered is not None:
+            collect_blobs()
+
+    def wait(self, timeout=None):
+        """Block until every job submitted so far has been recorded."""
+        with self._done:
+            pending = set(self._pending)
+            return self._done.wait_for(lambda: not (self._pending & pending), timeout)
+
+    def stats(self):
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                'pending': len(self._pending) if self._pid == os.getpid() else 0,
+                'workers': self.max_workers
+            }
+
+    def shutdown(self):
+        """Wait for running jobs and stop the pool."""
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,73 @@
+import os
+from datetime import datetime
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from werkzeug.utils import secure_filename
+from .models import db, RenderJob
+from .auth import current_identity
+from .rendering import RenderError, validate_document
+from .documents import SincusReader, SincusFormatError
+
+render_bp = Blueprint('render', __name__)
+
+@render_bp.route('/jobs', methods=['POST'])
+@jwt_required()
+def create_render_job():
+    """Queue a .sincus project document for rendering to PDF
+
+    Accepts either a multipart upload ('file', a .sincus file of either
+    version, read with the client's SincusReader) or a JSON
+    body {"document": {...}, "filename": "..."}. Returns 202 with the job
+    id; poll GET /jobs/<id> until its status is 'done' and use file_id.
+    """
+    user = current_identity()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    if 'file' in request.files:
+        upload = request.files['file']
+        try:
+            with SincusReader(upload.stream) as reader:
+                document = reader.to_dict()
+        except SincusFormatError:
+            return jsonify({'error': 'File is not a valid .sincus document'}), 400
+        name = request.form.get('filename') or os.path.splitext(upload.filename or '')[0]
+    else:
+        data = request.get_json(silent=True) or {}
+        document = data.get('document')
+        name = data.get('filename')
+
+    try:
+        validate_document(document)
+    except RenderError as e:
+        return jsonify({'error': str(e)}), 400
+
+    name = secure_filename(os.path.splitext(name or '')[0])
+    if not name:
+        name = f"render_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    job = RenderJob(owner_id=user.id, filename=f"{name}.pdf")
+    db.session.add(job)
+    db.session.commit()
+
+    current_app.extensions['render_queue'].submit(job.id, document)
+
+    return jsonify({
+        'message': 'Render job queued',
+        'job_id': job.id,
+        'status': job.status
+    }), 202
+
+@render_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_render_job(job_id):
+    """Get the status of a render job (owner or Responsable)"""
+    user = current_identity()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    job = RenderJob.query.get_or_404(job_id)
+    if job.owner_id != user.id and user.role != 'Responsable':
+        return jsonify({'error': 'Not authorized'}), 403
+
+    return jsonify(job.to_dict()), 200
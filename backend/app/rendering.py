@@ -0,0 +1,52 @@
+"""
+Server-side rendering of .sincus project documents to PDF.
+
+Documents are rendered with the desktop client's own layout (PDFLayout,
+from a snapshot of the document, see app.documents), so server and client
+PDFs stay identical. render_to_file() runs in a worker process.
+"""
+import os
+import hashlib
+import tempfile
+from .documents import snapshot_from_project, PDFLayout
+
+
+class RenderError(ValueError):
+    """The document cannot be rendered (malformed .sincus content)."""
+
+
+def validate_document(document):
+    """Check the shape of a .sincus document; raises RenderError."""
+    if not isinstance(document, dict):
+        raise RenderError('Document must be a JSON object')
+    if not isinstance(document.get('project_info', {}), dict):
+        raise RenderError('project_info must be an object')
+    pages = document.get('pages_data')
+    if not isinstance(pages, list) or not pages:
+        raise RenderError('Document has no pages')
+    if not all(isinstance(page, list) and all(isinstance(column, dict) for column in page) for page in pages):
+        raise RenderError('pages_data must be a list of pages of column objects')
+    if not isinstance(document.get('log_boxes_data', []), list):
+        raise RenderError('log_boxes_data must be a list')
+
+
+def render_to_file(document, directory, logo_path=None):
+    """
+    Render a document to a new temporary PDF in directory.
+
+    Runs in a worker process: returns (path, sha256, size) so the parent
+    can move the file into the blob store without re-reading it.
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            PDFLayout(logo_path).render(snapshot_from_project(document), out, trailing_page=False)
+        digest = hashlib.sha256()
+        with open(tmp_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        return tmp_path, digest.hexdigest(), os.path.getsize(tmp_path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
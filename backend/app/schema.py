@@ -0,0 +1,105 @@
+import click
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+
+def upgrade_schema(db):
+    """
+    Bring an existing database up to date with the models.
+
+    db.create_all() only creates missing tables, so columns added to an
+    existing model are added here with ALTER TABLE. Only nullable columns
+    (or columns with a server default) can be added this way.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+                added.append(f'{table.name}.{column.name}')
+    return added
+
+def create_missing_indexes(db):
+    """
+    Create the model indexes an existing database does not have yet.
+
+    Each index is built in its own short transaction; under WAL readers
+    keep going while it is built and writers wait up to busy_timeout.
+    """
+    inspector = inspect(db.engine)
+    created = []
+    for table in db.metadata.sorted_tables:
+        existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            with db.engine.begin() as conn:
+                index.create(bind=conn, checkfirst=True)
+            created.append(index.name)
+    return created
+
+ACTIVITY_LOG_FTS_DDL = [
+    """CREATE VIRTUAL TABLE activity_logs_fts USING fts5(
+        details, content='activity_logs', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS activity_logs_fts_insert AFTER INSERT ON activity_logs BEGIN
+        INSERT INTO activity_logs_fts(rowid, details) VALUES (new.id, new.details);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS activity_logs_fts_delete AFTER DELETE ON activity_logs BEGIN
+        INSERT INTO activity_logs_fts(activity_logs_fts, rowid, details) VALUES ('delete', old.id, old.details);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS activity_logs_fts_update AFTER UPDATE OF details ON activity_logs BEGIN
+        INSERT INTO activity_logs_fts(activity_logs_fts, rowid, details) VALUES ('delete', old.id, old.details);
+        INSERT INTO activity_logs_fts(rowid, details) VALUES (new.id, new.details);
+    END""",
+]
+
+def create_activity_log_fts(db):
+    """
+    Create the FTS5 index over ActivityLog.details, kept in sync by triggers.
+
+    The first time, the index is rebuilt from the existing rows. Returns
+    False when the database is not SQLite or SQLite lacks FTS5, in which
+    case searches fall back to LIKE.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    with db.engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activity_logs_fts'"
+        )).first()
+        if exists:
+            return True
+        try:
+            for statement in ACTIVITY_LOG_FTS_DDL:
+                conn.execute(text(statement))
+        except OperationalError:
+            # SQLite built without FTS5
+            return False
+        conn.execute(text("INSERT INTO activity_logs_fts(activity_logs_fts) VALUES ('rebuild')"))
+    return True
+
+def register_commands(app, db):
+    @app.cli.command('db-upgrade')
+    def db_upgrade():
+        """Add missing columns and indexes to an existing database."""
+        db.create_all()
+        for column in upgrade_schema(db):
+            click.echo(f'Added column {column}')
+        for index in create_missing_indexes(db):
+            click.echo(f'Created index {index}')
+        if create_activity_log_fts(db):
+            click.echo('Activity log full-text index ready')
+        with db.engine.begin() as conn:
+            if db.engine.dialect.name == 'sqlite':
+                mode = conn.execute(text('PRAGMA journal_mode')).scalar()
+                click.echo(f'Journal mode: {mode}')
+                conn.execute(text('PRAGMA optimize'))
+        click.echo('Database is up to date')
@@ -0,0 +1,196 @@
+import os
+import hashlib
+import tempfile
+import threading
+from collections import namedtuple
+from datetime import datetime
+import magic
+from flask import current_app
+from sqlalchemy import update, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .models import db, Blob
+
+# Size of the chunks copied from the upload stream
+CHUNK_SIZE = 64 * 1024
+# Bytes needed by libmagic to recognise a PDF (the signature is at offset 0)
+SNIFF_SIZE = 2048
+
+StoredUpload = namedtuple('StoredUpload', ['path', 'sha256', 'size'])
+
+_mime = None
+_mime_lock = threading.Lock()
+
+def sniff_mime(head):
+    """Return the MIME type of a file from its first bytes."""
+    global _mime
+    with _mime_lock:
+        if _mime is None:
+            _mime = magic.Magic(mime=True)
+        return _mime.from_buffer(head)
+
+def _read_head(stream, size):
+    """Read up to size bytes, looping over short reads."""
+    head = b''
+    while len(head) < size:
+        chunk = stream.read(size - len(head))
+        if not chunk:
+            break
+        head += chunk
+    return head
+
+def blob_root():
+    """Root directory of the content-addressed blob store."""
+    return current_app.config.get('BLOB_FOLDER') or os.path.join(current_app.config['UPLOAD_FOLDER'], 'blobs')
+
+def blob_path(sha256):
+    """Path of a blob, fanned out over two directory levels (ab/cd/abcd...)."""
+    return os.path.join(blob_root(), sha256[:2], sha256[2:4], sha256)
+
+def blob_tmp_dir():
+    """Scratch directory for files being written, on the same filesystem as the blobs."""
+    return os.path.join(blob_root(), 'tmp')
+
+def stream_to_temp(file_storage, directory, mimetype='application/pdf'):
+    """
+    Copy an uploaded file to a temporary file in directory.
+
+    The type is checked from the first bytes before anything is written;
+    the rest is copied in chunks while its SHA-256 and size are computed.
+
+    Returns a StoredUpload for the temporary file, or None if the content
+    is not of the expected type.
+    """
+    stream = file_storage.stream
+    head = _read_head(stream, SNIFF_SIZE)
+    if sniff_mime(head) != mimetype:
+        return None
+
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256(head)
+    size = len(head)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(head)
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    return StoredUpload(tmp_path, digest.hexdigest(), size)
+
+def store_upload(file_storage, mimetype='application/pdf'):
+    """
+    Store an upload in the blob store and take a reference on it.
+
+    Identical content is kept once: if the blob already exists the
+    temporary copy is discarded. The reference is added to the current
+    session, so it is committed together with the File row pointing to it.
+
+    Returns a StoredUpload for the blob, or None if the type is rejected.
+    """
+    tmp = stream_to_temp(file_storage, blob_tmp_dir(), mimetype)
+    if tmp is None:
+        return None
+    return store_temp(tmp)
+
+def store_temp(tmp):
+    """
+    Move a finished temporary file (a StoredUpload in blob_tmp_dir()) into
+    the blob store and take a reference on it, as store_upload() does.
+
+    The reference is taken first: writing it holds the database write lock
+    until the caller commits, so collect_blobs() cannot unlink the bytes
+    between the check below and the commit (see collect_blobs()).
+    """
+    acquire_blob(tmp.sha256, tmp.size)
+
+    path = blob_path(tmp.sha256)
+    if os.path.exists(path):
+        os.remove(tmp.path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp.path, path)
+    return StoredUpload(path, tmp.sha256, tmp.size)
+
+def acquire_blob(sha256, size):
+    """Add one reference to a blob, creating its row if needed."""
+    stmt = sqlite_insert(Blob).values(sha256=sha256, size=size, ref_count=1, created_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Blob.sha256],
+        set_={'ref_count': Blob.ref_count + 1}
+    )
+    db.session.execute(stmt)
+
+def abandon_blob(sha256, size):
+    """
+    Leave a blob to collect_blobs() after the reference store_temp() took
+    on it was rolled back: its row is created at ref_count 0 if missing, so
+    bytes moved into the store are removed unless something references them.
+    """
+    stmt = sqlite_insert(Blob).values(sha256=sha256, size=size, ref_count=0, created_at=datetime.utcnow())
+    db.session.execute(stmt.on_conflict_do_nothing(index_elements=[Blob.sha256]))
+
+def release_blob(sha256):
+    """
+    Drop one reference to a blob in the current session.
+
+    A blob left without references keeps its row (at ref_count 0) and its
+    bytes until collect_blobs() runs after the commit.
+    """
+    db.session.execute(
+        update(Blob).where(Blob.sha256 == sha256).values(ref_count=Blob.ref_count - 1)
+    )
+
+def release_file(file):
+    """
+    Delete a File row in the current session and release its blob.
+
+    Returns the path to unlink once committed for files stored before the
+    blob store, or None (blob bytes are left to collect_blobs()).
+    """
+    db.session.delete(file)
+    if file.sha256:
+        release_blob(file.sha256)
+        return None
+    return file.path
+
+def collect_blobs():
+    """
+    Delete the blobs nothing references any more, rows and bytes, in a
+    transaction of their own; returns how many were removed.
+
+    The DELETE takes the database write lock and keeps it until the commit,
+    after the bytes are unlinked. acquire_blob() writes too, so an upload
+    referencing one of these blobs again, in any server process, either
+    commits first (and the row is no longer at zero) or runs after the
+    commit, finds the bytes gone and puts its own copy in place. If the
+    commit fails the rows stay at zero and the next collection (after the
+    next delete, or at start-up) retries.
+    """
+    try:
+        orphans = db.session.execute(
+            delete(Blob).where(Blob.ref_count <= 0).returning(Blob.sha256)
+        ).scalars().all()
+        for sha256 in orphans:
+            path = blob_path(sha256)
+            if os.path.exists(path):
+                os.remove(path)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning(f"Blob collection failed: {e}")
+        return 0
+    return len(orphans)
+
+def remove_files(paths):
+    """Unlink the files of deleted pre-blob-store File rows, once committed."""
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
@@ -1,23 +1,14 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from .models import User, db
 from werkzeug.security import generate_password_hash
-from functools import wraps
 import re
+from .auth import admin_required, current_identity, revoke_user_tokens
 from .logging_utils import log_user_creation, log_user_deletion
+from .storage import release_file, collect_blobs, remove_files
 
 user_management_bp = Blueprint('user_management', __name__)
 
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        user_id = get_jwt_identity()
-        user = User.query.get(int(user_id))
-        if not user or not user.is_admin:
-            return jsonify({'error': 'Admin privileges required'}), 403
-        return f(*args, **kwargs)
-    return decorated_function
-
 def validate_email(email):
     """Validate email format"""
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -81,10 +72,8 @@ def create_user():
         db.session.commit()
         
         # Log user creation
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(int(current_user_id))
-        if current_user:
-            log_user_creation(int(current_user_id), current_user.email, new_user.email)
+        current_user = current_identity()
+        log_user_creation(current_user.id, current_user.email, new_user.email)
         
         return jsonify({
             'message': 'Utilisateur créé avec succès',
@@ -112,17 +101,21 @@ def delete_user(email):
             return jsonify({'error': 'Utilisateur non trouvé'}), 404
         
         # Prevent admin from deleting themselves
-        current_user_id = get_jwt_identity()
-        if int(current_user_id) == user.id:
+        current_user = current_identity()
+        if current_user.id == user.id:
             return jsonify({'error': 'Vous ne pouvez pas supprimer votre propre compte'}), 400
         
         # Log user deletion before deleting
-        current_user = User.query.get(int(current_user_id))
-        if current_user:
-            log_user_deletion(int(current_user_id), current_user.email, user.email)
+        log_user_deletion(current_user.id, current_user.email, user.email)
         
+        # Tokens already issued to the deleted user stop working
+        revoke_user_tokens(user.id)
+        # The user's files go with them, releasing their blobs
+        legacy_paths = [release_file(file) for file in user.owned_files]
         db.session.delete(user)
         db.session.commit()
+        remove_files(legacy_paths)
+        collect_blobs()
         
         return jsonify({'message': 'Utilisateur supprimé avec succès'}), 200
         
@@ -1,19 +1,50 @@
 import os
+import base64
 from flask import Blueprint, request, jsonify, current_app, send_file
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from werkzeug.utils import secure_filename
-import magic
-from .models import db, User, File
+from .models import db, User, File, ActivityLog, file_access
 from datetime import datetime
-from .logging_utils import log_file_upload, log_file_download, log_file_share, log_file_delete, log_user_creation, log_user_deletion
+from sqlalchemy import and_, or_, text, select, delete, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .auth import current_identity, get_current_user
+from .storage import store_upload, release_file, collect_blobs, remove_files
+from .logging_utils import log_file_upload, log_file_download, log_file_share, log_bulk_file_share, log_file_delete, log_user_creation, log_user_deletion
 # from .auth import require_cert
 
 user_bp = Blueprint('user', __name__)
 
-def allowed_file(filename):
-    """Check if the file is a PDF."""
-    mime = magic.Magic(mime=True)
-    return mime.from_file(filename) == 'application/pdf'
+ADMIN_FILES_DEFAULT_LIMIT = 100
+ADMIN_FILES_MAX_LIMIT = 500
+ACTIVITY_LOGS_DEFAULT_LIMIT = 100
+ACTIVITY_LOGS_MAX_LIMIT = 500
+BULK_SHARE_MAX_FILES = 500
+BULK_SHARE_MAX_USERS = 200
+
+def encode_cursor(created_at, row_id):
+    """Build an opaque keyset cursor from the last row of a page."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on malformed input."""
+    raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    created_at, row_id = raw.rsplit('|', 1)
+    return datetime.fromisoformat(created_at), int(row_id)
+
+def _parse_datetime_arg(name):
+    """Parse an optional ISO-8601 query argument."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.fromisoformat(value)
+
+def _parse_int_arg(name):
+    """Parse an optional integer query argument; ValueError if present but not an integer."""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    return int(value)
 
 @user_bp.route('/files/upload', methods=['POST'])
 @jwt_required()
@@ -25,19 +56,19 @@ def upload_file():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     access_list = request.form.getlist('access')
-    user_id = get_jwt_identity()
-    user_upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], str(user_id))
-    os.makedirs(user_upload_dir, exist_ok=True)
+    current_user = current_identity()
+    if not current_user:
+        return jsonify({'error': 'User not found'}), 404
     filename = secure_filename(file.filename or 'unknown.pdf')
-    filepath = os.path.join(user_upload_dir, filename)
-    file.save(filepath)
-    if not allowed_file(filepath):
-        os.remove(filepath)
+    stored = store_upload(file)
+    if stored is None:
         return jsonify({'error': 'File must be a PDF'}), 400
     new_file = File(
         filename=filename,
-        path=filepath,
-        owner_id=user_id
+        path=stored.path,
+        owner_id=current_user.id,
+        sha256=stored.sha256,
+        size=stored.size
     )
     if access_list:
         users = User.query.filter(User.email.in_(access_list)).all()
@@ -46,9 +77,7 @@ def upload_file():
     db.session.commit()
     
     # Log file upload
-    current_user = User.query.get(int(user_id))
-    if current_user:
-        log_file_upload(int(user_id), current_user.email, filename)
+    log_file_upload(current_user.id, current_user.email, filename)
     
     return jsonify({
         'message': 'File uploaded successfully',
@@ -67,15 +96,10 @@ def export_pdf():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
+    user = current_identity()
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
-    # Create user-specific upload directory
-    user_upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], str(user_id))
-    os.makedirs(user_upload_dir, exist_ok=True)
-    
     # Generate filename with timestamp if not provided
     if file.filename == 'export.pdf':
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -83,25 +107,25 @@ def export_pdf():
     else:
         filename = secure_filename(file.filename or 'export.pdf')
     
-    filepath = os.path.join(user_upload_dir, filename)
-    file.save(filepath)
-    
-    # Verify it's a PDF
-    if not allowed_file(filepath):
-        os.remove(filepath)
+    # Stream into the blob store, rejecting anything that is not a PDF from its first bytes;
+    # re-exports of identical bytes share one blob
+    stored = store_upload(file)
+    if stored is None:
         return jsonify({'error': 'File must be a PDF'}), 400
     
     # Save to database
     new_file = File(
         filename=filename,
-        path=filepath,
-        owner_id=user_id
+        path=stored.path,
+        owner_id=user.id,
+        sha256=stored.sha256,
+        size=stored.size
     )
     db.session.add(new_file)
     db.session.commit()
     
     # Log file upload
-    log_file_upload(int(user_id), user.email, filename)
+    log_file_upload(user.id, user.email, filename)
     
     return jsonify({
         'message': 'PDF exported successfully',
@@ -116,8 +140,9 @@ def export_pdf():
 #@require_cert
 def get_user_files():
     """Get files owned by or shared with the current user"""
-    user_id = get_jwt_identity()
-    user = User.query.get_or_404(int(user_id))
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
     
     owned_files = [{
         'id': file.id,
@@ -142,9 +167,16 @@ def get_user_files():
 @user_bp.route('/admin/files', methods=['GET'])
 @jwt_required()
 def get_all_files():
-    """Get all files in the system (admin only)"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    """Get all files in the system, one keyset page at a time (admin only)
+
+    Query parameters:
+        limit: page size (default 100, max 500)
+        cursor: opaque ``next_cursor`` returned by the previous page
+        owner: exact owner email
+        created_after / created_before: ISO-8601 bounds on ``created_at``
+        filename_prefix: only files whose name starts with this string
+    """
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -153,31 +185,76 @@ def get_all_files():
     if current_user.role != 'Responsable':
         return jsonify({'error': 'Insufficient privileges'}), 403
     
-    # Get all files in the system
-    all_files = File.query.all()
-    
-    files_data = []
-    for file in all_files:
-        is_owner = file.owner_id == int(user_id)
-        files_data.append({
-            'id': file.id,
-            'filename': file.filename,
-            'created_at': file.created_at.isoformat(),
-            'owner': file.owner.email,
-            'is_owner': is_owner
-        })
+    try:
+        limit = int(request.args.get('limit', ADMIN_FILES_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    limit = max(1, min(limit, ADMIN_FILES_MAX_LIMIT))
+    
+    # Owner emails come from the join, so rendering a page is a single query
+    query = db.session.query(
+        File.id, File.filename, File.created_at, File.owner_id, User.email
+    ).join(User, File.owner_id == User.id)
+    
+    owner = request.args.get('owner')
+    if owner:
+        query = query.filter(User.email == owner)
+    
+    prefix = request.args.get('filename_prefix')
+    if prefix:
+        query = query.filter(File.filename.startswith(prefix, autoescape=True))
+    
+    try:
+        created_after = _parse_datetime_arg('created_after')
+        created_before = _parse_datetime_arg('created_before')
+    except ValueError:
+        return jsonify({'error': 'Invalid date, expected ISO-8601'}), 400
+    if created_after:
+        query = query.filter(File.created_at >= created_after)
+    if created_before:
+        query = query.filter(File.created_at < created_before)
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(or_(
+            File.created_at < cursor_created_at,
+            and_(File.created_at == cursor_created_at, File.id < cursor_id)
+        ))
+    
+    # Newest first; id breaks ties so the order (and the cursor) is stable
+    rows = query.order_by(File.created_at.desc(), File.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    files_data = [{
+        'id': row.id,
+        'filename': row.filename,
+        'created_at': row.created_at.isoformat(),
+        'owner': row.email,
+        'is_owner': row.owner_id == current_user.id
+    } for row in rows]
+    
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
     
     return jsonify({
         'files': files_data,
-        'total_count': len(files_data)
+        'count': len(files_data),
+        # Pre-pagination name, kept for existing clients (files in this page)
+        'total_count': len(files_data),
+        'next_cursor': next_cursor
     }), 200
 
 @user_bp.route('/files/<int:file_id>', methods=['DELETE'])
 @jwt_required()
 def delete_file(file_id):
     """Delete a file"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -185,22 +262,20 @@ def delete_file(file_id):
     file = File.query.get_or_404(file_id)
     
     # Check if user owns the file OR is an admin (Responsable)
-    if file.owner_id != int(user_id) and current_user.role != 'Responsable':
+    if file.owner_id != current_user.id and current_user.role != 'Responsable':
         return jsonify({'error': 'You can only delete files you own'}), 403
     
     try:
-        # Remove file from disk
-        if os.path.exists(file.path):
-            os.remove(file.path)
-        
-        # Remove from database
-        db.session.delete(file)
+        # Remove from database, dropping this file's reference to its blob
+        legacy_path = release_file(file)
         db.session.commit()
         
+        # Remove bytes from disk once nothing references them
+        remove_files([legacy_path])
+        collect_blobs()
+        
         # Log file deletion
-        current_user = User.query.get(int(user_id))
-        if current_user:
-            log_file_delete(file_id, file.filename, int(user_id))
+        log_file_delete(current_user.id, current_user.email, file.filename)
         
         return jsonify({'message': 'File deleted successfully'}), 200
         
@@ -212,9 +287,9 @@ def delete_file(file_id):
 @jwt_required()
 #@require_cert
 def update_access(file_id):
-    user_id = get_jwt_identity()
+    current_user = current_identity()
     file = File.query.get_or_404(file_id)
-    if file.owner_id != int(user_id):
+    if not current_user or file.owner_id != current_user.id:
         return jsonify({'error': 'Not authorized'}), 403
     data = request.get_json()
     if not data or 'access_list' not in data:
@@ -224,9 +299,7 @@ def update_access(file_id):
     db.session.commit()
     
     # Log file sharing
-    current_user = User.query.get(int(user_id))
-    if current_user:
-        log_file_share(file_id, file.filename, int(user_id), [user.email for user in users])
+    log_file_share(current_user.id, current_user.email, file.filename, [user.email for user in users])
     
     return jsonify({
         'message': 'Access list updated',
@@ -237,8 +310,7 @@ def update_access(file_id):
 @jwt_required()
 #@require_cert
 def download_file(file_id):
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -246,31 +318,35 @@ def download_file(file_id):
     file = File.query.get_or_404(file_id)
     
     # Check if user owns the file, has access, OR is an admin (Responsable)
-    has_access = (file.owner_id == int(user_id) or 
-                  int(user_id) in [u.id for u in file.users_with_access] or
+    has_access = (file.owner_id == current_user.id or 
+                  current_user.id in [u.id for u in file.users_with_access] or
                   current_user.role == 'Responsable')
     
     if not has_access:
         return jsonify({'error': 'Not authorized'}), 403
     
-    # Log file download
-    current_user = User.query.get(int(user_id))
-    if current_user:
-        log_file_download(file_id, file.filename, int(user_id))
-    
-    return send_file(
+    # Strong ETag from the content hash; conditional=True answers
+    # If-None-Match with 304 and Range/If-Range with 206 Partial Content
+    response = send_file(
         file.path,
         as_attachment=True,
         download_name=file.filename,
-        mimetype='application/pdf'
+        mimetype='application/pdf',
+        conditional=True,
+        etag=file.sha256 or True
     )
+    
+    # Log file download (revalidations that transfer nothing are not downloads)
+    if response.status_code != 304:
+        log_file_download(current_user.id, current_user.email, file.filename)
+    
+    return response
 
 @user_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_user_profile():
     """Get current user's profile information"""
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
+    user = get_current_user()
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
@@ -286,8 +362,7 @@ def get_user_profile():
 @jwt_required()
 def get_geologues():
     """Get all Geologue users for file sharing"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -309,8 +384,7 @@ def get_geologues():
 @jwt_required()
 def get_available_users():
     """Get all available users (Geologues and Geophysiciens) for file sharing"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -334,8 +408,7 @@ def get_available_users():
 @jwt_required()
 def share_file(file_id):
     """Share a file with other users"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -343,7 +416,7 @@ def share_file(file_id):
     file = File.query.get_or_404(file_id)
     
     # Check if user owns the file OR is an admin (Responsable)
-    if file.owner_id != int(user_id) and current_user.role != 'Responsable':
+    if file.owner_id != current_user.id and current_user.role != 'Responsable':
         return jsonify({'error': 'You can only share files you own'}), 403
     
     data = request.get_json()
@@ -360,17 +433,16 @@ def share_file(file_id):
     
     # Add users to file access
     shared_with = []
+    existing_ids = {user.id for user in file.users_with_access}
     for user in users_to_share_with:
-        if user not in file.users_with_access:
+        if user.id not in existing_ids:
             file.users_with_access.append(user)
             shared_with.append(user.email)
     
     db.session.commit()
     
     # Log file sharing
-    current_user = User.query.get(int(user_id))
-    if current_user:
-        log_file_share(file_id, file.filename, int(user_id), shared_with)
+    log_file_share(current_user.id, current_user.email, file.filename, shared_with)
     
     return jsonify({
         'message': f'File shared with {len(shared_with)} user(s)',
@@ -381,8 +453,7 @@ def share_file(file_id):
 @jwt_required()
 def unshare_file(file_id):
     """Unshare a file from specific users"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -390,7 +461,7 @@ def unshare_file(file_id):
     file = File.query.get_or_404(file_id)
     
     # Check if user owns the file OR is an admin (Responsable)
-    if file.owner_id != int(user_id) and current_user.role != 'Responsable':
+    if file.owner_id != current_user.id and current_user.role != 'Responsable':
         return jsonify({'error': 'You can only unshare files you own'}), 403
     
     data = request.get_json()
@@ -407,29 +478,136 @@ def unshare_file(file_id):
     
     # Remove users from file access
     removed_from = []
+    existing_ids = {user.id for user in file.users_with_access}
     for user in users_to_remove:
-        if user in file.users_with_access:
+        if user.id in existing_ids:
             file.users_with_access.remove(user)
             removed_from.append(user.email)
     
     db.session.commit()
     
     # Log file unsharing
-    current_user = User.query.get(int(user_id))
-    if current_user:
-        log_file_share(file_id, file.filename, int(user_id), removed_from)
+    log_file_share(current_user.id, current_user.email, file.filename, removed_from)
     
     return jsonify({
         'message': f'Access removed for {len(removed_from)} user(s)',
         'removed_from': removed_from
     }), 200
 
+@user_bp.route('/files/bulk-share', methods=['POST'])
+@jwt_required()
+def bulk_share_files():
+    """Grant or revoke access for many files x many users in one transaction
+
+    JSON body:
+        file_ids: files to update (at most 500)
+        user_ids: users to grant or revoke (at most 200)
+        action: 'share' (default) or 'unshare'
+
+    As for a single file, only the owner or a Responsable may share: if any
+    existing file belongs to someone else the whole request is refused with
+    403. Files that do not exist are reported and skipped; the others are
+    updated with set-based inserts/deletes on file_access and a single
+    activity-log entry. Results are returned per file.
+    """
+    current_user = current_identity()
+    
+    if not current_user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    action = data.get('action', 'share')
+    if action not in ('share', 'unshare'):
+        return jsonify({'error': "action must be 'share' or 'unshare'"}), 400
+    
+    try:
+        file_ids = list(dict.fromkeys(int(file_id) for file_id in data.get('file_ids', [])))
+        user_ids = list(dict.fromkeys(int(user_id) for user_id in data.get('user_ids', [])))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'file_ids and user_ids must be lists of integers'}), 400
+    
+    if not file_ids or not user_ids:
+        return jsonify({'error': 'No files or users specified'}), 400
+    if len(file_ids) > BULK_SHARE_MAX_FILES or len(user_ids) > BULK_SHARE_MAX_USERS:
+        return jsonify({'error': f'At most {BULK_SHARE_MAX_FILES} files and {BULK_SHARE_MAX_USERS} users per request'}), 400
+    
+    users = {user_id: email for user_id, email in db.session.execute(
+        select(User.id, User.email).where(User.id.in_(user_ids))
+    )}
+    if not users:
+        return jsonify({'error': 'No valid users found'}), 400
+    
+    files = {file_id: (filename, owner_id) for file_id, filename, owner_id in db.session.execute(
+        select(File.id, File.filename, File.owner_id).where(File.id.in_(file_ids))
+    )}
+    
+    # Check if user owns the files OR is an admin (Responsable)
+    if current_user.role != 'Responsable':
+        foreign = [file_id for file_id, (_, owner_id) in files.items() if owner_id != current_user.id]
+        if foreign:
+            return jsonify({'error': 'You can only share files you own', 'file_ids': sorted(foreign)}), 403
+    
+    results = {}
+    allowed = []
+    for file_id in file_ids:
+        if file_id not in files:
+            results[file_id] = {'status': 'not_found'}
+        else:
+            allowed.append(file_id)
+            results[file_id] = {'status': 'ok', 'changed': []}
+    
+    changed = 0
+    if allowed:
+        existing = set(db.session.execute(
+            select(file_access.c.file_id, file_access.c.user_id).where(
+                file_access.c.file_id.in_(allowed),
+                file_access.c.user_id.in_(list(users))
+            )
+        ).all())
+        
+        try:
+            if action == 'share':
+                pairs = [(file_id, user_id) for file_id in allowed for user_id in users
+                         if (file_id, user_id) not in existing]
+                if pairs:
+                    db.session.execute(
+                        sqlite_insert(file_access).on_conflict_do_nothing(),
+                        [{'file_id': file_id, 'user_id': user_id} for file_id, user_id in pairs]
+                    )
+            else:
+                pairs = sorted(existing)
+                if pairs:
+                    db.session.execute(
+                        delete(file_access).where(
+                            tuple_(file_access.c.file_id, file_access.c.user_id).in_(pairs)
+                        )
+                    )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': f'Error updating access: {str(e)}'}), 500
+        
+        for file_id, user_id in pairs:
+            results[file_id]['changed'].append(users[user_id])
+        changed = len(pairs)
+        
+        log_bulk_file_share(current_user.id, current_user.email, action,
+                            [files[file_id][0] for file_id in allowed],
+                            list(users.values()), changed)
+    
+    return jsonify({
+        'message': f'{changed} access change(s) applied to {len(allowed)} file(s)',
+        'action': action,
+        'results': [dict(file_id=file_id, **results[file_id]) for file_id in file_ids]
+    }), 200
+
 @user_bp.route('/files/<int:file_id>/shared-users', methods=['GET'])
 @jwt_required()
 def get_shared_users(file_id):
     """Get list of users who have access to a specific file"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -437,7 +615,7 @@ def get_shared_users(file_id):
     file = File.query.get_or_404(file_id)
     
     # Check if user owns the file OR is an admin (Responsable)
-    if file.owner_id != int(user_id) and current_user.role != 'Responsable':
+    if file.owner_id != current_user.id and current_user.role != 'Responsable':
         return jsonify({'error': 'Not authorized to view shared users'}), 403
     
     return jsonify({
@@ -453,8 +631,7 @@ def get_shared_users(file_id):
 @jwt_required()
 def get_users_for_sharing(file_id):
     """Get all users for file sharing, including the file owner"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -462,7 +639,7 @@ def get_users_for_sharing(file_id):
     file = File.query.get_or_404(file_id)
     
     # Check if user owns the file OR is an admin (Responsable)
-    if file.owner_id != int(user_id) and current_user.role != 'Responsable':
+    if file.owner_id != current_user.id and current_user.role != 'Responsable':
         return jsonify({'error': 'Not authorized to share this file'}), 403
     
     # Get all users (Geologues and Geophysiciens)
@@ -494,9 +671,17 @@ def get_users_for_sharing(file_id):
 @user_bp.route('/activity-logs', methods=['GET'])
 @jwt_required()
 def get_activity_logs():
-    """Get activity logs (admin only)"""
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
+    """Get activity logs, newest first, one keyset page at a time (admin only)
+
+    Query parameters:
+        limit: page size (default 100, max 500)
+        cursor: opaque ``next_cursor`` returned by the previous page
+        user_id / user_email: only this user's activity
+        action, status: exact match
+        since / until: ISO-8601 bounds on ``created_at``
+        q: full-text search over ``details``
+    """
+    current_user = current_identity()
     
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
@@ -505,11 +690,76 @@ def get_activity_logs():
     if current_user.role != 'Responsable':
         return jsonify({'error': 'Insufficient privileges'}), 403
     
-    # Get logs ordered by newest first
-    from .models import ActivityLog
-    logs = ActivityLog.query.order_by(ActivityLog.created_at.desc()).limit(100).all()
+    try:
+        limit = int(request.args.get('limit', ACTIVITY_LOGS_DEFAULT_LIMIT))
+        filter_user_id = _parse_int_arg('user_id')
+        since = _parse_datetime_arg('since')
+        until = _parse_datetime_arg('until')
+    except ValueError:
+        return jsonify({'error': 'Invalid query parameter'}), 400
+    limit = max(1, min(limit, ACTIVITY_LOGS_MAX_LIMIT))
+    
+    query = ActivityLog.query
+    if filter_user_id is not None:
+        query = query.filter(ActivityLog.user_id == filter_user_id)
+    for column in ('user_email', 'action', 'status'):
+        value = request.args.get(column)
+        if value:
+            query = query.filter(getattr(ActivityLog, column) == value)
+    if since:
+        query = query.filter(ActivityLog.created_at >= since)
+    if until:
+        query = query.filter(ActivityLog.created_at < until)
+    
+    search = request.args.get('q', '').strip()
+    if search:
+        if current_app.extensions.get('activity_log_fts'):
+            # Every word must match, as a prefix; quoting keeps FTS5 syntax out of user input
+            match = ' '.join('"' + word.replace('"', '""') + '"*' for word in search.split())
+            matching_ids = text('SELECT rowid FROM activity_logs_fts WHERE activity_logs_fts MATCH :match')
+            query = query.filter(ActivityLog.id.in_(matching_ids.bindparams(match=match)))
+        else:
+            query = query.filter(ActivityLog.details.contains(search, autoescape=True))
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(or_(
+            ActivityLog.created_at < cursor_created_at,
+            and_(ActivityLog.created_at == cursor_created_at, ActivityLog.id < cursor_id)
+        ))
+    
+    logs = query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(limit + 1).all()
+    has_more = len(logs) > limit
+    logs = logs[:limit]
+    
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(logs[-1].created_at, logs[-1].id)
     
     return jsonify({
         'logs': [log.to_dict() for log in logs],
-        'total_count': len(logs)
-    }), 200 
\ No newline at end of file
+        'total_count': len(logs),
+        'next_cursor': next_cursor
+    }), 200 
+
+@user_bp.route('/activity-logs/writer-stats', methods=['GET'])
+@jwt_required()
+def get_activity_log_writer_stats():
+    """Get background activity-log writer counters (admin only)"""
+    current_user = current_identity()
+    
+    if not current_user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    if current_user.role != 'Responsable':
+        return jsonify({'error': 'Insufficient privileges'}), 403
+    
+    writer = current_app.extensions.get('activity_log_writer')
+    if writer is None:
+        return jsonify({'error': 'Activity log writer not configured'}), 404
+    
+    return jsonify(writer.stats()), 200
\ No newline at end of file
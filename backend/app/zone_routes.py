@@ -1,23 +1,11 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from .models import db, Zone, User
+from flask_jwt_extended import jwt_required
+from .models import db, Zone
+from .auth import role_required, current_identity
 from .logging_utils import log_zone_creation, log_zone_deletion
 
 zone_bp = Blueprint('zone', __name__)
 
-def role_required(roles):
-    def decorator(f):
-        from functools import wraps
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            user_id = get_jwt_identity()
-            user = User.query.get(int(user_id))
-            if not user or user.role not in roles:
-                return jsonify({'error': 'Insufficient privileges'}), 403
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
-
 @zone_bp.route('/zones', methods=['GET'])
 @jwt_required()
 def get_zones():
@@ -50,11 +38,9 @@ def add_zone():
     db.session.commit()
     
     # Log zone creation
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
-    if current_user:
-        zone_info = {'sigle': zone.sigle, 'puits': zone.puits, 'bloc': zone.bloc, 'permis': zone.permis}
-        log_zone_creation(int(user_id), current_user.email, zone_info)
+    current_user = current_identity()
+    zone_info = {'sigle': zone.sigle, 'puits': zone.puits, 'bloc': zone.bloc, 'permis': zone.permis}
+    log_zone_creation(current_user.id, current_user.email, zone_info)
     
     return jsonify({'message': 'Zone added', 'zoneId': zone.zoneId}), 201
 
@@ -69,10 +55,8 @@ def delete_zone(zone_id):
     db.session.commit()
     
     # Log zone deletion
-    user_id = get_jwt_identity()
-    current_user = User.query.get(int(user_id))
-    if current_user:
-        zone_info = {'sigle': zone.sigle, 'puits': zone.puits, 'bloc': zone.bloc, 'permis': zone.permis}
-        log_zone_deletion(int(user_id), current_user.email, zone_info)
+    current_user = current_identity()
+    zone_info = {'sigle': zone.sigle, 'puits': zone.puits, 'bloc': zone.bloc, 'permis': zone.permis}
+    log_zone_deletion(current_user.id, current_user.email, zone_info)
     
     return jsonify({'message': 'Zone deleted'}), 200 
\ No newline at end of file
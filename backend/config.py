@@ -8,13 +8,33 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(BASE_DIR, 'instance', 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Applied to every SQLite connection (see app/database.py)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,  # ms
+        'mmap_size': 256 * 1024 * 1024,
+    }
     
     # JWT settings
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'dev-secret-key')  # Change in production
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    AUTH_REVOCATION_REFRESH = 30  # seconds between re-reads of revoked tokens
+    
+    # Activity log settings (entries are written in batches by a background thread)
+    ACTIVITY_LOG_ASYNC = True
+    ACTIVITY_LOG_BATCH_SIZE = 100
+    ACTIVITY_LOG_FLUSH_INTERVAL = 1.0  # seconds
+    ACTIVITY_LOG_QUEUE_SIZE = 10000
+    
+    # Server-side PDF rendering: a process pool in each server process, so
+    # serve.py runs SERVER_WORKERS x RENDER_WORKERS renderers in total
+    RENDER_WORKERS = int(os.environ.get('RENDER_WORKERS', 1))
+    REPORT_LOGO = os.path.join(BASE_DIR, '..', 'main', 'images', 'Sonatrach.png')
     
     # File upload settings
     UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
+    BLOB_FOLDER = None  # Content-addressed store, defaults to UPLOAD_FOLDER/blobs
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     
     # SSL/TLS Configuration
@@ -27,6 +47,14 @@ class Config:
     HOST = 'localhost'
     PORT = 5000
     
+    # Production server (serve.py): pre-forked workers, each with a thread pool
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', (os.cpu_count() or 1) * 2 + 1))
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4))
+    SERVER_TIMEOUT = 60  # seconds before a stuck worker is killed and replaced
+    SERVER_GRACEFUL_TIMEOUT = 30  # seconds given to in-flight requests on reload/stop
+    SERVER_KEEPALIVE = 5  # seconds
+    SERVER_MAX_REQUESTS = 5000  # recycle workers periodically (0 disables)
+    
     # Create required directories
     @staticmethod
     def init_app():
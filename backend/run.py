@@ -5,6 +5,8 @@ app = create_app(Config)
 
 if __name__ == '__main__':
     Config.init_app()  # Create necessary directories
+    # Render jobs whose documents were lost when the server stopped
+    app.extensions['render_queue'].fail_interrupted()
     app.run(
         host=Config.HOST,
         port=Config.PORT,
@@ -0,0 +1,66 @@
+"""
+Production entry point: runs the app under gunicorn with TLS.
+
+The app is created once in the master process (preload), so db.create_all(),
+the schema upgrade and the admin bootstrap run once, then forked into
+SERVER_WORKERS workers with SERVER_THREADS threads each.
+
+    python backend/serve.py
+
+Send SIGHUP to the master for a graceful reload of the workers, SIGTERM to
+stop after in-flight requests finish. gunicorn needs a POSIX system; on
+Windows keep using run.py (startbackend.bat).
+"""
+from gunicorn.app.base import BaseApplication
+
+from app import create_app
+from app.models import db
+from config import Config
+
+
+def post_fork(server, worker):
+    """Drop SQLite connections inherited from the master; each worker opens its own."""
+    with worker.app.application.app_context():
+        db.engine.dispose(close=False)
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def server_options(config):
+    """gunicorn settings derived from the Config class."""
+    return {
+        'bind': f'{config.HOST}:{config.PORT}',
+        'workers': config.SERVER_WORKERS,
+        'threads': config.SERVER_THREADS,
+        'worker_class': 'gthread',
+        'preload_app': True,
+        'timeout': config.SERVER_TIMEOUT,
+        'graceful_timeout': config.SERVER_GRACEFUL_TIMEOUT,
+        'keepalive': config.SERVER_KEEPALIVE,
+        'max_requests': config.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': config.SERVER_MAX_REQUESTS // 10,
+        'certfile': config.SERVER_CERT,
+        'keyfile': config.SERVER_KEY,
+        'post_fork': post_fork,
+    }
+
+
+if __name__ == '__main__':
+    Config.init_app()  # Create necessary directories, check certificates
+    app = create_app(Config)
+    # Render jobs whose documents were lost when the server stopped, failed
+    # once in the master, before the workers are forked
+    app.extensions['render_queue'].fail_interrupted()
+    ProductionServer(app, server_options(Config)).run()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Backend endpoint benchmarks over a seeded SQLite database
+
+Seeds a temporary database through create_app() with the requested volumes,
+then drives the endpoints through the Flask test client and reports p50/p95
+latency, throughput and SQL statements per request. Results are written as
+JSON so runs can be compared across commits:
+
+    python benchmarks/backend_bench.py --users 1000 --files 200000 --logs 2000000 -o before.json
+    python benchmarks/backend_bench.py ... -o after.json --compare before.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import threading
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime, timedelta
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from sqlalchemy import event, insert
+from werkzeug.security import generate_password_hash
+from app import create_app
+from app.models import db, User, File, Blob, Zone, ActivityLog, file_access
+from app.storage import blob_path
+from config import Config
+
+SEED_CHUNK = 10000
+PASSWORD = 'Bench1234'
+ROLES = ['Geologue', 'Geophysicien']
+ACTIONS = ['User Login', 'File Upload', 'File Download', 'File Share', 'Zone Creation']
+WORDS = ['grès', 'argile', 'calcaire', 'dolomie', 'carotte', 'puits', 'NWT-2', 'HMD', 'ohanet', 'sigle']
+PDF_BYTES = b"%PDF-1.4\n" + b"1 0 obj << /Type /Catalog >> endobj\n" * 30000 + b"%%EOF\n"
+
+
+def make_app(tmp_dir):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'bench.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_FLUSH_INTERVAL = 0.2
+    return create_app(BenchConfig)
+
+
+def _insert_chunks(table, rows):
+    """Insert an iterable of row dicts in SEED_CHUNK batches."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == SEED_CHUNK:
+            db.session.execute(insert(table), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(table), batch)
+    db.session.commit()
+
+
+def seed(app, users, files, logs, zones, shares_per_file, rng):
+    """Fill the database with synthetic users, files, shares, zones and logs."""
+    base = datetime(2024, 1, 1)
+    password_hash = generate_password_hash(PASSWORD)
+    with app.app_context():
+        # Every File row points at the same real blob so downloads have bytes to send
+        path = blob_path('0' * 64)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(PDF_BYTES)
+        db.session.add(Blob(sha256='0' * 64, size=len(PDF_BYTES), ref_count=files))
+        db.session.commit()
+
+        first_user = db.session.query(db.func.max(User.id)).scalar() + 1
+        _insert_chunks(User.__table__, ({
+            'email': f'user{i}@bench.example',
+            'password_hash': password_hash,
+            'is_admin': False,
+            'role': ROLES[i % len(ROLES)],
+            'created_at': base
+        } for i in range(users)))
+        user_ids = list(range(first_user, first_user + users))
+
+        _insert_chunks(File.__table__, ({
+            'filename': f'{rng.choice(WORDS)}_{i}.pdf',
+            'path': path,
+            'owner_id': rng.choice(user_ids),
+            'sha256': '0' * 64,
+            'size': len(PDF_BYTES),
+            'created_at': base + timedelta(seconds=i * 30)
+        } for i in range(files)))
+
+        _insert_chunks(file_access, (
+            {'file_id': file_id, 'user_id': user_id}
+            for file_id in range(1, files + 1)
+            for user_id in set(rng.sample(user_ids, min(shares_per_file, len(user_ids))))
+        ))
+
+        _insert_chunks(Zone.__table__, ({
+            'sigle': f'Z{i}', 'puits': f'Puits {i}', 'bloc': str(200 + i % 50), 'permis': rng.choice(WORDS)
+        } for i in range(zones)))
+
+        _insert_chunks(ActivityLog.__table__, ({
+            'user_id': rng.choice(user_ids),
+            'user_email': f'user{i % users}@bench.example',
+            'action': rng.choice(ACTIONS),
+            'details': ' '.join(rng.choice(WORDS) for _ in range(6)) + f' #{i}',
+            'status': 'error' if i % 50 == 0 else 'success',
+            'created_at': base + timedelta(seconds=i * 5)
+        } for i in range(logs)))
+
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine by the request thread
+    (the activity-log writer's background batches are not counted)."""
+
+    def __init__(self, engine):
+        self.count = 0
+        self.thread_id = threading.get_ident()
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        if threading.get_ident() == self.thread_id:
+            self.count += 1
+
+
+def measure(name, call, iterations, warmup, counter):
+    """Time call() and return latency, throughput and statements per request."""
+    for _ in range(warmup):
+        call()
+    latencies = []
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        response = call()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{name}: HTTP {response.status_code} {response.get_data(as_text=True)[:200]}')
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(latencies), 3),
+        'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'max_ms': round(latencies[-1], 3),
+        'throughput_rps': round(iterations / elapsed, 1),
+        'queries_per_request': round(counter.count / iterations, 2),
+    }
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        t0 = time.perf_counter()
+        seed(app, args.users, args.files, args.logs, args.zones, args.shares, rng)
+        seed_seconds = time.perf_counter() - t0
+
+        client = app.test_client()
+
+        def login(email, password):
+            response = client.post('/api/auth/login', json={'email': email, 'password': password})
+            return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+        admin = login('admin@example.com', 'admin123')
+        user = login(f'user{rng.randrange(args.users)}@bench.example', PASSWORD)
+        with app.app_context():
+            counter = QueryCounter(db.engine)
+        cursor = client.get('/api/user/admin/files', headers=admin).get_json()['next_cursor']
+
+        def upload():
+            return client.post('/api/user/files/upload', headers=user, data={
+                'file': (io.BytesIO(PDF_BYTES), 'bench.pdf')
+            }, content_type='multipart/form-data')
+
+        scenarios = {
+            'user_files': lambda: client.get('/api/user/files', headers=user),
+            'admin_files_first_page': lambda: client.get('/api/user/admin/files', headers=admin),
+            'admin_files_next_page': lambda: client.get('/api/user/admin/files', query_string={'cursor': cursor}, headers=admin),
+            'admin_files_prefix': lambda: client.get('/api/user/admin/files', query_string={'filename_prefix': 'carotte_1'}, headers=admin),
+            'activity_logs_first_page': lambda: client.get('/api/user/activity-logs', headers=admin),
+            'activity_logs_search': lambda: client.get('/api/user/activity-logs', query_string={'q': 'dolomie ohanet'}, headers=admin),
+            'activity_logs_status': lambda: client.get('/api/user/activity-logs', query_string={'status': 'error'}, headers=admin),
+            'zones': lambda: client.get('/api/zone/zones', headers=user),
+            'upload': upload,
+            'download': lambda: client.get(f'/api/user/files/{rng.randint(1, args.files)}/download', headers=admin),
+        }
+        selected = args.only or list(scenarios)
+
+        results = {}
+        for name in selected:
+            results[name] = measure(name, scenarios[name], args.iterations, args.warmup, counter)
+            print(f"{name:28s} p50 {results[name]['p50_ms']:9.2f} ms  p95 {results[name]['p95_ms']:9.2f} ms  "
+                  f"{results[name]['throughput_rps']:8.1f} req/s  {results[name]['queries_per_request']:6.2f} queries")
+
+        app.extensions['activity_log_writer'].stop()
+
+    return {
+        'meta': {
+            'benchmark': 'backend',
+            'commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed_seconds': round(seed_seconds, 1),
+            'volumes': {'users': args.users, 'files': args.files, 'logs': args.logs,
+                        'zones': args.zones, 'shares_per_file': args.shares},
+            'iterations': args.iterations,
+            'random_seed': args.seed,
+        },
+        'results': results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, metrics=('p50_ms', 'p95_ms', 'queries_per_request')):
+    """Print the relative change of each metric against a previous results file."""
+    print(f"\nCompared with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}):")
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before:
+            continue
+        changes = []
+        for metric in metrics:
+            old, new = before.get(metric), result.get(metric)
+            if old:
+                changes.append(f"{metric} {new - old:+.2f} ({(new - old) / old * 100:+.1f}%)")
+        print(f"{name:28s} " + '  '.join(changes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--files', type=int, default=200000)
+    parser.add_argument('--logs', type=int, default=2000000)
+    parser.add_argument('--zones', type=int, default=500)
+    parser.add_argument('--shares', type=int, default=1, help='users each file is shared with')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', nargs='+', help='scenarios to run (default: all)')
+    parser.add_argument('-o', '--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='previous JSON results to compare against')
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+    return results
+
+
+if __name__ == '__main__':
+    main()
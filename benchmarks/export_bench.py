@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+PDF export benchmarks over synthetic projects
+
+Generates projects in the structure save_project() writes (N pages, M log
+boxes per page, textures, long descriptions), renders each one through the
+client's PDFExporter from a document snapshot (no display needed), and
+reports end-to-end time, time per stage (header table, ruler, log boxes,
+texture overlay, save), peak Python memory and PDF size. With --workers the
+projects are rendered through parallel_export instead (stage times are then
+not available, and peak memory is the parent process's: the chunks are
+rendered in the workers and merged from disk). Results are written as JSON
+so runs can be compared across commits:
+
+    python benchmarks/export_bench.py --pages 1 10 50 --boxes 20 -o before.json
+    python benchmarks/export_bench.py --pages 1 10 50 --boxes 20 -o after.json --compare before.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import platform
+import statistics
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# Make the desktop client importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'main'))
+
+from reportlab.pdfgen import canvas as pdf_canvas
+from functions.export_pdf import PDFExporter
+from functions.parallel_export import render_snapshot
+from functions.snapshot import snapshot_from_project
+
+COLUMNS_PER_PAGE = 8
+STAGES = ['header_table', 'ruler', 'log_boxes', 'texture_overlay', 'save']
+MATERIALS = ['#FFFF00', '#808080', '#0000FF', '#FF69B4', '#D2B48C', '#FFA500', '#000000', '#006400']
+TEXTURES = ['', '...', '- - -', '~ ~ ~', 'o o o', '/ / /']
+WORDS = ['Grès', 'fin', 'à', 'moyen', 'argileux', 'micacé', 'bien', 'classé', 'ciment', 'siliceux',
+         'traces', 'de', 'pyrite', 'stratification', 'oblique', 'passées', 'silteuses', 'fissuré']
+
+PROJECT_INFO = {
+    'carotte_summary': "Carotté : 18 m Récupéré : 18m soit 100%", 'puits': 'Nord West Trig-2',
+    'sigle': 'NWT-2', 'permis': 'Ohanet II', 'bloc': '234a', 'echelle': '1/40',
+    'carottier': '12440525', 'mud_type': 'OBM', 'carotte': '11', 'couronne': '6" x 2 5/8"',
+    'd_value': '1,08', 'tete': '2930m', 'core_type': 'Ci3126', 'fun_vis': '46', 'pied': '3948m'
+}
+
+
+def synthetic_project(pages, boxes, description_words, rng):
+    """A project dict in the save_project() .sincus structure."""
+    pages_data = []
+    log_boxes_data = []
+    for _ in range(pages):
+        columns = []
+        for col in range(COLUMNS_PER_PAGE):
+            words = description_words if col == COLUMNS_PER_PAGE - 1 else 3
+            lines = [' '.join(rng.choice(WORDS) for _ in range(12)) for _ in range(max(words // 12, 1))]
+            content = '\n'.join(lines)
+            columns.append({'content': content, 'bold_ranges': [('1.0', '1.5')] if col % 2 else []})
+        pages_data.append(columns)
+        log_boxes_data.append([{
+            'bg_color': rng.choice(MATERIALS),
+            'material_name': 'Autre',
+            'texture': rng.choice(TEXTURES),
+            'height': rng.randint(10, 40),
+            'expandable': False
+        } for _ in range(boxes)])
+    return {
+        'project_info': dict(PROJECT_INFO),
+        'pages_data': pages_data,
+        'log_boxes_data': log_boxes_data,
+        'font_size': 12,
+        'version': '1.0'
+    }
+
+
+@contextmanager
+def _timed(cls, name, totals, stage):
+    """Accumulate the time spent in cls.name into totals[stage] while active."""
+    original = getattr(cls, name)
+
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            totals[stage] += time.perf_counter() - t0
+
+    setattr(cls, name, wrapper)
+    try:
+        yield
+    finally:
+        setattr(cls, name, original)
+
+
+def export_parallel(project, workers, out=None, trace_memory=False):
+    """
+    Export a project with parallel_export; return (pdf bytes, seconds, peak bytes).
+
+    With out (a path) the PDF is written there and None is returned in its
+    place. Peak memory is the parent process's, and None unless trace_memory.
+    """
+    snapshot = snapshot_from_project(project)
+    if trace_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    pdf = render_snapshot(snapshot, out, workers=workers)
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return pdf, elapsed, peak
+
+
+def export_once(project, trace_memory=False):
+    """
+    Export a project; return (pdf bytes, seconds, per-stage seconds, peak bytes).
+
+    tracemalloc slows allocation-heavy code down a lot, so peak memory is
+    only measured (and reported as None otherwise) when trace_memory is set.
+    """
+    snapshot = snapshot_from_project(project)
+    exporter = PDFExporter(app=None)
+    totals = dict.fromkeys(STAGES + ['_header_total'], 0.0)
+    if trace_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    with _timed(PDFExporter, '_draw_header', totals, '_header_total'), \
+            _timed(PDFExporter, '_draw_pdf_ruler', totals, 'ruler'), \
+            _timed(PDFExporter, '_draw_pdf_log_boxes', totals, 'log_boxes'), \
+            _timed(PDFExporter, '_draw_texture_overlay', totals, 'texture_overlay'), \
+            _timed(pdf_canvas.Canvas, 'save', totals, 'save'):
+        pdf = exporter.render(snapshot)
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    # The texture overlay runs inside the log boxes, which run inside the header
+    totals['header_table'] = totals.pop('_header_total') - totals['ruler'] - totals['log_boxes']
+    totals['log_boxes'] -= totals['texture_overlay']
+    return pdf, elapsed, totals, peak
+
+
+def bench_project(project, iterations, warmup):
+    for _ in range(warmup):
+        export_once(project)
+    times = []
+    stages = {stage: [] for stage in STAGES}
+    for _ in range(iterations):
+        pdf, elapsed, totals, _ = export_once(project)
+        times.append(elapsed * 1000)
+        for stage in STAGES:
+            stages[stage].append(totals[stage] * 1000)
+    times.sort()
+    _, _, _, peak = export_once(project, trace_memory=True)
+    return {
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(times), 3),
+        'p95_ms': round(times[min(len(times) - 1, int(len(times) * 0.95))], 3),
+        'mean_ms': round(statistics.fmean(times), 3),
+        'stages_ms': {stage: round(statistics.median(values), 3) for stage, values in stages.items()},
+        'peak_memory_kb': round(peak / 1024, 1),
+        'pdf_bytes': len(pdf),
+    }
+
+
+def bench_parallel(project, iterations, warmup, workers):
+    """Like bench_project, through parallel_export (no stage times: most of the
+    work happens in the worker processes). Peak memory is measured writing to
+    a file, as the app's export does."""
+    for _ in range(warmup):
+        export_parallel(project, workers)
+    times = []
+    for _ in range(iterations):
+        pdf, elapsed, _ = export_parallel(project, workers)
+        times.append(elapsed * 1000)
+    times.sort()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _, _, peak = export_parallel(project, workers, os.path.join(tmp_dir, 'export.pdf'), trace_memory=True)
+    return {
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(times), 3),
+        'p95_ms': round(times[min(len(times) - 1, int(len(times) * 0.95))], 3),
+        'mean_ms': round(statistics.fmean(times), 3),
+        'stages_ms': {},
+        'peak_memory_kb': round(peak / 1024, 1),
+        'pdf_bytes': len(pdf),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    results = {}
+    for pages in args.pages:
+        name = f'{pages}p_{args.boxes}b'
+        project = synthetic_project(pages, args.boxes, args.description_words, rng)
+        if args.save_projects:
+            os.makedirs(args.save_projects, exist_ok=True)
+            with open(os.path.join(args.save_projects, f'{name}.sincus'), 'w', encoding='utf-8') as f:
+                json.dump(project, f, ensure_ascii=False)
+        if args.workers:
+            results[name] = result = bench_parallel(project, args.iterations, args.warmup, args.workers)
+        else:
+            results[name] = result = bench_project(project, args.iterations, args.warmup)
+        stages = '  '.join(f"{stage} {ms:.1f}" for stage, ms in result['stages_ms'].items())
+        peak = f"{result['peak_memory_kb']:9.0f}" if result['peak_memory_kb'] is not None else '        -'
+        print(f"{name:12s} p50 {result['p50_ms']:9.1f} ms  p95 {result['p95_ms']:9.1f} ms  "
+              f"peak {peak} KB  {result['pdf_bytes']:9d} B  [{stages}]")
+    return {
+        'meta': {
+            'benchmark': 'pdf_export',
+            'commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'boxes_per_page': args.boxes,
+            'description_words': args.description_words,
+            'iterations': args.iterations,
+            'workers': args.workers,
+            'random_seed': args.seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, metrics=('p50_ms', 'p95_ms', 'peak_memory_kb', 'pdf_bytes')):
+    """Print the relative change of each metric against a previous results file."""
+    print(f"\nCompared with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}):")
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before:
+            continue
+        changes = []
+        for metric in metrics:
+            old, new = before.get(metric), result.get(metric)
+            if old and new is not None:
+                changes.append(f"{metric} {new - old:+.1f} ({(new - old) / old * 100:+.1f}%)")
+        print(f"{name:12s} " + '  '.join(changes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--boxes', type=int, default=20, help='log boxes per page')
+    parser.add_argument('--description-words', type=int, default=240,
+                        help='words in the description column of each page')
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, help='render through parallel_export with this many processes')
+    parser.add_argument('--save-projects', metavar='DIR', help='also write the synthetic projects as .sincus files')
+    parser.add_argument('-o', '--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='previous JSON results to compare against')
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,36 @@
 import tkinter as tk
+import os
 import re
-import json
+import queue
 import pickle
 from tkinter import ttk, colorchooser, filedialog, messagebox
 from gui.controls import setup_controls
 from gui.canvas import setup_canvas
+from gui.textures import TextureCache
 from utils.styles import setup_styles
-from functions.new_page import add_new_page
+from functions.new_page import add_new_page, new_log_box
+from functions.project_loader import ProjectLoader
+from utils.sincus_file import SincusReader
+from functions.edit_journal import EditJournal, open_project, untitled_path
 from reportlab.lib.pagesizes import A4
 from utils.auth_state import get_jwt_token_global
+from functions.upload_queue import get_upload_queue
+
+# How often the Tk thread reports background upload progress (ms)
+UPLOAD_POLL_INTERVAL = 200
+# How often changed pages are appended to the edit journal (ms)
+AUTOSAVE_INTERVAL = 3000
+
+
+def ask_recover_unsaved(path):
+    """Ask whether to reopen the unsaved edits an interrupted session left for the project at path"""
+    return messagebox.askyesno(
+        "Récupération",
+        f"Des modifications non sauvegardées de {os.path.basename(path)} ont été retrouvées "
+        "(session interrompue).\n\nVoulez-vous les récupérer ?\n"
+        "Le fichier du projet n'est modifié que lorsque vous l'enregistrez.",
+        icon='question'
+    )
 
 class Sincus:
     def __init__(self, root, project_info, jwt_token=None):
@@ -69,26 +91,98 @@ class Sincus:
         self.project_info = project_info
         self.TeteStart = int(re.sub(r'[^\d]', '', self.project_info['tete']))
 
-        # Tracking boxes
-        self.log_boxes = []  
-        self.current_expandable = None
-        
-        # Add missing attributes to fix linter errors
-        self._log_min_height = 50
-        self._log_max_height = 200
-        self.container = None  # Will be set by setup_canvas
-        self.texture_labels = {}  # Track texture labels
+        # Log box height limits, relative to the page
+        fullheight = self.a4_height - 20
+        self._log_min_height = fullheight // 45
+        self._log_max_height = fullheight // 2
+        self.current_text_widget = None
+        self.page_view = None  # Will be set by setup_canvas
+        self.loader = None  # ProjectLoader while a project's pages are being added
+        self.textures = TextureCache(self.root)  # log box texture images
+
+        # Autosave: pages changed since the last journal write, journaled to the
+        # project file (or the untitled project until it is first saved)
+        self.dirty_pages = set()
+        self.project_path = None
+        self.journal = EditJournal(untitled_path())
+        self.journal.discard(delete_project=True)
+
+        # Shown next to the status bar while a project loads
+        self.load_progress = ttk.Progressbar(self.root, mode='determinate', length=200)
         
         # Setup components
         setup_styles()
         setup_controls(self)
         setup_canvas(self)
         add_new_page(self)
-        self.configure_tags()
         
         # Add keyboard shortcut for return to splash
         self.root.bind("<Control-Home>", lambda e: self.return_to_splash())
 
+        # Exports still waiting to be uploaded (including from a previous run)
+        self.upload_queue = get_upload_queue()
+        self.root.after(UPLOAD_POLL_INTERVAL, self._poll_uploads)
+        self.root.after(AUTOSAVE_INTERVAL, self._autosave)
+
+    def _autosave(self):
+        """Append the pages changed since the last call to the edit journal"""
+        if not self.status_bar.winfo_exists():
+            return  # This window was replaced (return to splash)
+        self._poll_journal()
+        # Pages still loading are already on disk (project or autosave file)
+        if self.loader is None:
+            self.page_view.sync()
+            if self.dirty_pages:
+                try:
+                    self.journal.record(
+                        {'project_info': self.project_info, 'font_size': self.root.taille},
+                        {i: self.pages[i] for i in sorted(self.dirty_pages) if i < len(self.pages)},
+                        len(self.pages)
+                    )
+                    self.dirty_pages.clear()
+                except OSError as e:
+                    self.status_bar.config(text=f"Sauvegarde automatique impossible : {e}")
+        self.root.after(AUTOSAVE_INTERVAL, self._autosave)
+
+    def _poll_journal(self):
+        """Show the journal compaction's failures in the status bar (Tk thread)"""
+        while True:
+            try:
+                kind, error = self.journal.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'compaction_failed':
+                self.status_bar.config(text=f"Sauvegarde automatique incomplète : {error}")
+
+    def _poll_uploads(self):
+        """Show the upload queue's progress in the status bar (Tk thread)"""
+        if not self.status_bar.winfo_exists():
+            return  # This window was replaced (return to splash)
+        while True:
+            try:
+                event = self.upload_queue.events.get_nowait()
+            except queue.Empty:
+                break
+            kind, filename = event[0], event[1]
+            if kind == 'progress':
+                sent, total = event[2], event[3]
+                percent = int(sent * 100 / total) if total else 100
+                self.status_bar.config(text=f"Envoi de {filename} au serveur : {percent}%")
+            elif kind == 'retry':
+                attempt, delay = event[2], event[3]
+                self.status_bar.config(
+                    text=f"Envoi de {filename} impossible (essai {attempt}), nouvel essai dans {delay} s"
+                )
+            elif kind == 'done':
+                self.status_bar.config(text=f"Total pages: {len(self.pages)} | {filename} envoyé au serveur")
+            elif kind == 'failed':
+                self.status_bar.config(text=f"Total pages: {len(self.pages)}")
+                messagebox.showerror(
+                    "Erreur",
+                    f"Le PDF {filename} n'a pas pu être envoyé au serveur.\n{event[2]}"
+                )
+        self.root.after(UPLOAD_POLL_INTERVAL, self._poll_uploads)
+
     def create_project_info_table(self):
         # 1) Clear existing widgets
         for w in self.project_info_container.winfo_children():
@@ -191,31 +285,28 @@ class Sincus:
 
     def EditSize(self, taille):
         self.root.taille = taille
-        if self.current_page and isinstance(self.current_page, list):
-            for text_widget in self.current_page:
-                if hasattr(text_widget, 'configure'):
-                    text_widget.configure(font=('Arial', self.root.taille))
-                    text_widget.tag_configure("bold", font=('Arial', self.root.taille, 'bold'))
-
-    def configure_tags(self):
-        # Initialize bold tag for all existing text widgets
-        for page in self.pages:
-            for text_widget in page:
-                text_widget.tag_configure("bold", font=('Arial', self.root.taille, 'bold'))
+        # Pages scrolled into view later pick the size up in fill_page()
+        for text_widget in self.page_view.text_widgets():
+            text_widget.configure(font=('Arial', self.root.taille))
+            text_widget.tag_configure("bold", font=('Arial', self.root.taille, 'bold'))
 
 
     # LES MATERIALS
-    def create_log_box(self, parent, is_expandable=True):
+    def create_log_box(self, parent, is_expandable=True, box=None):
         """
-        Returns a dict for one box: { frame, handle, expandable, bg_color, texture }
+        Returns a dict for one box: { frame, handle, expandable }.
+        box is the box's data in self.pages; it is kept on the frame as
+        `model` and updated when the box is resized.
         """
         box_frame = ttk.Frame(parent, style='LogBox.TFrame')
-        # default state
-        setattr(box_frame, 'bg_color', "#FFFFFF")
-        setattr(box_frame, 'texture', "")
-
-        # pack/draw as before…
-        inner = tk.Frame(box_frame, bg=getattr(box_frame, 'bg_color', '#FFFFFF'), bd=1, relief="solid")
+        box = box if box is not None else new_log_box(self, is_expandable)
+        setattr(box_frame, 'model', box)
+        setattr(box_frame, 'bg_color', box.get('bg_color', "#FFFFFF"))
+        setattr(box_frame, 'texture', box.get('texture', ""))
+
+        # Colour and texture are drawn on this canvas by apply_box_style()
+        inner = tk.Canvas(box_frame, bg=getattr(box_frame, 'bg_color', '#FFFFFF'), bd=1, relief="solid",
+                          highlightthickness=0)
         inner.pack(fill="both", expand=True, padx=0, pady=0)
 
         # **bind click** on the outer frame
@@ -242,57 +333,59 @@ class Sincus:
                 new_h = getattr(handle, '_start_h', 0) + dy
                 new_h = max(min_h, min(max_h, new_h))
                 box_frame.place_configure(height=new_h)
+                box['height'] = new_h
+
+            def end_resize(e):
+                self.apply_box_style(box_frame, box['height'])
+                self._box_changed(box)
 
             handle.bind("<ButtonPress-1>", start_resize)
             handle.bind("<B1-Motion>", do_resize)
+            handle.bind("<ButtonRelease-1>", end_resize)
         return {"frame": box_frame, "handle": handle, "expandable": bool(handle)}
 
+    def apply_box_style(self, box_frame, height):
+        """Paint a log box's color and texture (height in px)"""
+        bg_color = getattr(box_frame, 'bg_color', '#FFFFFF')
+        texture = getattr(box_frame, 'texture', '')
+        inner = box_frame.winfo_children()[0]
+        inner.config(bg=bg_color)
+        self.draw_texture(inner, texture, bg_color, self.column_pixel_widths[1], height)
+
+    def draw_texture(self, canvas, texture, bg_color, width, height):
+        """Replace the texture drawn on a box canvas with the cached tiled image"""
+        canvas.delete('texture')
+        image = self.textures.image(texture, bg_color, width, height) if texture else None
+        if image is not None:
+            canvas.create_image(0, 0, image=image, anchor="nw", tags='texture')
+        elif texture:
+            # Textures without a tile pattern (hand-edited files) are written out as text
+            lines = "\n".join([texture] * (int(height) // 12 + 1))
+            canvas.create_text(0, 0, text=lines, font=("Courier", 8), anchor="nw", tags='texture')
+        # The cache may drop the image while the box still shows it
+        setattr(canvas, 'texture_image', image)
+
+    def _box_changed(self, box):
+        """Mark the page of a log box (by its data dict) for the next autosave"""
+        index = self.page_view.box_page(box)
+        if index is not None:
+            self.dirty_pages.add(index)
+
     def add_log_box(self):
         """
         Called when the "Add Log" button is clicked.
-        Finds the current page's log_container, freezes the previous expandable,
-        then appends & places a fresh one.
+        Freezes the last page's expandable box and appends a fresh one.
         """
-        if not self.log_boxes:
-            print("WARNING: No log boxes structure found")
+        self.finish_loading()
+        if not self.pages:
             return
 
-        page_data = self.log_boxes[-1]
-        
-        # Check if container is valid
-        if not page_data.get("container"):
-            print("WARNING: No container found for current page")
-            return
-            
-        try:
-            # Test if container is still valid
-            page_data["container"].winfo_exists()
-        except Exception as e:
-            print(f"ERROR: Container is invalid: {e}")
-            return
-
-        # freeze old expandable
-        cur = page_data["current_expandable"]
-        if cur and cur["handle"]:
-            handle = cur["handle"]
-            handle_height = handle.winfo_height()  
-            current_height = cur["frame"].winfo_height()
-            new_height = current_height - handle_height
-            
-            handle.destroy()
-            cur["handle"] = None
-            cur["expandable"] = False
-            cur["frame"].place_configure(height=new_height) 
-
-        # Update first box since its idle or what ever
-        page_data["container"].update_idletasks()
-
-        # now create & place the new one
-        new_box = self.create_log_box(page_data["container"])
-        y_offset = sum(b["frame"].winfo_height() for b in page_data["boxes"])
-        new_box["frame"].place(relwidth=1, y=y_offset, height=self._log_min_height)
-        page_data["boxes"].append(new_box)
-        page_data["current_expandable"] = new_box
+        page = self.pages[-1]
+        for box in page['boxes']:
+            box['expandable'] = False
+        page['boxes'].append(new_log_box(self))
+        self.dirty_pages.add(len(self.pages) - 1)
+        self.page_view.render_boxes(len(self.pages) - 1)
 
     def open_box_configurator(self, box_frame):
         """
@@ -412,8 +505,8 @@ class Sincus:
         preview_label.pack(anchor="w", pady=(0, 5))
 
         # Preview box
-        preview_box = tk.Frame(preview_frame, height=60, bg="#FFFFFF", 
-                              relief="solid", bd=1)
+        preview_box = tk.Canvas(preview_frame, height=60, bg="#FFFFFF",
+                                relief="solid", bd=1, highlightthickness=0)
         preview_box.pack(fill="x", pady=(0, 5))
 
         # Update preview function
@@ -422,27 +515,11 @@ class Sincus:
             selected_texture = texture_var.get()
             
             # Update background color
-            if selected_material in geological_materials:
-                color = geological_materials[selected_material]
-                preview_box.config(bg=color)
-            
-            # Update texture overlay
-            # Remove existing texture
-            for widget in preview_box.winfo_children():
-                widget.destroy()
-            
-            # Add new texture if selected
-            if selected_texture in texture_options and texture_options[selected_texture]:
-                texture_symbol = texture_options[selected_texture]
-                texture_label = tk.Label(
-                    preview_box,
-                    text=texture_symbol,
-                    bg=color if selected_material in geological_materials else "#FFFFFF",
-                    font=("Courier", 10),
-                    bd=0, padx=0, pady=0,
-                    justify="left", anchor="nw"
-                )
-                texture_label.place(relwidth=1, relheight=1)
+            color = geological_materials.get(selected_material, preview_box.cget('bg'))
+            preview_box.config(bg=color)
+
+            # Same tiled texture as the log box, as wide as the dialog
+            self.draw_texture(preview_box, texture_options.get(selected_texture, ""), color, 400, 60)
 
         # Bind preview updates
         material_var.trace("w", update_preview)
@@ -458,45 +535,19 @@ class Sincus:
             selected_texture = texture_var.get()
             
             # Set background color
+            model = getattr(box_frame, 'model')
             if selected_material in geological_materials:
                 color = geological_materials[selected_material]
                 setattr(box_frame, 'bg_color', color)
-                inner = box_frame.winfo_children()[0]
-                inner.config(bg=color)
-            
+                model['bg_color'] = color
+
             # Set texture
             texture_symbol = texture_options.get(selected_texture, "")
             setattr(box_frame, 'texture', texture_symbol)
-            
-            # Update texture overlay
-            inner = box_frame.winfo_children()[0]
-            
-            # Remove old texture overlay
-            for w in inner.place_slaves():
-                if w in self.texture_labels:
-                    w.destroy()
-                    del self.texture_labels[w]
-
-            if texture_symbol:
-                # Apply texture overlay
-                font = ("Courier", 8)
-                inner.update_idletasks()
-                h = inner.winfo_height()
-                line_h = inner.tk.call("font", "metrics", font, "-linespace") or 12
-                # Calculate enough lines to fill the entire height with some padding
-                count = max(int(h / line_h) + 2, 10)  # Add extra lines to ensure coverage
-
-                txt = "\n".join([texture_symbol] * count)
-                tex_label = tk.Label(
-                    inner, text=txt,
-                    bg=getattr(box_frame, 'bg_color', '#FFFFFF'),
-                    font=font,
-                    bd=0, padx=0, pady=0,
-                    justify="left", anchor="nw"
-                )
-                self.texture_labels[tex_label] = True
-                tex_label.place(relwidth=1, relheight=1)
+            model['texture'] = texture_symbol
 
+            self.apply_box_style(box_frame, model['height'])
+            self._box_changed(model)
             win.destroy()
 
         ok_btn = ttk.Button(buttons_frame, text="Appliquer", command=apply_and_close)
@@ -508,16 +559,7 @@ class Sincus:
 
         # Remove button
         def remove_and_close():
-            # find & remove from the last page's list
-            page = self.log_boxes[-1]
-            for entry in page["boxes"]:
-                if entry["frame"] is box_frame:
-                    entry["frame"].destroy()
-                    page["boxes"].remove(entry)
-                    # if it was the expandable, clear it
-                    if page["current_expandable"] is entry:
-                        page["current_expandable"] = None
-                    break
+            self.page_view.remove_box(getattr(box_frame, 'model'))
             win.destroy()
 
         remove_btn = ttk.Button(buttons_frame, text="Supprimer", command=remove_and_close)
@@ -552,6 +594,35 @@ class Sincus:
         materials = self.get_geological_materials_mapping()
         return {color: name for name, color in materials.items()}
 
+    def project_data(self):
+        """The project in the .sincus format (call on the Tk thread)"""
+        self.finish_loading()
+        self.page_view.sync()
+        reverse_mapping = self.get_geological_materials_reverse_mapping()
+        return {
+            'project_info': self.project_info,
+            'pages_data': [
+                [{'content': column['content'], 'bold_ranges': list(column['bold_ranges'])}
+                 for column in page['columns']]
+                for page in self.pages
+            ],
+            'log_boxes_data': [
+                [
+                    {
+                        'bg_color': box['bg_color'],
+                        'material_name': reverse_mapping.get(box['bg_color'], "Autre"),
+                        'texture': box['texture'],
+                        'height': box['height'],
+                        'expandable': box['expandable']
+                    }
+                    for box in page['boxes']
+                ]
+                for page in self.pages
+            ],
+            'font_size': self.root.taille,
+            'version': '1.0'
+        }
+
     def save_project(self):
         """Save the current project to a .sincus file"""
         file_path = filedialog.asksaveasfilename(
@@ -559,75 +630,22 @@ class Sincus:
             filetypes=[("Sincus Files", "*.sincus"), ("All Files", "*.*")],
             title="Sauvegarder le projet"
         )
-        
+
         if not file_path:
             return
-            
+
         try:
-            # Prepare data for saving
-            save_data = {
-                'project_info': self.project_info,
-                'pages_data': [],
-                'log_boxes_data': [],
-                'font_size': self.root.taille,
-                'version': '1.0'
-            }
-            
-            # Save text content from all pages
-            for page in self.pages:
-                page_data = []
-                for text_widget in page:
-                    # Get text content
-                    text_content = text_widget.get("1.0", "end-1c")
-                    
-                    # Get bold formatting ranges
-                    bold_ranges = []
-                    start_idx = "1.0"
-                    while True:
-                        try:
-                            range_start = text_widget.tag_nextrange("bold", start_idx)
-                            if not range_start:
-                                break
-                            bold_ranges.append((range_start[0], range_start[1]))
-                            start_idx = range_start[1]
-                        except tk.TclError:
-                            break
-                    
-                    page_data.append({
-                        'content': text_content,
-                        'bold_ranges': bold_ranges
-                    })
-                save_data['pages_data'].append(page_data)
-            
-            # Save log boxes data
-            for page_log_boxes in self.log_boxes:
-                page_boxes_data = []
-                for box in page_log_boxes['boxes']:
-                    # Get material name from color
-                    bg_color = getattr(box['frame'], 'bg_color', '#FFFFFF')
-                    material_name = "Autre"
-                    
-                    # Use reverse mapping to get material name
-                    reverse_mapping = self.get_geological_materials_reverse_mapping()
-                    if bg_color in reverse_mapping:
-                        material_name = reverse_mapping[bg_color]
-                    
-                    box_data = {
-                        'bg_color': bg_color,
-                        'material_name': material_name,
-                        'texture': getattr(box['frame'], 'texture', ''),
-                        'height': box['frame'].winfo_height(),
-                        'expandable': box.get('expandable', False)
-                    }
-                    page_boxes_data.append(box_data)
-                save_data['log_boxes_data'].append(page_boxes_data)
-            
-            # Save to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
-            
+            save_data = self.project_data()
+            if file_path != self.journal.path:
+                # The journal follows the project to its new file
+                self.journal.discard(delete_project=self.project_path is None)
+                self.project_path = file_path
+                self.journal = EditJournal(file_path)
+            self.journal.save(save_data)
+            self.dirty_pages.clear()
+
             messagebox.showinfo("Succès", f"Projet sauvegardé dans :\n{file_path}")
-            
+
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la sauvegarde :\n{str(e)}")
 
@@ -637,458 +655,98 @@ class Sincus:
             filetypes=[("Sincus Files", "*.sincus"), ("All Files", "*.*")],
             title="Ouvrir un projet"
         )
-        
+
         if not file_path:
             return
-            
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            # Clear current project
-            self.clear_current_project()
-            
+            project = open_project(file_path, lambda: ask_recover_unsaved(file_path))
+
             # Load project info
-            self.project_info = save_data.get('project_info', {})
-            self.TeteStart = int(re.sub(r'[^\d]', '', self.project_info.get('tete', '0')))
-            
-            # Load font size
-            font_size = save_data.get('font_size', 12)
-            self.root.taille = font_size
-            
-            # Recreate pages with loaded data
-            pages_data = save_data.get('pages_data', [])
-            for page_data in pages_data:
-                # Create new page
-                add_new_page(self)
-                
-                # Load text content and formatting
-                current_page = self.pages[-1]
-                for i, text_data in enumerate(page_data):
-                    if i < len(current_page):
-                        text_widget = current_page[i]
-                        text_widget.delete("1.0", "end")
-                        text_widget.insert("1.0", text_data.get('content', ''))
-                        
-                        # Apply bold formatting
-                        for start, end in text_data.get('bold_ranges', []):
-                            text_widget.tag_add("bold", start, end)
-            
-            # Load log boxes data
-            log_boxes_data = save_data.get('log_boxes_data', [])
-            for page_idx, page_boxes_data in enumerate(log_boxes_data):
-                if page_idx < len(self.log_boxes):
-                    page_log_boxes = self.log_boxes[page_idx]
-                    
-                    # Clear existing boxes
-                    for box in page_log_boxes['boxes']:
-                        box['frame'].destroy()
-                    page_log_boxes['boxes'].clear()
-                    
-                    # Recreate boxes with saved data
-                    for box_data in page_boxes_data:
-                        new_box = self.create_log_box(page_log_boxes['container'])
-                        bg_color = box_data.get('bg_color', '#FFFFFF')
-                        texture = box_data.get('texture', '')
-                        material_name = box_data.get('material_name', 'Autre')
-                        
-                        setattr(new_box['frame'], 'bg_color', bg_color)
-                        setattr(new_box['frame'], 'texture', texture)
-                        new_box['frame'].place(relwidth=1, height=box_data.get('height', 50))
-                        
-                        # Update inner frame color
-                        inner = new_box['frame'].winfo_children()[0]
-                        inner.config(bg=bg_color)
-                        
-                        # Apply texture overlay if texture exists
-                        if texture:
-                            # Remove any existing texture overlay
-                            for w in inner.place_slaves():
-                                if w in self.texture_labels:
-                                    w.destroy()
-                                    del self.texture_labels[w]
-                            
-                            # Apply texture overlay
-                            font = ("Courier", 8)
-                            inner.update_idletasks()
-                            h = inner.winfo_height()
-                            line_h = inner.tk.call("font", "metrics", font, "-linespace") or 12
-                            # Calculate enough lines to fill the entire height with some padding
-                            count = max(int(h / line_h) + 2, 10)  # Add extra lines to ensure coverage
-
-                            txt = "\n".join([texture] * count)
-                            tex_label = tk.Label(
-                                inner, text=txt,
-                                bg=bg_color,
-                                font=font,
-                                bd=0, padx=0, pady=0,
-                                justify="left", anchor="nw"
-                            )
-                            self.texture_labels[tex_label] = True
-                            tex_label.place(relwidth=1, relheight=1)
-                        
-                        page_log_boxes['boxes'].append(new_box)
-            
-            # Update status bar
-            self.status_bar.config(text=f"Total pages: {len(self.pages)}")
-            
-            messagebox.showinfo("Succès", f"Projet chargé depuis :\n{file_path}")
-            
+            self.project_info = project.project_info
+            self.TeteStart = int(re.sub(r'[^\d]', '', self.project_info.get('tete', '0')) or 0)
+
+            self._set_pages(project, f"Projet chargé depuis :\n{file_path}")
+
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du chargement :\n{str(e)}")
 
-    def load_project_data(self, save_data):
-        """Load project data from save_data (used when opening from splash screen)"""
-        print("=== Starting load_project_data ===")
+    def load_project_data(self, project):
+        """Load an open SincusReader or a project dict (used when opening from splash screen)"""
         try:
-            # Load font size
-            font_size = save_data.get('font_size', 12)
-            self.root.taille = font_size
-            print(f"Font size loaded: {font_size}")
-            
-            # Clear existing pages and log boxes
-            print("Clearing existing project data...")
-            self.clear_current_project()
-            print("Project data cleared successfully")
-            
-            # IMPORTANT: Recreate the container after clearing
-            print("Recreating container after clearing...")
-            from gui.canvas import setup_canvas
-            setup_canvas(self)
-            print("Container recreated successfully")
-            
-            # Verify container is valid
-            if self.container is None:
-                print("ERROR: Container is still None after recreation")
-                messagebox.showerror("Erreur", "Impossible de créer le conteneur principal")
-                return
-            
-            try:
-                self.container.winfo_exists()
-                print("Container is valid and ready")
-            except Exception as e:
-                print(f"ERROR: Container is still invalid: {e}")
-                messagebox.showerror("Erreur", "Le conteneur principal est invalide")
-                return
-            
-            # Small delay to ensure widgets are properly created
-            self.root.update_idletasks()
-            print("Container setup completed, proceeding with page creation")
-            
-            # Recreate pages with loaded data
-            pages_data = save_data.get('pages_data', [])
-            print(f"Found {len(pages_data)} pages to load")
-            
-            for page_idx, page_data in enumerate(pages_data):
-                print(f"Creating page {page_idx + 1}...")
-                try:
-                    # Create new page
-                    add_new_page(self)
-                    print(f"Page {page_idx + 1} created successfully")
-                    
-                    # Load text content and formatting
-                    current_page = self.pages[-1]
-                    print(f"Loading text content for page {page_idx + 1}...")
-                    for i, text_data in enumerate(page_data):
-                        if i < len(current_page):
-                            text_widget = current_page[i]
-                            content = text_data.get('content', '')
-                            text_widget.delete("1.0", "end")
-                            text_widget.insert("1.0", content)
-                            print(f"  Text widget {i}: loaded content (length: {len(content)})")
-                            
-                            # Apply bold formatting
-                            bold_ranges = text_data.get('bold_ranges', [])
-                            for start, end in bold_ranges:
-                                text_widget.tag_add("bold", start, end)
-                            print(f"  Text widget {i}: applied {len(bold_ranges)} bold ranges")
-                except Exception as e:
-                    print(f"ERROR creating page {page_idx + 1}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    # Continue with next page instead of failing completely
-                    continue
-            
-            print("Text content loading completed")
-            
-            # Now that pages are created, log boxes structure should be available
-            print(f"After page creation: {len(self.log_boxes)} log box pages available")
-            
-            # Load log boxes data with more robust approach
-            print("Starting log boxes loading process...")
-            self._load_log_boxes_data_robust(save_data)
-            
+            if isinstance(project, dict):
+                project = SincusReader.from_dict(project)
+            self._set_pages(project, "Projet chargé avec succès!")
         except Exception as e:
-            print(f"ERROR in load_project_data: {str(e)}")
-            import traceback
-            traceback.print_exc()
             messagebox.showerror("Erreur", f"Erreur lors du chargement des données :\n{str(e)}")
 
-    def _load_log_boxes_data_robust(self, save_data):
-        """More robust log boxes loading with extensive error checking"""
-        print("=== Starting _load_log_boxes_data_robust ===")
-        try:
-            log_boxes_data = save_data.get('log_boxes_data', [])
-            print(f"Found log boxes data for {len(log_boxes_data)} pages")
-            
-            # Ensure we have log boxes to work with
-            if not self.log_boxes:
-                print("WARNING: No log boxes found, but we have log boxes data to load")
-                print("This might happen if pages were created but log boxes weren't initialized")
-                print("Attempting to recreate log boxes structure...")
-                
-                # Recreate log boxes structure for existing pages
-                if log_boxes_data and len(self.pages) > 0:
-                    print("Recreating log boxes structure for existing pages...")
-                    for page_idx in range(len(self.pages)):
-                        if page_idx < len(log_boxes_data):
-                            print(f"Recreating log boxes structure for page {page_idx + 1}...")
-                            try:
-                                # Get the page frame from the container
-                                if self.container is None:
-                                    raise Exception("Container is None")
-                                page_frame = self.container.winfo_children()[page_idx]
-                                # Find the log container (second column, index 1)
-                                log_container = page_frame.winfo_children()[1].winfo_children()[1]
-                                
-                                # Create log boxes structure for this page
-                                self.log_boxes.append({
-                                    'container': log_container,
-                                    'boxes': [],
-                                    'current_expandable': None
-                                })
-                                print(f"Log boxes structure created for page {page_idx + 1}")
-                            except Exception as e:
-                                print(f"ERROR creating log boxes structure for page {page_idx + 1}: {e}")
-                                # Create empty structure as fallback
-                                self.log_boxes.append({
-                                    'container': None,
-                                    'boxes': [],
-                                    'current_expandable': None
-                                })
-                        else:
-                            # Create empty structure for pages without log boxes data
-                            self.log_boxes.append({
-                                'container': None,
-                                'boxes': [],
-                                'current_expandable': None
-                            })
-                
-                print(f"Recreated log boxes structure with {len(self.log_boxes)} entries")
-            
-            print(f"Current log_boxes structure: {len(self.log_boxes)} entries")
-            
-            # Clear existing log boxes first
-            print("Clearing existing log boxes...")
-            for page_idx, page_log_boxes in enumerate(self.log_boxes):
-                print(f"  Clearing log boxes for page {page_idx + 1}...")
-                for box_idx, box in enumerate(page_log_boxes.get('boxes', [])):
-                    try:
-                        if 'frame' in box and box['frame']:
-                            box['frame'].destroy()
-                            print(f"    Box {box_idx} destroyed successfully")
-                    except Exception as e:
-                        print(f"    WARNING: Could not destroy box {box_idx}: {e}")
-                page_log_boxes['boxes'] = []
-            print("Existing log boxes cleared")
-            
-            for page_idx, page_boxes_data in enumerate(log_boxes_data):
-                print(f"Processing log boxes for page {page_idx}...")
-                
-                if page_idx >= len(self.log_boxes):
-                    print(f"WARNING: Page {page_idx} not found in log_boxes, skipping")
-                    continue
-                
-                page_log_boxes = self.log_boxes[page_idx]
-                print(f"Page log boxes structure: {page_log_boxes}")
-                
-                # Check if container exists and is valid
-                if 'container' not in page_log_boxes:
-                    print(f"ERROR: No container found for page {page_idx}")
-                    continue
-                
-                container = page_log_boxes['container']
-                print(f"Container found: {container}")
-                
-                try:
-                    # Test if container is still valid
-                    container.winfo_exists()
-                    print("Container is valid")
-                except Exception as e:
-                    print(f"ERROR: Container is invalid: {e}")
-                    continue
-                
-                # Recreate boxes with saved data
-                print(f"Creating {len(page_boxes_data)} new boxes...")
-                y_offset = 0  # Start at the top
-                
-                for box_idx, box_data in enumerate(page_boxes_data):
-                    try:
-                        print(f"  Creating box {box_idx + 1}...")
-                        
-                        # Create new box - make all boxes non-expandable initially
-                        is_last_box = (box_idx == len(page_boxes_data) - 1)
-                        new_box = self.create_log_box(container, is_expandable=is_last_box)
-                        print(f"    Box created successfully (expandable: {is_last_box})")
-                        
-                        # Set properties
-                        bg_color = box_data.get('bg_color', '#FFFFFF')
-                        texture = box_data.get('texture', '')
-                        height = box_data.get('height', 50)
-                        material_name = box_data.get('material_name', 'Autre')
-                        
-                        setattr(new_box['frame'], 'bg_color', bg_color)
-                        setattr(new_box['frame'], 'texture', texture)
-                        
-                        print(f"    Properties set: bg_color={bg_color}, material={material_name}, texture={texture}, height={height}")
-                        print(f"    Positioning at y={y_offset}")
-                        
-                        # Place the box at the calculated y position
-                        new_box['frame'].place(relwidth=1, y=y_offset, height=height)
-                        print(f"    Box placed successfully at y={y_offset}")
-                        
-                        # Update inner frame color
-                        try:
-                            inner = new_box['frame'].winfo_children()[0]
-                            inner.config(bg=bg_color)
-                            print(f"    Inner frame color updated")
-                        except Exception as e:
-                            print(f"    WARNING: Could not update inner frame color: {e}")
-                        
-                        # Apply texture overlay if texture exists
-                        if texture:
-                            try:
-                                # Remove any existing texture overlay
-                                for w in inner.place_slaves():
-                                    if w in self.texture_labels:
-                                        w.destroy()
-                                        del self.texture_labels[w]
-                                
-                                # Apply texture overlay
-                                font = ("Courier", 8)
-                                inner.update_idletasks()
-                                h = inner.winfo_height()
-                                line_h = inner.tk.call("font", "metrics", font, "-linespace") or 12
-                                # Calculate enough lines to fill the entire height with some padding
-                                count = max(int(h / line_h) + 2, 10)  # Add extra lines to ensure coverage
-
-                                txt = "\n".join([texture] * count)
-                                tex_label = tk.Label(
-                                    inner, text=txt,
-                                    bg=bg_color,
-                                    font=font,
-                                    bd=0, padx=0, pady=0,
-                                    justify="left", anchor="nw"
-                                )
-                                self.texture_labels[tex_label] = True
-                                tex_label.place(relwidth=1, relheight=1)
-                                print(f"    Texture overlay applied")
-                            except Exception as e:
-                                print(f"    WARNING: Could not apply texture overlay: {e}")
-                        
-                        page_log_boxes['boxes'].append(new_box)
-                        print(f"    Box {box_idx + 1} added to page")
-                        
-                        # Calculate y position for next box
-                        y_offset += height
-                        print(f"    Next box will start at y={y_offset}")
-                        
-                    except Exception as e:
-                        print(f"    ERROR creating box {box_idx + 1}: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        continue
-                
-                # Set the current_expandable to the last box created (if any boxes were created)
-                if page_log_boxes['boxes']:
-                    page_log_boxes['current_expandable'] = page_log_boxes['boxes'][-1]
-                    print(f"Set current_expandable to last box for page {page_idx}")
-                else:
-                    page_log_boxes['current_expandable'] = None
-                    print(f"No boxes created for page {page_idx}, current_expandable set to None")
-                
-                print(f"Page {page_idx} log boxes processing completed")
-            
-            # Update status bar
-            self.status_bar.config(text=f"Total pages: {len(self.pages)}")
-            print("Status bar updated")
-            
-            print("=== Log boxes loading completed successfully ===")
-            messagebox.showinfo("Succès", "Projet chargé avec succès!")
-            
-        except Exception as e:
-            print(f"ERROR in _load_log_boxes_data_robust: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("Erreur", f"Erreur lors du chargement des log boxes :\n{str(e)}")
+    def _set_pages(self, project, done_message):
+        """
+        Replace the pages with those of an open SincusReader.
+
+        The first page is shown at once and the others are added in the
+        background (see ProjectLoader); done_message is shown when all are in.
+        """
+        self.clear_current_project()
+        self.root.taille = project.font_size
+        self.page_view.reset()
+
+        # Autosave to the project's file; a project that has none is journaled whole
+        self.journal.discard(delete_project=self.project_path is None)
+        self.project_path = project.path
+        self.journal = EditJournal(project.path or untitled_path())
+        if project.path is None:
+            self.dirty_pages.update(range(project.page_count))
+        self.loader = ProjectLoader(
+            self, project,
+            on_progress=self._load_progress,
+            on_done=lambda error: self._load_finished(done_message, error)
+        )
+        self.loader.start()
+
+    def _load_progress(self, loaded, total):
+        self.load_progress.configure(maximum=total, value=loaded)
+        self.load_progress.grid(row=2, column=0, sticky="e", padx=10)
+        self.status_bar.config(text=f"Chargement : {loaded}/{total} pages")
+
+    def _load_finished(self, done_message, error):
+        self.loader = None
+        self.load_progress.grid_remove()
+        self.status_bar.config(text=f"Total pages: {len(self.pages)}")
+        if error is not None:
+            messagebox.showerror("Erreur", f"Erreur lors du chargement des données :\n{str(error)}")
+        else:
+            messagebox.showinfo("Succès", done_message)
+
+    def finish_loading(self):
+        """Add the pages still loading, if any (they must all be in before edits to the page list)"""
+        if self.loader is not None:
+            self.loader.finish()
 
     def clear_current_project(self):
         """Clear the current project data"""
-        print("=== Starting clear_current_project ===")
-        try:
-            # Clear pages
-            print(f"Clearing {len(self.pages)} pages...")
-            for page_idx, page in enumerate(self.pages):
-                print(f"  Clearing page {page_idx + 1}...")
-                for widget_idx, text_widget in enumerate(page):
-                    try:
-                        text_widget.destroy()
-                        print(f"    Text widget {widget_idx} destroyed successfully")
-                    except Exception as e:
-                        print(f"    WARNING: Could not destroy text widget {widget_idx}: {e}")
-            self.pages.clear()
-            print("Pages cleared")
-            
-            # Clear log boxes
-            print(f"Clearing {len(self.log_boxes)} log box pages...")
-            for page_idx, page_log_boxes in enumerate(self.log_boxes):
-                print(f"  Clearing log boxes for page {page_idx + 1}...")
-                for box_idx, box in enumerate(page_log_boxes['boxes']):
-                    try:
-                        box['frame'].destroy()
-                        print(f"    Log box {box_idx} destroyed successfully")
-                    except Exception as e:
-                        print(f"    WARNING: Could not destroy log box {box_idx}: {e}")
-            self.log_boxes.clear()
-            print("Log boxes cleared")
-            
-            # Clear content frame
-            print("Clearing content frame...")
-            content_widgets = self.content_frame.winfo_children()
-            print(f"  Found {len(content_widgets)} widgets in content frame")
-            for widget_idx, widget in enumerate(content_widgets):
-                try:
-                    widget.destroy()
-                    print(f"    Content widget {widget_idx} destroyed successfully")
-                except Exception as e:
-                    print(f"    WARNING: Could not destroy content widget {widget_idx}: {e}")
-            
-            print("=== clear_current_project completed successfully ===")
-        except Exception as e:
-            print(f"ERROR in clear_current_project: {e}")
-            import traceback
-            traceback.print_exc()
-
-    def is_initialized(self):
-        """Check if the app is properly initialized"""
-        print("=== Checking if app is initialized ===")
-        has_container = hasattr(self, 'container') and self.container is not None
-        has_pages = hasattr(self, 'pages') and len(self.pages) > 0
-        print(f"  Has container: {has_container}")
-        print(f"  Has pages: {has_pages} (count: {len(self.pages) if hasattr(self, 'pages') else 0})")
-        result = has_container and has_pages
-        print(f"  App initialized: {result}")
-        return result
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader = None
+            self.load_progress.grid_remove()
+        self.page_view.clear()
+        self.pages.clear()
+        self.dirty_pages.clear()
+        self.current_page = None
 
     def return_to_splash(self):
         """Return to the splash screen"""
         from tkinter import messagebox
         response = messagebox.askyesno(
             "Retour à l'accueil",
-            "Voulez-vous vraiment retourner à l'écran d'accueil ?\n\nTout travail non sauvegardé sera perdu.",
+            "Voulez-vous vraiment retourner à l'écran d'accueil ?\n\n"
+            "Les modifications non enregistrées seront perdues, le fichier du projet reste tel qu'il a été enregistré.",
             icon='warning'
         )
         if response:
+            # The unsaved work is dropped, so are its journal and autosave
+            self.journal.discard(delete_project=self.project_path is None)
+
             # Clear the current app
             for widget in self.root.winfo_children():
                 widget.destroy()
@@ -1,5 +1,5 @@
 import os
-import requests
+from utils.api_client import get_api_client
 from nacl import public, encoding, exceptions as nacl_exceptions
 from nacl.secret import SecretBox
 from nacl.utils import random
@@ -48,7 +48,7 @@ def encrypt_file(filepath):
     try:
         # Get user info from backend
         headers = {'Authorization': f'Bearer {jwt_token}'}
-        response = requests.get('https://127.0.0.1:5000/api/user/profile', headers=headers, verify=False)
+        response = get_api_client().get_cached('/api/user/profile', headers=headers)
         
         if response.status_code != 200:
             messagebox.showerror("Erreur", "Impossible de récupérer les informations utilisateur")
@@ -96,7 +96,7 @@ def decrypt_file(filepath):
     try:
         # Get user info from backend
         headers = {'Authorization': f'Bearer {jwt_token}'}
-        response = requests.get('https://127.0.0.1:5000/api/user/profile', headers=headers, verify=False)
+        response = get_api_client().get_cached('/api/user/profile', headers=headers)
         
         if response.status_code != 200:
             messagebox.showerror("Erreur", "Impossible de récupérer les informations utilisateur")
@@ -138,7 +138,7 @@ def get_user_files():
     
     try:
         headers = {'Authorization': f'Bearer {jwt_token}'}
-        response = requests.get('https://127.0.0.1:5000/api/user/files', headers=headers, verify=False)
+        response = get_api_client().get_cached('/api/user/files', headers=headers)
         
         if response.status_code != 200:
             messagebox.showerror("Erreur", "Impossible de récupérer vos fichiers")
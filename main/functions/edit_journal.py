@@ -0,0 +1,189 @@
+"""
+Append-only autosave journal for the open project.
+
+Every few seconds the app hands record() the pages changed since the last
+call. Each one is appended to <project>.journal as a JSON line, after a
+line with the page count and the project header, so an autosave costs the
+same whatever the size of the project. Once the journal holds
+COMPACT_RECORDS lines, a background thread folds it into <project>.autosave
+(rewritten with write_project) and removes it. Only save() writes the
+project file itself, so unsaved work never ends up in it unasked: a
+journal and autosave left behind by a crash are offered back by
+open_project() when the project is opened again. Compaction runs off the
+Tk thread and reports failures as tuples on `events`, which the app polls.
+
+Projects that were never saved are journaled to UNTITLED_NAME in the
+settings directory.
+"""
+import os
+import json
+import queue
+import threading
+from utils.settings import get_settings_file
+from utils.sincus_file import SincusReader, write_project
+
+COMPACT_RECORDS = 500
+UNTITLED_NAME = 'sans_titre.sincus'
+
+
+def untitled_path():
+    return str(get_settings_file(UNTITLED_NAME))
+
+
+def journal_paths(path):
+    """The journal being compacted and the live journal of a project, oldest first."""
+    return [f"{path}.journal.compacting", f"{path}.journal"]
+
+
+def autosave_path(path):
+    """The project with its journaled edits folded in, kept next to the project file."""
+    return f"{path}.autosave"
+
+
+def has_unsaved(path):
+    """True if an earlier session left unsaved edits of the project at path."""
+    return any(os.path.exists(p) for p in journal_paths(path) + [autosave_path(path)])
+
+
+def _read_records(path):
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break  # last line torn by a crash
+    except OSError:
+        pass
+    return records
+
+
+def fold(path, journals):
+    """Apply journal files, in order, to the project at path and write the result to its autosave."""
+    project_info, font_size, pages = {}, 12, []
+    autosave = autosave_path(path)
+    base = autosave if os.path.exists(autosave) else path
+    if os.path.exists(base):
+        with SincusReader(base) as reader:
+            project = reader.to_dict()
+        project_info, font_size = project['project_info'], project['font_size']
+        pages = list(zip(project['pages_data'], project['log_boxes_data']))
+
+    for journal in journals:
+        for record in _read_records(journal):
+            if 'page_count' in record:
+                project_info = record.get('project_info', project_info)
+                font_size = record.get('font_size', font_size)
+                del pages[record['page_count']:]
+                pages.extend(([], None) for _ in range(len(pages), record['page_count']))
+            elif 'page' in record and record['page'] < len(pages):
+                pages[record['page']] = (record['columns'], record['boxes'])
+
+    write_project(autosave, {
+        'project_info': project_info,
+        'font_size': font_size,
+        'pages_data': [columns for columns, _ in pages],
+        'log_boxes_data': [boxes for _, boxes in pages]
+    })
+
+
+def recover(path):
+    """Fold the journal an earlier session left next to path into the autosave; True if there is one."""
+    journals = [journal for journal in journal_paths(path) if os.path.exists(journal)]
+    if journals:
+        fold(path, journals)
+        for journal in journals:
+            os.remove(journal)
+    return os.path.exists(autosave_path(path))
+
+
+def open_project(path, recover_unsaved):
+    """
+    Open the project at path as a SincusReader.
+
+    If an earlier session left unsaved edits, recover_unsaved() decides:
+    True opens them (the reader reads the autosave but its path is the
+    project's, so work carries on there), False drops them. The project
+    file is not modified either way.
+    """
+    if has_unsaved(path):
+        if recover_unsaved():
+            recover(path)
+            reader = SincusReader(autosave_path(path))
+            reader.path = path
+            return reader
+        EditJournal(path).discard()
+    return SincusReader(path)
+
+
+class EditJournal:
+    def __init__(self, path):
+        self.path = path
+        self._compacting, self._journal = journal_paths(path)
+        self._records = 0
+        self._lock = threading.Lock()       # the journal files
+        self._file_lock = threading.Lock()  # the project and autosave files
+        self._thread = None
+        self.events = queue.Queue()
+
+    def record(self, header, pages, page_count):
+        """Append changed pages ({index: page data}) after the header and page count."""
+        lines = [json.dumps(dict(header, page_count=page_count), ensure_ascii=False)]
+        lines += [
+            json.dumps({'page': page_idx, 'columns': page['columns'], 'boxes': page['boxes']},
+                       ensure_ascii=False, separators=(',', ':'))
+            for page_idx, page in pages.items()
+        ]
+        with self._lock:
+            with open(self._journal, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._records += len(lines)
+            due = self._records >= COMPACT_RECORDS
+        if due:
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into the autosave file on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._compact, name='journal-compaction', daemon=True)
+        self._thread.start()
+
+    def _compact(self):
+        with self._file_lock:
+            with self._lock:
+                # Later records go to a fresh journal while this one is folded
+                if not os.path.exists(self._compacting):
+                    if not os.path.exists(self._journal):
+                        return
+                    os.replace(self._journal, self._compacting)
+                self._records = 0
+            try:
+                fold(self.path, [self._compacting])
+            except Exception as e:
+                # Kept for the next compaction, or for recover() after a restart
+                self.events.put(('compaction_failed', str(e)))
+                return
+            os.remove(self._compacting)
+
+    def save(self, save_data):
+        """Write the whole project to the project file; the journal and autosave are no longer needed."""
+        with self._file_lock:
+            write_project(self.path, save_data)
+            self._remove(self._compacting, self._journal, autosave_path(self.path))
+
+    def discard(self, delete_project=False):
+        """Drop the unsaved edits (and the project file, if delete_project)."""
+        with self._file_lock:
+            self._remove(self._compacting, self._journal, autosave_path(self.path),
+                         *([self.path] if delete_project else []))
+
+    def _remove(self, *paths):
+        with self._lock:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+            self._records = 0
@@ -1,29 +1,40 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas as pdf_canvas
-from reportlab.lib import colors
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.enums import TA_CENTER
 from pathlib import Path 
-from reportlab.platypus import Table, TableStyle, Image, Paragraph, KeepTogether
 import os
+import queue
+import threading
 from tkinter import filedialog, messagebox
-from utils.pdf_helpers import RotatedText
-import tkinter as tk
-import requests
+from functions.snapshot import take_snapshot
+from functions.pdf_layout import PDFLayout
+from functions.parallel_export import render_snapshot
+from functions.upload_queue import get_upload_queue
 import json
 from utils.settings import get_settings_file
-from utils.auth_state import get_jwt_token_global
 from datetime import datetime
 
+# How often the Tk thread checks whether a background export has finished (ms)
+EXPORT_POLL_INTERVAL = 100
+
+
+class PDFExporter(PDFLayout):
+    """Exports the app's project; the layout itself is PDFLayout's"""
 
-class PDFExporter:
     def __init__(self, app):
+        super().__init__()
         self.app = app
-        self.styles = getSampleStyleSheet()
-        self.a4_width, self.a4_height = A4
+        self.workers = None
 
     def export(self):
-        """Main export method with backend integration"""
+        """Main export method with backend integration
+
+        The project is snapshotted here, on the Tk thread; rendering and the
+        local save run on a worker thread so the window stays responsive,
+        and the outcome is reported back on the Tk thread. The upload is
+        left to the background upload queue.
+        """
+        if getattr(self.app, '_export_in_progress', False):
+            messagebox.showinfo("Export", "Un export est déjà en cours.")
+            return
+
         # Load settings to get save directory
         settings_path = get_settings_file()
         settings = {}
@@ -35,90 +46,68 @@ class PDFExporter:
                 pass
         
         save_dir = settings.get('save_dir', str(Path.home() / 'Documents'))
+        # Processes used to render long projects (None: one per CPU)
+        self.workers = settings.get('export_workers')
         
         # Generate filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         default_filename = f"export_{timestamp}.pdf"
-        
-        # Create the PDF in memory first
-        pdf_data = self._create_pdf_in_memory()
-        
-        if not pdf_data:
-            return
-        
-        # Save to local directory from settings
         local_path = Path(save_dir) / default_filename
+
+        snapshot = take_snapshot(self.app)
+        results = queue.Queue()
+        self.app._export_in_progress = True
+        self._status_text = self.app.status_bar.cget('text')
+        self.app.status_bar.config(text="Export PDF en cours...")
+        threading.Thread(
+            target=self._export_worker,
+            args=(snapshot, local_path, default_filename, results),
+            name='pdf-export',
+            daemon=True
+        ).start()
+        self.app.root.after(EXPORT_POLL_INTERVAL, self._poll_export, results)
+
+    def _export_worker(self, snapshot, local_path, filename, results):
+        """Render, save and queue the upload on the worker thread; never touches Tk."""
+        # Rendered straight into the destination file and uploaded from it,
+        # so the PDF is never held in memory as a whole
         try:
-            with open(local_path, 'wb') as f:
-                f.write(pdf_data)
+            out = open(local_path, 'wb')
+        except OSError as e:
+            results.put(('error', f"Impossible de sauvegarder le fichier localement : {e}"))
+            return
+        try:
+            with out:
+                render_snapshot(snapshot, out, workers=self.workers)
         except Exception as e:
-            messagebox.showerror("Erreur", f"Impossible de sauvegarder le fichier localement : {e}")
+            local_path.unlink(missing_ok=True)
+            results.put(('error', f"Erreur lors de la création du PDF : {e}"))
             return
-        
-        # Send to backend
-        success = self._send_to_backend(pdf_data, default_filename)
-        
-        if success:
-            messagebox.showinfo("Succès", f"PDF exporté avec succès!\nSauvegardé dans : {local_path}")
-        else:
-            messagebox.showwarning("Attention", f"PDF sauvegardé localement mais erreur lors de l'envoi au serveur.\nFichier : {local_path}")
-
-    def _create_pdf_in_memory(self):
-        """Create PDF in memory and return the bytes"""
         try:
-            from io import BytesIO
-            buffer = BytesIO()
-            
-            pdf = pdf_canvas.Canvas(buffer, pagesize=(self.a4_width, self.a4_height))
-            margin = 40
-            line_height = self.app.root.taille + 2
-
-            for page_num, page in enumerate(self.app.pages):
-                pdf.setPageSize((self.a4_width, self.a4_height))
-                self._current_page_index = page_num
-                y_position = self.a4_height - margin
-
-                y_position = self._draw_header(pdf, y_position, margin)
-                pdf.showPage()
-
-            pdf.setPageSize((self.a4_width, self.a4_height))
-            pdf.showPage()
-            pdf.save()
-            
-            return buffer.getvalue()
+            self._queue_upload(local_path, filename)
         except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la création du PDF : {e}")
-            return None
+            results.put(('warning', f"PDF sauvegardé localement mais impossible de programmer l'envoi au serveur : {e}\nFichier : {local_path}"))
+            return
+        results.put(('success', f"PDF exporté avec succès!\nSauvegardé dans : {local_path}\nL'envoi au serveur se poursuit en arrière-plan."))
 
-    def _send_to_backend(self, pdf_data, filename):
-        """Send PDF to backend"""
+    def _queue_upload(self, local_path, filename):
+        get_upload_queue().enqueue(local_path, filename)
+
+    def _poll_export(self, results):
+        """Wait on the Tk thread for the worker's outcome"""
         try:
-            token = get_jwt_token_global()
-            if not token:
-                return False
-            
-            # Prepare the file for upload
-            from io import BytesIO
-            files = {'file': (filename, BytesIO(pdf_data), 'application/pdf')}
-            headers = {'Authorization': f'Bearer {token}'}
-            
-            # Send to backend using the export-pdf endpoint
-            response = requests.post(
-                'https://localhost:5000/api/user/files/export-pdf',
-                files=files,
-                headers=headers,
-                verify=False  # For self-signed certificate
-            )
-            
-            if response.status_code == 201:
-                return True
-            else:
-                print(f"Backend error: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            print(f"Error sending to backend: {e}")
-            return False
+            outcome, message = results.get_nowait()
+        except queue.Empty:
+            self.app.root.after(EXPORT_POLL_INTERVAL, self._poll_export, results)
+            return
+        self.app._export_in_progress = False
+        self.app.status_bar.config(text=self._status_text)
+        if outcome == 'success':
+            messagebox.showinfo("Succès", message)
+        elif outcome == 'warning':
+            messagebox.showwarning("Attention", message)
+        else:
+            messagebox.showerror("Erreur", message)
 
     def export_legacy(self):
         """Legacy export method with file dialog"""
@@ -129,317 +118,7 @@ class PDFExporter:
         if not file_path:
             return
 
-        pdf = pdf_canvas.Canvas(file_path, pagesize=(self.a4_width, self.a4_height))
-        margin = 40
-        line_height = self.app.root.taille + 2
-
-        for page_num, page in enumerate(self.app.pages):
-            pdf.setPageSize((self.a4_width, self.a4_height))
-            self._current_page_index = page_num
-            y_position = self.a4_height - margin
-
-            y_position = self._draw_header(pdf, y_position, margin)
-            pdf.showPage()
-
-        pdf.setPageSize((self.a4_width, self.a4_height))
-        pdf.showPage()
-        pdf.save()
-
-    def _draw_header(self, pdf, y_position, margin):
-        """Draw the complex header table"""
-        para_style = ParagraphStyle(
-            'WrappedText',
-            parent=self.styles['Normal'],
-            fontSize=7,
-            leading=8,
-            alignment=TA_CENTER,
-            wordWrap='LTR',
-            fontName='Helvetica-Bold'
-        )
-        para_style2 = ParagraphStyle(
-            'WrappedText',
-            parent=self.styles['Normal'],
-            fontSize=6,
-            leading=8,
-            alignment=TA_CENTER,
-            wordWrap='LTR',
-            fontName='Helvetica-Bold'
-        )
-
-        def rotated_text(text):
-            return RotatedText(text, angle=90)
-
-        input_values = [tw.get("1.0", "end").strip() for tw in self.app.current_page]
-
-        def get_paragraph_style(widget):
-            try:
-                start = widget.index("sel.first")
-                end = widget.index("sel.last")
-                current_tags = widget.tag_names(start)
-            except tk.TclError:
-                return ParagraphStyle(name="Normal", fontName="Helvetica", fontSize=7)
-            
-            if "bold" in current_tags:
-                return ParagraphStyle(name="Bold", fontName="Helvetica-Bold", fontSize=7)
-            else:
-                return ParagraphStyle(name="Normal", fontName="Helvetica", fontSize=7)
-
-        # Handle the logo and header text
-        current_script_dir = Path(__file__).parent
-        project_root = current_script_dir.parent
-        image_path = project_root / "images" / "Sonatrach.png"
-
-        # get as
-        logo_img = Image(str(image_path))
-        img_width, img_height = logo_img.drawWidth, logo_img.drawHeight
-        aspect_ratio = img_width / img_height
-
-        total_height = 20 + 15 + 15 + 15
-        logo_height = total_height - 5  # Leave some padding
-        logo_width = logo_height * aspect_ratio
-        
-        logo = Image(str(image_path), width=logo_width, height=logo_height)
-        header_content = [[logo, Paragraph("EXPLORATION‐PRODUCTION \nDivision Exploration Direction des Operations Exploration \nDpt: Géologie HASSI ‐ MESSAOUD", para_style)]]
-       
-        # 1. Create the image and paragraph
-        logo = Image(str(image_path), width=logo_width, height=logo_height)
-        text_para = Paragraph(
-    "EXPLORATION-PRODUCTION <br/> Division Exploration Direction des Operations Exploration <br/> Dpt: Géologie HASSI - MESSAOUD", 
-    para_style2
-)
-
-        # 2. Create a simple 2-column table for the image+text combo
-        image_text_table = Table([
-            [logo, text_para]
-        ], colWidths=[logo_width, "*"])
-
-        image_text_table.setStyle(TableStyle([
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('LEFTPADDING', (0,0), (-1,-1), 0),
-            ('RIGHTPADDING', (0,0), (-1,-1), 0),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 0),
-            ('TOPPADDING', (0,0), (-1,-1), 0),
-        ]))
-
-        # Convert all values to Paragraphs or strings
-        header_data = [
-            [ 
-                [image_text_table],
-                "", "", "", "", "",
-                Paragraph(str(self.app.project_info["carotte_summary"]), para_style), 
-                "", "", "", 
-                "Puits :", 
-                Paragraph(str(self.app.project_info["puits"]), para_style)
-            ],
-            [ 
-                "", "", "", "", "", "", "", "", "", "", 
-                "Sigle :", 
-                Paragraph(str(self.app.project_info["sigle"]), para_style)
-            ],
-            [ 
-                "", "", "", "", "", "", "", "", "", "", 
-                "Permis :", 
-                Paragraph(str(self.app.project_info["permis"]), para_style)
-            ],
-            [ 
-                "", "", "", "", "", "", "", "", "", "", 
-                "Bloc :", 
-                Paragraph(str(self.app.project_info["bloc"]), para_style)
-            ],
-            [ 
-                Paragraph(f"Echelle : {self.app.project_info['echelle']}", para_style), 
-                "", "", "", "", "",
-                Paragraph(f"Carottier: {self.app.project_info['carottier']}", para_style), 
-                "", "", 
-                Paragraph(f"Type de Boue : {self.app.project_info['mud_type']}", para_style), 
-                "", 
-                Paragraph(f"Carrote: {self.app.project_info['carotte']}", para_style)
-            ],
-            [ 
-                "", "", "", "", "", "",
-                Paragraph(f"Couronne: {self.app.project_info['couronne']}", para_style), 
-                "", "", 
-                Paragraph(f"D : {self.app.project_info['d_value']}", para_style), 
-                "", 
-                Paragraph(f"Tete: {self.app.project_info['tete']}", para_style)
-            ],
-            [ 
-                "", "", "", "", "", "",
-                Paragraph(f"Type: {self.app.project_info['core_type']}", para_style), 
-                "", "", 
-                Paragraph(f"FUN VIS (s/qt) : {self.app.project_info['fun_vis']}", para_style), 
-                "", 
-                Paragraph(f"Pied: {self.app.project_info['pied']}", para_style)
-            ],
-            ["Côtes (m)", "Log", "Nº", "INDICES", "", 
-                rotated_text("Fissures"), 
-                rotated_text("Pendage"), 
-                "Calcimètrie", "Age",
-                Paragraph("DESCRIPTION LITHOLOGIQUE & OBSERVATIONS", para_style), "", ""],
-            ["", "", 
-                rotated_text("Echant"), 
-                rotated_text("direct"), 
-                rotated_text("Indir."), 
-                "", "", "25", "75", "", "", ""],
-            ["", ""] + [Paragraph(val, get_paragraph_style(self.app.current_page[index])) if val else "" for index, val in enumerate(input_values)] + ["", ""]
-        ]
-
-        total_width = self.a4_width - 2 * margin
-        x = total_width / 24
-        col_widths = [2*x] + [x]*6 + [2*x]*2 + [x*4] + [3*x] + [x*5]
-        header_row_heights = [20, 15, 15, 15, 20, 20, 20, 15, 30]
-        sum_header_row_heights = sum(header_row_heights)
-        available_height = self.a4_height - margin*2 - sum_header_row_heights
-        last_row_height = max(available_height, 0)
-        row_heights = header_row_heights + [last_row_height]
-
-        table = Table(header_data, colWidths=col_widths, rowHeights=row_heights)
-        table.setStyle(TableStyle([
-            ('SPAN', (0,0), (5,3)),
-            ('SPAN', (6,0), (9,3)),
-            ('SPAN', (0,4), (5,6)),
-            ('SPAN', (6,4), (8,4)),
-            ('SPAN', (9,4), (10,4)),
-            ('SPAN', (6,5), (8,5)),
-            ('SPAN', (6,6), (8,6)),
-            ('SPAN', (3,7), (4,7)),
-            ('SPAN', (9,7), (11,8)),
-            ('SPAN', (0,7), (0,8)),
-            ('SPAN', (1,7), (1,8)),
-            ('SPAN', (5,7), (5,8)),
-            ('SPAN', (6,7), (6,8)),
-            ('SPAN', (9,9), (11,9)),
-            ('GRID', (0,0), (-1,-1), 0.25, colors.black),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-            ('FONTSIZE', (0,0), (-1,-1), 7),
-        ]))
-
-        table.wrap(total_width, 0)
-        table_bottom_y = y_position - getattr(table, '_height', 0)
-        table.drawOn(pdf, margin, table_bottom_y)
-
-        # Get table dimensions safely
-        col_widths = getattr(table, '_colWidths', [])
-        row_heights = getattr(table, '_rowHeights', [])
-        
-        first_col_width = col_widths[0] if col_widths else 0
-        last_row_height = row_heights[-1] if row_heights else 0
-        pdf.rect(margin, table_bottom_y, first_col_width, last_row_height, stroke=0, fill=0)
-        x_log_col = margin + first_col_width
-        log_width = col_widths[1] if len(col_widths) > 1 else 0
-        pdf.setFillColor(colors.cyan)
-        pdf.rect(x_log_col, table_bottom_y, log_width, last_row_height, stroke=0, fill=1)
-        pdf.setFillColor(colors.black)
-
-        self._draw_pdf_ruler(pdf, margin, table_bottom_y, first_col_width, last_row_height)
-        self._draw_pdf_log_boxes(pdf, x_log_col, table_bottom_y, log_width, last_row_height)
-
-        return table_bottom_y - 10
-    def _draw_pdf_squares(self, pdf, x_start, y_start, width, height):
-        num = int(height // width)
-        for i in range(num):
-            y = y_start + i * width
-            pdf.rect(x_start, y, width, width, stroke=1, fill=0)
-    
-    def _draw_pdf_ruler(self, pdf, x_start, y_start, width, height):
-        division_height = height / 9
-        line_end = x_start + width
-
-        for j in range(9):
-            y_pos = y_start + height - j * division_height
-            pdf.setLineWidth(1.5)
-            pdf.line(line_end - 15, y_pos, line_end, y_pos)
-            pdf.setLineWidth(0.5)
-            for k in range(1, 5):
-                sub_y = y_pos - (k * division_height/5)
-                pdf.line(line_end - 8, sub_y, line_end, sub_y)
-            pdf.setFont("Helvetica", 8)
-            label = str(self.app.TeteStart + j)
-            if j==0: 
-                pdf.drawRightString(line_end - 18, y_pos - 12, label)
-            else:
-                pdf.drawRightString(line_end - 18, y_pos - 2, label)
-
-        y_pos = y_start + height - 9 * division_height
-        pdf.setLineWidth(1.5)
-        pdf.line(line_end - 15, y_pos, line_end, y_pos)
-        pdf.setFont("Helvetica", 8)
-        label = str(self.app.TeteStart + 9)
-        pdf.drawRightString(line_end - 18, y_pos + 12, label)
-        pdf.setLineWidth(1.5)
-        pdf.line(line_end - 15, y_start + height, line_end, y_start + height)
-
-    def _draw_pdf_log_boxes(self, pdf, x_start, y_start, width, height):
-        from reportlab.lib.colors import HexColor
-        pdf.setLineWidth(0.25)
-        page_data = self.app.log_boxes[self._current_page_index]
-
-        gui_heights = [entry["frame"].winfo_height() for entry in page_data["boxes"]]
-        scale = 0.714
-
-        pdf_filled = sum(h * scale for h in gui_heights)
-        leftover = height - pdf_filled
-        if leftover > 0:
-            dummy_gui_h = leftover / scale
-            class DummyFrame:
-                def __init__(self, h): self._h = h; self.bg_color = "#ffffff"; self.texture = ""
-                def winfo_height(self): return self._h
-            page_data["boxes"].append({"frame": DummyFrame(dummy_gui_h)})
-
-        y = y_start
-        for entry in page_data["boxes"][::-1]:
-            gui_h = entry["frame"].winfo_height()
-            h_pdf = gui_h * scale
-            col = getattr(entry["frame"], "bg_color", None)
-            texture = getattr(entry["frame"], "texture", "")
-            
-            if col:
-                pdf.setFillColor(HexColor(col))
-                pdf.rect(x_start, y, width, h_pdf, stroke=1, fill=1)
-                pdf.setFillColor(colors.black)
-            else:
-                pdf.rect(x_start, y, width, h_pdf, stroke=1, fill=0)
-            
-            # Add texture overlay if texture exists
-            if texture:
-                self._draw_texture_overlay(pdf, x_start, y, width, h_pdf, texture, col)
-            
-            y += h_pdf
-
-    def _draw_texture_overlay(self, pdf, x_start, y_start, width, height, texture, bg_color):
-        """Draw texture overlay on the PDF log box"""
-        try:
-            # Set font for texture
-            pdf.setFont("Courier", 6)  # Smaller font for texture
-            
-            # Calculate line spacing
-            line_height = 8  # Approximate line height for font size 6
-            
-            # Calculate number of lines needed
-            num_lines = max(int(height / line_height), 3)
-            
-            # Draw texture lines
-            for i in range(num_lines):
-                y_pos = y_start + height - (i * line_height) - line_height/2
-                
-                # Only draw if within the box bounds
-                if y_pos >= y_start and y_pos <= y_start + height:
-                    # Set text color - use black for most textures, but adjust for dark backgrounds
-                    if bg_color and bg_color.lower() in ['#000000', '#006400']:  # Black or dark green
-                        pdf.setFillColor(colors.white)
-                    else:
-                        pdf.setFillColor(colors.black)
-                    
-                    # Draw the texture symbol
-                    pdf.drawString(x_start + 2, y_pos, texture)
-                    
-                    # Reset to black for next iteration
-                    pdf.setFillColor(colors.black)
-                    
-        except Exception as e:
-            print(f"Error drawing texture overlay: {e}")
-            # Continue without texture if there's an error
+        self.render(take_snapshot(self.app), file_path)
 
     #   _   _ _   _ _   _ ____  _____ ____         ____ ___  ____  _____ 
     #  | | | | \ | | | | / ___|| ____|  _ \       / ___/ _ \|  _ \| ____|
@@ -2,38 +2,91 @@ import tkinter as tk
 from tkinter import ttk
 from utils.text_formatting import handle_key_press, set_current_page
 
+# Last line Column configuration at the top
+COLUMN_LABELS = [
+    "Côtes (m)",
+    "Log",
+    "Echan",
+    "direct",
+    "Indir",
+    "Fissures",
+    "Pendage",
+    "Calcimètrie",
+    "Age",
+    "DESCRIPTION LITHOLOGIQUE & OBSERVATIONS"
+]
+# Columns 2-9 hold text; column 0 is the ruler and column 1 the log boxes
+TEXT_COLUMNS = 8
+
 # Not used here yet Wrote it directly in the export_pdf.py file
 def get_column_values(page):
     """Get first line of text from each column in the page and returns it"""
     return [text_widget.get("1.0", "1.end") for text_widget in page]
 
-def add_new_page(app):
-
-    # Last line Column configuration at the top
-    app.column_labels = [
-        "Côtes (m)", 
-        "Log", 
-        "Echan", 
-        "direct", 
-        "Indir", 
-        "Fissures", 
-        "Pendage", 
-        "Calcimètrie", 
-        "Age", 
-        "DESCRIPTION LITHOLOGIQUE & OBSERVATIONS"
-    ]
-
-    # a4_width = int(21/2.54*96)  # 794 pixels
-    # a4_height = int(29.7/2.54*96)  # 1123 pixels
-
-    from reportlab.lib.pagesizes import A4
-    a4_width, a4_height = A4
-    
-    a4_width = int(a4_width)
-    a4_height = int(a4_height)
-
-    page_frame = ttk.Frame(app.container)
-    page_frame.pack(pady=20, expand=True)
+def new_log_box(app, expandable=True):
+    """Data for a fresh white log box (same keys as in a .sincus file)"""
+    return {
+        'bg_color': '#FFFFFF',
+        'texture': '',
+        'height': app._log_min_height,
+        'expandable': expandable
+    }
+
+def empty_page(app):
+    """Data for a new page: empty text columns and one expandable log box"""
+    return {
+        'columns': [{'content': '', 'bold_ranges': []} for _ in range(TEXT_COLUMNS)],
+        'boxes': [new_log_box(app)]
+    }
+
+def page_from_data(app, page_data, boxes_data=None):
+    """Page data from a page's entries in a .sincus file (pages_data, log_boxes_data)"""
+    page = empty_page(app)
+    for i, text_data in enumerate(page_data[:TEXT_COLUMNS]):
+        page['columns'][i] = {
+            'content': text_data.get('content', ''),
+            'bold_ranges': [tuple(r) for r in text_data.get('bold_ranges', [])]
+        }
+    if boxes_data is not None:
+        # Only the last box of a page can be resized
+        page['boxes'] = [
+            {
+                'bg_color': box_data.get('bg_color', '#FFFFFF'),
+                'texture': box_data.get('texture', ''),
+                'height': box_data.get('height', app._log_min_height),
+                'expandable': box_idx == len(boxes_data) - 1
+            }
+            for box_idx, box_data in enumerate(boxes_data)
+        ]
+    return page
+
+def read_column(text_widget):
+    """Content and bold ranges of a text column, as saved in a .sincus file"""
+    bold_ranges = []
+    start_idx = "1.0"
+    while True:
+        try:
+            range_start = text_widget.tag_nextrange("bold", start_idx)
+        except tk.TclError:
+            break
+        if not range_start:
+            break
+        bold_ranges.append((str(range_start[0]), str(range_start[1])))
+        start_idx = range_start[1]
+    return {'content': text_widget.get("1.0", "end-1c"), 'bold_ranges': bold_ranges}
+
+def build_page(app, parent):
+    """
+    Create the widgets of one A4 page (not bound to any page yet).
+
+    Returns the view dict used by PageView: the page frame, its text
+    widgets, the log box container and footer; fill_page() shows a page's
+    data in it.
+    """
+    a4_width = app.a4_width
+    a4_height = app.a4_height
+
+    page_frame = ttk.Frame(parent)
 
     page_canvas = tk.Canvas(page_frame, width=a4_width, height=a4_height,
                             bg="white", highlightthickness=0)
@@ -45,13 +98,10 @@ def add_new_page(app):
     container.place(x=0, y=0, width=a4_width, height=a4_height)
 
     # Configure grid columns for container
-    app.column_pixel_widths = [50]*7 + [148]*3  
-    text_char_widths = [6]*7 + [18]*3      
-
     x = (a4_width-2) / 24
     col_widths = [2*x] + [x]*6 + [2*x]*2 + [x*4 + 3*x + 5*x]
     text_char_widths = [int(width / 8) for width in col_widths]
-    app.column_pixel_widths = col_widths  
+    app.column_pixel_widths = col_widths
 
     for i in range(10):
         container.grid_columnconfigure(i, minsize=app.column_pixel_widths[i], weight=1)
@@ -60,46 +110,47 @@ def add_new_page(app):
     container.grid_rowconfigure(0, minsize=20)  # Label row height
     container.grid_rowconfigure(1, weight=1)    # Text row expands
 
-    
+
     text_widgets = []
+    log_container = None
     for i in range(10):
         # Column container frame
         col_frame = ttk.Frame(container, style='Column.TFrame')
         col_frame.grid(row=0, column=i, rowspan=2, sticky="nsew")
-        
+
         # Label
-        label = ttk.Label(col_frame, text=app.column_labels[i], style='ColumnHeader.TLabel')
+        label = ttk.Label(col_frame, text=COLUMN_LABELS[i], style='ColumnHeader.TLabel')
         label.pack(fill='x')
-        
+
         if i == 0:  # Changed from i == 0 to i == 9 for rightmost column
             # Ruler container with border
             ruler_frame = tk.Frame(col_frame, bd=1, relief="solid", bg="white")
             ruler_frame.pack(fill='both', expand=True, padx=0, pady=0)
-            
+
             # Create canvas for ruler drawing
             ruler_canvas = tk.Canvas(ruler_frame, bg="white", highlightthickness=0)
             ruler_canvas.pack(fill='both', expand=True, padx=0, pady=0)
-            
-            def draw_ruler(event):
+
+            def draw_ruler(event, ruler_canvas=ruler_canvas):
                 ruler_canvas.delete("all")
                 canvas_width = event.width
                 canvas_height = event.height
-                
+
                 # Calculate division height
                 division_height = canvas_height / 9
-                
+
                 # Draw ruler elements
                 for j in range(9):
                     y_pos = j * division_height
-                    
+
                     # Main bold line (right side)
                     ruler_canvas.create_line(canvas_width-15, y_pos, canvas_width, y_pos, width=2)
-                    
+
                     # Subdivision lines (4 between main numbers)
                     for k in range(1, 5):
                         sub_y = y_pos + (k * division_height/5)
                         ruler_canvas.create_line(canvas_width-8, sub_y, canvas_width, sub_y)
-                    
+
                     # Number labels (left-aligned to ruler lines)
                     ruler_canvas.create_text(
                         canvas_width-20,  # Position text to left of lines
@@ -109,43 +160,26 @@ def add_new_page(app):
                         font=('Arial', max(6, app.root.taille - 4)),  # Smaller font size
                         fill="black"
                     )
-                
+
                 ruler_canvas.create_text(
-                    canvas_width-20, 
+                    canvas_width-20,
                     9*division_height - 12,
                     text=str(app.TeteStart + 9),
-                    anchor="ne",  
-                    font=('Arial', max(6, app.root.taille - 4)), 
+                    anchor="ne",
+                    font=('Arial', max(6, app.root.taille - 4)),
                     fill="black"
                 )
                 # Final bold line at bottom
                 ruler_canvas.create_line(canvas_width-15, canvas_height, canvas_width, canvas_height, width=2)
-            
+
             ruler_canvas.bind("<Configure>", draw_ruler)
-        
+
         elif i == 1:
 
-            # Container for all log boxes
+            # Container for all log boxes (filled by render_log_boxes)
             log_container = ttk.Frame(col_frame)
             log_container.pack(fill='both', expand=True)
-            
-            # store reference in the app
-            app.log_boxes.append({
-                'container': log_container,
-                'boxes': [],
-                'current_expandable': None
-            })
-
-            fullheight = int(a4_height) - 20
-            app._log_min_height = fullheight // 45
-            app._log_max_height = fullheight // 2
-
-            # initial box
-            first_box = app.create_log_box(log_container)
-            first_box['frame'].place(relwidth=1, height=app._log_min_height)
-            app.log_boxes[-1]['boxes'].append(first_box)
-            app.log_boxes[-1]['current_expandable'] = first_box
-            
+
         else:
             # Text widget with border
             text = tk.Text(
@@ -159,22 +193,61 @@ def add_new_page(app):
                 height=1
             )
             text.pack(fill='both', expand=True)
+            text.tag_configure("bold", font=('Arial', app.root.taille, 'bold'))
             text.bind("<KeyPress>", lambda e: handle_key_press(app, e))
             text.bind("<FocusIn>", lambda e, t=text: set_current_page(app, t))
             text_widgets.append(text)
 
 
     # Add footer with page number
-    page_number = len(app.pages) + 1
-    footer = ttk.Label(page_frame, text=f"Page {page_number}")
+    footer = ttk.Label(page_frame)
     footer.pack(side='bottom')
 
-    # Add all text widgets to app.pages and set focus
-    app.pages.append(text_widgets)
-    text_widgets[0].focus_set()
-    app.current_page = text_widgets
-    app.current_text_widget = text_widgets[0]
+    return {
+        'frame': page_frame,
+        'texts': text_widgets,
+        'log_container': log_container,
+        'footer': footer,
+        'boxes': [],
+        'index': None
+    }
+
+def fill_page(app, view, index):
+    """Show page `index` of app.pages in a view made by build_page()"""
+    page = app.pages[index]
+    view['index'] = index
+    for text_widget, column in zip(view['texts'], page['columns']):
+        text_widget.configure(font=('Arial', app.root.taille))
+        text_widget.tag_configure("bold", font=('Arial', app.root.taille, 'bold'))
+        text_widget.delete("1.0", "end")
+        text_widget.insert("1.0", column.get('content', ''))
+        for start, end in column.get('bold_ranges', []):
+            text_widget.tag_add("bold", start, end)
+        text_widget.edit_reset()
+        text_widget.edit_modified(False)
+    view['footer'].config(text=f"Page {index + 1}")
+    render_log_boxes(app, view)
+
+def render_log_boxes(app, view):
+    """(Re)create the log box widgets of a view from its page's box data"""
+    for box in view['boxes']:
+        box['frame'].destroy()
+    view['boxes'] = []
+    y_offset = 0
+    for box_data in app.pages[view['index']]['boxes']:
+        box = app.create_log_box(view['log_container'], is_expandable=box_data.get('expandable', False), box=box_data)
+        box['frame'].place(relwidth=1, y=y_offset, height=box_data['height'])
+        app.apply_box_style(box['frame'], box_data['height'])
+        view['boxes'].append(box)
+        y_offset += box_data['height']
+
+def add_new_page(app):
+    """Append an empty page and scroll to it"""
+    app.finish_loading()
+    app.pages.append(empty_page(app))
+    app.dirty_pages.add(len(app.pages) - 1)
+    app.page_view.refresh()
+    app.page_view.show(len(app.pages) - 1, focus=True)
 
     # Update status bar
     app.status_bar.config(text=f"Total pages: {len(app.pages)}")
-
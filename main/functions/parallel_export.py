@@ -0,0 +1,101 @@
+"""
+Multi-process PDF rendering for long projects.
+
+The page list of a DocumentSnapshot is split into contiguous chunks, each
+chunk is rendered by PDFLayout in a worker process, and the partial PDFs
+are merged back in page order. Chunks travel through temporary files
+rather than through the pool and are merged from disk one object at a
+time (see pdf_merge), so the parent never holds the document in memory.
+Short projects are rendered in-process, where starting workers would cost
+more than it saves.
+"""
+import os
+import tempfile
+import threading
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from functions.pdf_layout import PDFLayout
+from functions.pdf_merge import merge_pdfs
+
+# Below this many pages per worker the export is rendered in-process
+MIN_PAGES_PER_CHUNK = 4
+
+_pool = None
+_pool_workers = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """Process pool shared by exports, so workers are only started once."""
+    global _pool, _pool_workers, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers or _pool_pid != os.getpid():
+            if _pool is not None and _pool_pid == os.getpid():
+                _pool.shutdown(wait=False)
+            _pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _drop_pool(pool):
+    """Forget a broken pool, so the next _get_pool() starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _render_chunks(snapshots, paths, workers):
+    """Render each chunk in the shared pool; a pool broken by a dead worker is replaced once."""
+    for attempt in range(2):
+        pool = _get_pool(workers)
+        try:
+            return list(pool.map(_render_chunk, snapshots, paths))
+        except BrokenProcessPool:
+            _drop_pool(pool)
+            if attempt:
+                raise
+
+
+def _render_chunk(snapshot, path):
+    """Render the pages of a (partial) snapshot to path, without the closing blank page."""
+    PDFLayout().render(snapshot, path, trailing_page=False)
+    return path
+
+
+def split_pages(pages, workers):
+    """Split pages into at most `workers` contiguous chunks of similar size."""
+    chunks = max(1, min(workers, len(pages) // MIN_PAGES_PER_CHUNK))
+    size, extra = divmod(len(pages), chunks)
+    result = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        result.append(pages[start:end])
+        start = end
+    return result
+
+
+def render_snapshot(snapshot, out=None, workers=None):
+    """
+    Render a DocumentSnapshot to PDF, in parallel when it is long enough.
+
+    Writes to out (a path or binary file) if given, otherwise returns the
+    PDF bytes. workers defaults to the number of CPUs.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = split_pages(snapshot.pages, workers)
+    if len(chunks) == 1:
+        return PDFLayout().render(snapshot, out)
+
+    with tempfile.TemporaryDirectory(prefix='sincus-export-') as tmp_dir:
+        parts = _render_chunks(
+            [snapshot._replace(pages=chunk) for chunk in chunks],
+            [os.path.join(tmp_dir, f'{i}.pdf') for i in range(len(chunks))],
+            workers
+        )
+        # Same closing blank page as PDFLayout.render()
+        return merge_pdfs(parts, out, trailing_page=True)
@@ -0,0 +1,390 @@
+"""
+PDF layout of a project: header table, depth ruler and log boxes.
+
+PDFLayout draws a DocumentSnapshot (see functions.snapshot) with ReportLab
+only, without Tk, so the same layout is used by the desktop export
+(PDFExporter and parallel_export) and by the server's render workers.
+"""
+from pathlib import Path
+from io import BytesIO
+from functools import lru_cache
+from xml.sax.saxutils import escape
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.lib import colors
+from reportlab.lib.colors import HexColor
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.enums import TA_CENTER
+from reportlab.platypus import Table, TableStyle, Image, Paragraph
+from reportlab.lib.utils import ImageReader
+from utils.pdf_helpers import RotatedText
+from functions.snapshot import column_markup
+
+# Name of the form XObject holding the page-invariant part of the header
+HEADER_FORM = 'pageHeader'
+# Header table columns (first, last) of each text column in the input row
+INPUT_CELLS = [(2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7), (8, 8), (9, 11)]
+INPUT_CELL_STYLE = TableStyle([
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTSIZE', (0,0), (-1,-1), 7),
+])
+LOGO_PATH = Path(__file__).parent.parent / "images" / "Sonatrach.png"
+# GUI pixels to PDF points for log box heights
+LOG_BOX_SCALE = 0.714
+# Header fields a project may leave out (documents from older clients)
+PROJECT_INFO_DEFAULTS = {
+    'carotte_summary': '', 'puits': '', 'sigle': '', 'permis': '', 'bloc': '',
+    'echelle': '', 'carottier': '', 'mud_type': '', 'carotte': '', 'couronne': '',
+    'd_value': '', 'tete': '0', 'core_type': '', 'fun_vis': '', 'pied': '',
+}
+
+
+@lru_cache(maxsize=None)
+def _header_styles():
+    """Paragraph styles of the header (built once per process)"""
+    styles = getSampleStyleSheet()
+    para_style = ParagraphStyle(
+        'WrappedText',
+        parent=styles['Normal'],
+        fontSize=7,
+        leading=8,
+        alignment=TA_CENTER,
+        wordWrap='LTR',
+        fontName='Helvetica-Bold'
+    )
+    para_style2 = ParagraphStyle(
+        'WrappedText',
+        parent=styles['Normal'],
+        fontSize=6,
+        leading=8,
+        alignment=TA_CENTER,
+        wordWrap='LTR',
+        fontName='Helvetica-Bold'
+    )
+    input_style = ParagraphStyle(name="Normal", fontName="Helvetica", fontSize=7)
+    return para_style, para_style2, input_style
+
+
+@lru_cache(maxsize=None)
+def _logo(path):
+    """Logo PNG bytes and aspect ratio (read once per process), or None if missing"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    data = path.read_bytes()
+    width, height = ImageReader(BytesIO(data)).getSize()
+    return data, width / height
+
+
+class PDFLayout:
+    def __init__(self, logo_path=LOGO_PATH):
+        self.logo_path = logo_path
+        self.a4_width, self.a4_height = A4
+        self._snapshot = None
+        self._page = None
+        self._header = None
+
+    def render(self, snapshot, out=None, trailing_page=True):
+        """Render a DocumentSnapshot to PDF.
+
+        Only reads the snapshot, so it is safe to call off the Tk thread.
+        Writes to out (a path or binary file) if given, otherwise returns
+        the PDF bytes. trailing_page=False leaves out the closing blank page
+        (for chunks that are merged by parallel_export, and server renders).
+        """
+        self._snapshot = snapshot
+        self._header = None
+        buffer = BytesIO() if out is None else out
+        pdf = pdf_canvas.Canvas(buffer, pagesize=(self.a4_width, self.a4_height))
+        margin = 40
+
+        for page in snapshot.pages:
+            pdf.setPageSize((self.a4_width, self.a4_height))
+            self._page = page
+            y_position = self.a4_height - margin
+
+            y_position = self._draw_header(pdf, y_position, margin)
+            pdf.showPage()
+
+        if trailing_page:
+            pdf.setPageSize((self.a4_width, self.a4_height))
+            pdf.showPage()
+        pdf.save()
+
+        if out is None:
+            return buffer.getvalue()
+
+    def _draw_header(self, pdf, y_position, margin):
+        """Draw the complex header table
+
+        Everything but the input row is the same on every page, so it is
+        drawn once per export into a form XObject (with the log column
+        background and the ruler) and each page only references it and
+        draws its own inputs and log boxes.
+        """
+        if self._header is None:
+            self._header = self._draw_header_form(pdf, y_position, margin)
+        table_bottom_y, col_widths, last_row_height = self._header
+        pdf.doForm(HEADER_FORM)
+
+        self._draw_page_inputs(pdf, margin, table_bottom_y, col_widths, last_row_height)
+        x_log_col = margin + col_widths[0]
+        self._draw_pdf_log_boxes(pdf, x_log_col, table_bottom_y, col_widths[1], last_row_height)
+
+        return table_bottom_y - 10
+
+    def _draw_header_form(self, pdf, y_position, margin):
+        """Define the page-invariant header form; returns its geometry"""
+        para_style, para_style2, _ = _header_styles()
+
+        def rotated_text(text):
+            return RotatedText(text, angle=90)
+
+        project_info = dict(PROJECT_INFO_DEFAULTS, **dict(self._snapshot.project_info))
+
+        # Logo and header text
+        text_para = Paragraph(
+    "EXPLORATION-PRODUCTION <br/> Division Exploration Direction des Operations Exploration <br/> Dpt: Géologie HASSI - MESSAOUD",
+    para_style2
+)
+        logo = _logo(self.logo_path) if self.logo_path else None
+        if logo is not None:
+            logo_data, aspect_ratio = logo
+            total_height = 20 + 15 + 15 + 15
+            logo_height = total_height - 5  # Leave some padding
+            logo_width = logo_height * aspect_ratio
+            # Simple 2-column table for the image+text combo
+            image_text_table = Table([
+                [Image(BytesIO(logo_data), width=logo_width, height=logo_height), text_para]
+            ], colWidths=[logo_width, "*"])
+        else:
+            image_text_table = Table([[text_para]])
+
+        image_text_table.setStyle(TableStyle([
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('LEFTPADDING', (0,0), (-1,-1), 0),
+            ('RIGHTPADDING', (0,0), (-1,-1), 0),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 0),
+            ('TOPPADDING', (0,0), (-1,-1), 0),
+        ]))
+
+        # Convert all values to Paragraphs or strings
+        header_data = [
+            [ 
+                [image_text_table],
+                "", "", "", "", "",
+                Paragraph(escape(str(project_info["carotte_summary"])), para_style), 
+                "", "", "", 
+                "Puits :", 
+                Paragraph(escape(str(project_info["puits"])), para_style)
+            ],
+            [ 
+                "", "", "", "", "", "", "", "", "", "", 
+                "Sigle :", 
+                Paragraph(escape(str(project_info["sigle"])), para_style)
+            ],
+            [ 
+                "", "", "", "", "", "", "", "", "", "", 
+                "Permis :", 
+                Paragraph(escape(str(project_info["permis"])), para_style)
+            ],
+            [ 
+                "", "", "", "", "", "", "", "", "", "", 
+                "Bloc :", 
+                Paragraph(escape(str(project_info["bloc"])), para_style)
+            ],
+            [ 
+                Paragraph(escape(f"Echelle : {project_info['echelle']}"), para_style), 
+                "", "", "", "", "",
+                Paragraph(escape(f"Carottier: {project_info['carottier']}"), para_style), 
+                "", "", 
+                Paragraph(escape(f"Type de Boue : {project_info['mud_type']}"), para_style), 
+                "", 
+                Paragraph(escape(f"Carrote: {project_info['carotte']}"), para_style)
+            ],
+            [ 
+                "", "", "", "", "", "",
+                Paragraph(escape(f"Couronne: {project_info['couronne']}"), para_style), 
+                "", "", 
+                Paragraph(escape(f"D : {project_info['d_value']}"), para_style), 
+                "", 
+                Paragraph(escape(f"Tete: {project_info['tete']}"), para_style)
+            ],
+            [ 
+                "", "", "", "", "", "",
+                Paragraph(escape(f"Type: {project_info['core_type']}"), para_style), 
+                "", "", 
+                Paragraph(escape(f"FUN VIS (s/qt) : {project_info['fun_vis']}"), para_style), 
+                "", 
+                Paragraph(escape(f"Pied: {project_info['pied']}"), para_style)
+            ],
+            ["Côtes (m)", "Log", "Nº", "INDICES", "", 
+                rotated_text("Fissures"), 
+                rotated_text("Pendage"), 
+                "Calcimètrie", "Age",
+                Paragraph("DESCRIPTION LITHOLOGIQUE & OBSERVATIONS", para_style), "", ""],
+            ["", "", 
+                rotated_text("Echant"), 
+                rotated_text("direct"), 
+                rotated_text("Indir."), 
+                "", "", "25", "75", "", "", ""],
+            # Page-specific inputs are drawn over this row by _draw_page_inputs
+            [""] * 12
+        ]
+
+        total_width = self.a4_width - 2 * margin
+        x = total_width / 24
+        col_widths = [2*x] + [x]*6 + [2*x]*2 + [x*4] + [3*x] + [x*5]
+        header_row_heights = [20, 15, 15, 15, 20, 20, 20, 15, 30]
+        sum_header_row_heights = sum(header_row_heights)
+        available_height = self.a4_height - margin*2 - sum_header_row_heights
+        last_row_height = max(available_height, 0)
+        row_heights = header_row_heights + [last_row_height]
+
+        table = Table(header_data, colWidths=col_widths, rowHeights=row_heights)
+        table.setStyle(TableStyle([
+            ('SPAN', (0,0), (5,3)),
+            ('SPAN', (6,0), (9,3)),
+            ('SPAN', (0,4), (5,6)),
+            ('SPAN', (6,4), (8,4)),
+            ('SPAN', (9,4), (10,4)),
+            ('SPAN', (6,5), (8,5)),
+            ('SPAN', (6,6), (8,6)),
+            ('SPAN', (3,7), (4,7)),
+            ('SPAN', (9,7), (11,8)),
+            ('SPAN', (0,7), (0,8)),
+            ('SPAN', (1,7), (1,8)),
+            ('SPAN', (5,7), (5,8)),
+            ('SPAN', (6,7), (6,8)),
+            ('SPAN', (9,9), (11,9)),
+            ('GRID', (0,0), (-1,-1), 0.25, colors.black),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('FONTSIZE', (0,0), (-1,-1), 7),
+        ]))
+
+        table.wrap(total_width, 0)
+        table_bottom_y = y_position - table._height
+        col_widths = table._colWidths
+        last_row_height = table._rowHeights[-1]
+
+        pdf.beginForm(HEADER_FORM)
+        pdf.saveState()
+        table.drawOn(pdf, margin, table_bottom_y)
+        x_log_col = margin + col_widths[0]
+        pdf.setFillColor(colors.cyan)
+        pdf.rect(x_log_col, table_bottom_y, col_widths[1], last_row_height, stroke=0, fill=1)
+        pdf.setFillColor(colors.black)
+        self._draw_pdf_ruler(pdf, margin, table_bottom_y, col_widths[0], last_row_height)
+        pdf.restoreState()
+        pdf.endForm()
+
+        return table_bottom_y, col_widths, last_row_height
+
+    def _draw_page_inputs(self, pdf, margin, table_bottom_y, col_widths, last_row_height):
+        """Draw this page's columns into the input row of the header form"""
+        _, _, input_style = _header_styles()
+        # Each page renders its own columns; bold ranges become <b> markup
+        for index, column in enumerate(self._page.columns[:len(INPUT_CELLS)]):
+            if not column.content.strip():
+                continue
+            first, last = INPUT_CELLS[index]
+            cell = Table([[Paragraph(column_markup(column), input_style)]],
+                         colWidths=[sum(col_widths[first:last + 1])], rowHeights=[last_row_height])
+            cell.setStyle(INPUT_CELL_STYLE)
+            cell.wrap(0, 0)
+            cell.drawOn(pdf, margin + sum(col_widths[:first]), table_bottom_y)
+
+    def _draw_pdf_squares(self, pdf, x_start, y_start, width, height):
+        num = int(height // width)
+        for i in range(num):
+            y = y_start + i * width
+            pdf.rect(x_start, y, width, width, stroke=1, fill=0)
+    
+    def _draw_pdf_ruler(self, pdf, x_start, y_start, width, height):
+        division_height = height / 9
+        line_end = x_start + width
+
+        for j in range(9):
+            y_pos = y_start + height - j * division_height
+            pdf.setLineWidth(1.5)
+            pdf.line(line_end - 15, y_pos, line_end, y_pos)
+            pdf.setLineWidth(0.5)
+            for k in range(1, 5):
+                sub_y = y_pos - (k * division_height/5)
+                pdf.line(line_end - 8, sub_y, line_end, sub_y)
+            pdf.setFont("Helvetica", 8)
+            label = str(self._snapshot.tete_start + j)
+            if j==0: 
+                pdf.drawRightString(line_end - 18, y_pos - 12, label)
+            else:
+                pdf.drawRightString(line_end - 18, y_pos - 2, label)
+
+        y_pos = y_start + height - 9 * division_height
+        pdf.setLineWidth(1.5)
+        pdf.line(line_end - 15, y_pos, line_end, y_pos)
+        pdf.setFont("Helvetica", 8)
+        label = str(self._snapshot.tete_start + 9)
+        pdf.drawRightString(line_end - 18, y_pos + 12, label)
+        pdf.setLineWidth(1.5)
+        pdf.line(line_end - 15, y_start + height, line_end, y_start + height)
+
+    def _draw_pdf_log_boxes(self, pdf, x_start, y_start, width, height):
+        pdf.setLineWidth(0.25)
+
+        # (height in PDF points, colour, texture) from the bottom of the column up;
+        # whatever the boxes leave empty is drawn as one blank box at the bottom
+        boxes = [(box.height * LOG_BOX_SCALE, box.bg_color, box.texture) for box in self._page.boxes]
+        leftover = height - sum(h for h, _, _ in boxes)
+        if leftover > 0:
+            boxes.append((leftover, "#ffffff", ""))
+
+        y = y_start
+        for h_pdf, col, texture in boxes[::-1]:
+            if col:
+                pdf.setFillColor(HexColor(col))
+                pdf.rect(x_start, y, width, h_pdf, stroke=1, fill=1)
+                pdf.setFillColor(colors.black)
+            else:
+                pdf.rect(x_start, y, width, h_pdf, stroke=1, fill=0)
+            
+            # Add texture overlay if texture exists
+            if texture:
+                self._draw_texture_overlay(pdf, x_start, y, width, h_pdf, texture, col)
+            
+            y += h_pdf
+
+    def _draw_texture_overlay(self, pdf, x_start, y_start, width, height, texture, bg_color):
+        """Draw texture overlay on the PDF log box"""
+        try:
+            # Set font for texture
+            pdf.setFont("Courier", 6)  # Smaller font for texture
+            
+            # Calculate line spacing
+            line_height = 8  # Approximate line height for font size 6
+            
+            # Calculate number of lines needed
+            num_lines = max(int(height / line_height), 3)
+            
+            # Draw texture lines
+            for i in range(num_lines):
+                y_pos = y_start + height - (i * line_height) - line_height/2
+                
+                # Only draw if within the box bounds
+                if y_pos >= y_start and y_pos <= y_start + height:
+                    # Set text color - use black for most textures, but adjust for dark backgrounds
+                    if bg_color and bg_color.lower() in ['#000000', '#006400']:  # Black or dark green
+                        pdf.setFillColor(colors.white)
+                    else:
+                        pdf.setFillColor(colors.black)
+                    
+                    # Draw the texture symbol
+                    pdf.drawString(x_start + 2, y_pos, texture)
+                    
+                    # Reset to black for next iteration
+                    pdf.setFillColor(colors.black)
+                    
+        except Exception as e:
+            print(f"Error drawing texture overlay: {e}")
+            # Continue without texture if there's an error
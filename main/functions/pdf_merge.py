@@ -0,0 +1,193 @@
+"""
+Streaming concatenation of the PDF chunks rendered by parallel_export.
+
+The chunks come from ReportLab, which writes every object at the top level
+with a classic cross-reference table. That is all merge_pdfs() relies on:
+each chunk's objects are copied to the output one at a time, renumbered,
+and each chunk's page tree is hung under a new root /Pages node. Nothing
+is parsed beyond the object dictionaries, so the merge holds one object at
+a time (a page's content stream at most) plus one offset per object,
+however long the document is.
+"""
+import re
+from array import array
+from io import BytesIO
+from reportlab.lib.pagesizes import A4
+
+_STARTXREF = re.compile(rb'startxref\s+(\d+)')
+_REF = re.compile(rb'(\d+) (\d+) R')
+_ROOT = re.compile(rb'/Root (\d+) 0 R')
+_INFO = re.compile(rb'/Info (\d+) 0 R')
+_PAGES = re.compile(rb'/Pages (\d+) 0 R')
+_COUNT = re.compile(rb'/Count (\d+)')
+_STREAM = re.compile(rb'>>\s*stream\r?\n')
+
+# Object numbers of the merged document's root page tree and catalog
+_ROOT_PAGES = 1
+_CATALOG = 2
+
+
+class PDFMergeError(ValueError):
+    """A chunk is not a single-revision PDF with a classic xref table."""
+
+
+def _read_xref(f):
+    """(offsets by object number, None for free ones; xref offset; trailer) of an open PDF."""
+    f.seek(0, 2)
+    size = f.tell()
+    f.seek(max(0, size - 1024))
+    match = None
+    for match in _STARTXREF.finditer(f.read()):
+        pass
+    if match is None:
+        raise PDFMergeError("startxref not found")
+    xref_offset = int(match.group(1))
+    f.seek(xref_offset)
+    if f.readline().strip() != b'xref':
+        raise PDFMergeError("no classic xref table")
+
+    offsets = []
+    while True:
+        line = f.readline()
+        if not line:
+            raise PDFMergeError("truncated xref table")
+        line = line.strip()
+        if line.startswith(b'trailer'):
+            break
+        first, count = (int(value) for value in line.split())
+        del offsets[first:]
+        offsets.extend([None] * (first - len(offsets)))
+        for _ in range(count):
+            entry = f.read(20)
+            offsets.append(int(entry[:10]) if entry[17:18] == b'n' else None)
+
+    trailer = line + f.read(1024)
+    return offsets, xref_offset, trailer
+
+
+def _object_spans(offsets, end):
+    """(number, start, stop) of each object in use, in file order."""
+    starts = sorted((offset, number) for number, offset in enumerate(offsets) if offset is not None)
+    return [
+        (number, offset, starts[i + 1][0] if i + 1 < len(starts) else end)
+        for i, (offset, number) in enumerate(starts)
+    ]
+
+
+def _renumber(data, shift):
+    return _REF.sub(lambda m: b'%d %s R' % (int(m.group(1)) + shift, m.group(2)), data)
+
+
+class _Output:
+    """The merged file, with the offset of each object written."""
+
+    def __init__(self, out):
+        self.out = out
+        self.position = 0
+        self.offsets = array('q', [-1, -1, -1])  # 0 is always free; the root pages and catalog come last
+
+    def write(self, data):
+        self.out.write(data)
+        self.position += len(data)
+
+    def begin(self, number):
+        if number >= len(self.offsets):
+            self.offsets.extend([-1] * (number + 1 - len(self.offsets)))
+        self.offsets[number] = self.position
+        self.write(b'%d 0 obj\n' % number)
+
+    def add(self, body):
+        """Write a new object after the existing ones; returns its number."""
+        number = len(self.offsets)
+        self.begin(number)
+        self.write(body + b'\nendobj\n')
+        return number
+
+
+def _copy_chunk(path, output, kids):
+    """Copy the objects of one chunk, except its catalog and info; returns its page count."""
+    with open(path, 'rb') as f:
+        offsets, xref_offset, trailer = _read_xref(f)
+        root, info = _ROOT.search(trailer), _INFO.search(trailer)
+        if root is None:
+            raise PDFMergeError("no /Root in the trailer")
+        catalog = int(root.group(1))
+        skipped = {catalog} | ({int(info.group(1))} if info else set())
+
+        spans = list(_object_spans(offsets, xref_offset))
+        for number, start, stop in spans:
+            if number == catalog:
+                f.seek(start)
+                pages = _PAGES.search(f.read(stop - start))
+                break
+        else:
+            pages = None
+        if pages is None:
+            raise PDFMergeError("no /Pages in the catalog")
+        pages = int(pages.group(1))
+
+        shift = len(output.offsets) - 1
+        count = 0
+        for number, start, stop in spans:
+            if number in skipped:
+                continue
+            f.seek(start)
+            data = f.read(stop - start)
+            begin = data.find(b'obj') + 3
+            end = data.rfind(b'endobj')
+            if begin < 3 or end < begin:
+                raise PDFMergeError(f"object {number} is not where the xref says")
+            body = data[begin:end]
+            # References are only rewritten in the dictionary, not in stream data
+            stream = _STREAM.search(body)
+            head, tail = (body[:stream.end()], body[stream.end():]) if stream else (body, b'')
+            head = _renumber(head, shift)
+            if number == pages:
+                head = head.replace(b'<<', b'<< /Parent %d 0 R' % _ROOT_PAGES, 1)
+                count = int(_COUNT.search(head).group(1))
+            output.begin(number + shift)
+            output.write(head + tail + b'endobj\n')
+        kids.append(pages + shift)
+    return count
+
+
+def merge_pdfs(parts, out=None, trailing_page=True):
+    """
+    Concatenate the PDF files at parts, in order, into out (a path or
+    binary file), streaming them from disk; returns the bytes if out is
+    None. trailing_page adds the closing blank page PDFLayout.render()
+    ends documents with.
+    """
+    if out is None:
+        buffer = BytesIO()
+        merge_pdfs(parts, buffer, trailing_page)
+        return buffer.getvalue()
+    if isinstance(out, (str, bytes)) or hasattr(out, '__fspath__'):
+        with open(out, 'wb') as f:
+            return merge_pdfs(parts, f, trailing_page)
+
+    output = _Output(out)
+    output.write(b'%PDF-1.4\n%\x93\x8c\x8b\x9e\n')
+    kids = []
+    count = sum(_copy_chunk(path, output, kids) for path in parts)
+    if trailing_page:
+        width, height = A4
+        kids.append(output.add(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [ 0 0 %.4f %.4f ] /Resources << >> /Rotate 0 >>'
+            % (_ROOT_PAGES, width, height)
+        ))
+        count += 1
+
+    output.begin(_ROOT_PAGES)
+    output.write(b'<< /Type /Pages /Count %d /Kids [ %s ] >>\nendobj\n'
+                 % (count, b' '.join(b'%d 0 R' % kid for kid in kids)))
+    output.begin(_CATALOG)
+    output.write(b'<< /Type /Catalog /Pages %d 0 R >>\nendobj\n' % _ROOT_PAGES)
+
+    xref_offset = output.position
+    output.write(b'xref\n0 %d\n' % len(output.offsets))
+    output.write(b'0000000000 65535 f \n')
+    for offset in output.offsets[1:]:
+        output.write(b'%010d 00000 n \n' % offset if offset >= 0 else b'0000000000 00000 f \n')
+    output.write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                 % (len(output.offsets), _CATALOG, xref_offset))
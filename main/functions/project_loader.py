@@ -0,0 +1,68 @@
+"""
+Incremental loading of a .sincus project into the app.
+
+ProjectLoader reads the pages of a SincusReader and adds them to the
+page data LOAD_SLICE pages at a time, from after_idle callbacks, so the
+window keeps handling events while a long project loads. The first page
+is added before start() returns and can be edited at once; the page
+view's scroll region grows as the rest arrives. The reader is closed
+once the load ends.
+"""
+from functions.new_page import page_from_data
+
+LOAD_SLICE = 20  # pages added per idle callback
+
+
+class ProjectLoader:
+    def __init__(self, app, project, on_progress=None, on_done=None):
+        self.app = app
+        self.project = project
+        self.on_progress = on_progress  # called with (pages loaded, total)
+        self.on_done = on_done          # called with the error, or None
+        self.loaded = 0
+        self._job = None
+
+    @property
+    def total(self):
+        return self.project.page_count
+
+    def start(self):
+        self._run(1)
+
+    def finish(self):
+        """Load the remaining pages now (before saving, exporting or adding a page)."""
+        if self._job is not None:
+            self.app.root.after_cancel(self._job)
+            self._run(self.total - self.loaded)
+
+    def cancel(self):
+        if self._job is not None:
+            self.app.root.after_cancel(self._job)
+            self._job = None
+        self.project.close()
+
+    def _run(self, count):
+        self._job = None
+        try:
+            self._load(count)
+        except Exception as e:
+            self.project.close()
+            if self.on_done:
+                self.on_done(e)
+            return
+        if self.loaded < self.total:
+            if self.on_progress:
+                self.on_progress(self.loaded, self.total)
+            self._job = self.app.root.after_idle(self._run, LOAD_SLICE)
+            return
+        self.project.close()
+        if self.on_done:
+            self.on_done(None)
+
+    def _load(self, count):
+        stop = min(self.loaded + count, self.total)
+        for page_idx in range(self.loaded, stop):
+            page_data, boxes_data = self.project.page(page_idx)
+            self.app.pages.append(page_from_data(self.app, page_data, boxes_data))
+        self.loaded = stop
+        self.app.page_view.refresh()
@@ -0,0 +1,75 @@
+"""
+Plain-data snapshot of a project, for rendering away from the Tk widgets.
+
+take_snapshot() captures the app's pages once, on the Tk thread; the
+result is made of tuples and namedtuples only, so it can be handed to a
+worker thread or process and rendered while the user keeps editing.
+snapshot_from_project() builds the same snapshot from the dict that
+save_project() writes to a .sincus file.
+"""
+import re
+from collections import namedtuple
+from xml.sax.saxutils import escape
+
+ColumnSnapshot = namedtuple('ColumnSnapshot', ['content', 'bold_ranges'])
+BoxSnapshot = namedtuple('BoxSnapshot', ['height', 'bg_color', 'texture'])
+PageSnapshot = namedtuple('PageSnapshot', ['columns', 'boxes'])
+DocumentSnapshot = namedtuple('DocumentSnapshot', ['project_info', 'pages', 'font_size', 'tete_start'])
+
+
+def _tete_start(project_info):
+    return int(re.sub(r'[^\d]', '', str(project_info.get('tete', '0'))) or 0)
+
+
+def take_snapshot(app):
+    """Capture the project shown by app (call on the Tk thread)."""
+    return snapshot_from_project(app.project_data())
+
+
+def snapshot_from_project(save_data):
+    """Build a snapshot from a project dict in the save_project() format."""
+    project_info = save_data.get('project_info', {})
+    log_boxes_data = save_data.get('log_boxes_data', [])
+    pages = []
+    for page_num, page_data in enumerate(save_data.get('pages_data', [])):
+        columns = tuple(
+            ColumnSnapshot(col.get('content', ''), tuple(tuple(r) for r in col.get('bold_ranges', [])))
+            for col in page_data
+        )
+        boxes = tuple(
+            BoxSnapshot(box.get('height', 0), box.get('bg_color'), box.get('texture', ''))
+            for box in ((log_boxes_data[page_num] if page_num < len(log_boxes_data) else None) or [])
+        )
+        pages.append(PageSnapshot(columns, boxes))
+    return DocumentSnapshot(
+        tuple(sorted(project_info.items())),
+        tuple(pages),
+        save_data.get('font_size', 12),
+        _tete_start(project_info)
+    )
+
+
+def _tk_index_to_offset(lines, index):
+    """Convert a Tk "line.char" index into an offset in the joined text."""
+    line, char = (int(part) for part in str(index).split('.'))
+    line = min(max(line, 1), len(lines))
+    return sum(len(l) + 1 for l in lines[:line - 1]) + min(char, len(lines[line - 1]))
+
+
+def column_markup(column):
+    """Paragraph markup for a ColumnSnapshot, with its bold ranges in <b>."""
+    content = column.content
+    lines = content.split('\n')
+    bold = [False] * len(content)
+    for start, end in column.bold_ranges:
+        for i in range(_tk_index_to_offset(lines, start), _tk_index_to_offset(lines, end)):
+            bold[i] = True
+
+    parts = []
+    run_start = 0
+    for i in range(1, len(content) + 1):
+        if i == len(content) or bold[i] != bold[run_start]:
+            chunk = escape(content[run_start:i]).replace('\n', '<br/>')
+            parts.append(f"<b>{chunk}</b>" if bold[run_start] else chunk)
+            run_start = i
+    return ''.join(parts)
@@ -0,0 +1,221 @@
+"""
+Background queue for sending exported PDFs to the backend.
+
+Exports are saved locally first, then queued here; a single worker thread
+uploads them one at a time, retrying with exponential backoff while the
+server is unreachable. The queue is kept in upload_queue.json in the
+settings directory, so pending uploads resume after a restart. Each entry
+records the account it was exported under and is only sent while that
+account is logged in; the others wait, without using up their attempts.
+The worker never touches Tk: it reports progress and outcomes as tuples
+on `events`, which the app polls from the Tk thread.
+"""
+import os
+import json
+import time
+import uuid
+import queue
+import threading
+import requests
+from utils.settings import get_settings_file
+from utils.auth_state import get_jwt_token_global, token_identity
+from utils.multipart import MultipartFileBody
+from utils.api_client import get_api_client, FILE_LISTS
+
+UPLOAD_PATH = '/api/user/files/export-pdf'
+UPLOAD_TIMEOUT = (10, 300)  # connect, read (seconds)
+MAX_ATTEMPTS = 8
+RETRY_BASE_DELAY = 5        # seconds, doubled after each failed attempt
+RETRY_MAX_DELAY = 300
+IDENTITY_POLL_INTERVAL = 5  # seconds between login checks while uploads wait for their owner
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+class UploadError(Exception):
+    """An upload failed; retryable unless the server rejected the file itself."""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def retry_delay(attempts):
+    """Seconds to wait after the given number of failed attempts."""
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def upload_file(path, filename, token=None, progress=None):
+    """POST a PDF to the export endpoint, streaming it from disk."""
+    token = token or get_jwt_token_global()
+    if not token:
+        raise UploadError("Non connecté au serveur")
+    body = MultipartFileBody('file', path, filename, 'application/pdf', progress=progress)
+    headers = {'Authorization': f'Bearer {token}', 'Content-Type': body.content_type}
+    try:
+        response = get_api_client().post(
+            UPLOAD_PATH,
+            data=body,
+            headers=headers,
+            timeout=UPLOAD_TIMEOUT
+        )
+    except requests.RequestException as e:
+        raise UploadError(f"Serveur injoignable : {e}")
+    finally:
+        body.close()
+
+    if response.status_code == 201:
+        get_api_client().invalidate(*FILE_LISTS)
+        return
+    # An expired session (401) or a server-side problem may clear up; a rejected file will not
+    retryable = response.status_code in (401, 408, 429) or response.status_code >= 500
+    raise UploadError(f"Erreur serveur {response.status_code} : {response.text[:200]}", retryable)
+
+
+class UploadQueue:
+    def __init__(self, path=None, upload=upload_file, token=get_jwt_token_global):
+        self.path = path or get_settings_file('upload_queue.json')
+        self.upload = upload
+        self.token = token
+        self.events = queue.Queue()
+        self._entries = self._load()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return []
+        # Entries without an owner cannot be attributed to an account and
+        # are left out; their PDFs stay in the save directory
+        return [entry for entry in entries if isinstance(entry, dict) and 'path' in entry and 'owner' in entry]
+
+    def _save(self):
+        """Write the queue (called with the lock held) atomically."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def start(self):
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name='upload-queue', daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def enqueue(self, path, filename):
+        """Queue a saved PDF for upload by the logged-in account; returns the entry id."""
+        owner = token_identity(self.token())
+        if owner is None:
+            raise UploadError("Non connecté au serveur", retryable=False)
+        entry = {
+            'id': uuid.uuid4().hex,
+            'owner': owner,
+            'path': str(path),
+            'filename': filename,
+            'attempts': 0,
+            'next_attempt': time.time(),
+            'last_error': None
+        }
+        with self._cond:
+            self._entries.append(entry)
+            self._save()
+            self._cond.notify_all()
+        return entry['id']
+
+    def pending(self):
+        with self._cond:
+            return [dict(entry) for entry in self._entries]
+
+    def _next_due(self):
+        """The entry to upload next and how long until it is due (lock held)."""
+        owner = token_identity(self.token())
+        mine = [entry for entry in self._entries if owner is not None and entry['owner'] == owner]
+        # Uploads of another account, or of any while logged out, wait for
+        # their owner; who is logged in is checked again every poll
+        poll = IDENTITY_POLL_INTERVAL if len(mine) < len(self._entries) else None
+        if not mine:
+            return None, poll
+        entry = min(mine, key=lambda e: e['next_attempt'])
+        wait = max(0.0, entry['next_attempt'] - time.time())
+        return entry, wait if poll is None else min(wait, poll)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    entry, wait = self._next_due()
+                    if entry is not None and wait == 0:
+                        break
+                    self._cond.wait(wait)
+            self._process(entry)
+
+    def _process(self, entry):
+        filename = entry['filename']
+        token = self.token()
+        if token_identity(token) != entry['owner']:
+            return  # logged out or switched accounts since _next_due()
+        if not os.path.exists(entry['path']):
+            self._finish(entry)
+            self.events.put(('failed', filename, "Le fichier local n'existe plus"))
+            return
+
+        last_percent = [-1]
+
+        def progress(sent, total):
+            percent = int(sent * 100 / total) if total else 100
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                self.events.put(('progress', filename, sent, total))
+
+        try:
+            self.upload(entry['path'], filename, token=token, progress=progress)
+        except UploadError as e:
+            self._failed(entry, str(e), e.retryable)
+        except Exception as e:
+            self._failed(entry, str(e), True)
+        else:
+            self._finish(entry)
+            self.events.put(('done', filename))
+
+    def _finish(self, entry):
+        with self._cond:
+            self._entries = [e for e in self._entries if e['id'] != entry['id']]
+            self._save()
+
+    def _failed(self, entry, error, retryable):
+        with self._cond:
+            entry['attempts'] += 1
+            entry['last_error'] = error
+            if retryable and entry['attempts'] < MAX_ATTEMPTS:
+                delay = retry_delay(entry['attempts'])
+                entry['next_attempt'] = time.time() + delay
+                self._save()
+                self.events.put(('retry', entry['filename'], entry['attempts'], delay, error))
+                return
+        self._finish(entry)
+        self.events.put(('failed', entry['filename'], error))
+
+
+def get_upload_queue():
+    """The process-wide upload queue, started on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = UploadQueue()
+            _queue.start()
+        return _queue
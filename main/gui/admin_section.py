@@ -3,7 +3,7 @@ from tkinter import filedialog, messagebox
 from tkinter.ttk import Treeview
 from tkinter import ttk
 from core import crypto
-import requests
+from utils.api_client import get_api_client, FILE_LISTS
 from .user_management_dialog import show_create_user_dialog
 from .file_sharing_dialog import show_file_sharing_dialog
 import os
@@ -67,10 +67,9 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                 headers['Authorization'] = f'Bearer {jwt_token_global}'
             
             # Get all files in the system (admin endpoint)
-            response = requests.get(
-                'https://127.0.0.1:5000/api/user/admin/files',
-                headers=headers,
-                verify=False
+            response = get_api_client().get_cached(
+                '/api/user/admin/files',
+                headers=headers
             )
             
             if response.status_code != 200:
@@ -86,6 +85,9 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
             if not all_files:
                 messagebox.showinfo("Information", "Aucun fichier PDF trouvé")
                 return
+            
+            # Keyset cursor of the next page (None once everything is loaded)
+            pagination = {'next_cursor': files_data.get('next_cursor')}
 
             # Create file management window
             win = tk.Toplevel()
@@ -120,6 +122,22 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                 bg='#f0f0f0'
             ).pack(side='left')
 
+            load_more_btn = tk.Button(
+                header_frame,
+                text="Charger plus",
+                bg='#3498db',
+                fg='white',
+                font=('Arial', 9),
+                relief='flat',
+                command=lambda: load_more_files()
+            )
+            load_more_btn.pack(side='right')
+
+            def update_load_more_state():
+                load_more_btn.config(state='normal' if pagination['next_cursor'] else 'disabled')
+
+            update_load_more_state()
+
             # Style the Treeview
             style = ttk.Style(win)
             style.configure(
@@ -198,10 +216,9 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
             def download_file(file_id, filename):
                 """Download a file"""
                 try:
-                    response = requests.get(
-                        f'https://127.0.0.1:5000/api/user/files/{file_id}/download',
-                        headers=headers,
-                        verify=False
+                    response = get_api_client().get(
+                        f'/api/user/files/{file_id}/download',
+                        headers=headers
                     )
                     
                     if response.status_code == 200:
@@ -228,13 +245,13 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                     return
                 
                 try:
-                    response = requests.delete(
-                        f'https://127.0.0.1:5000/api/user/files/{file_id}',
-                        headers=headers,
-                        verify=False
+                    response = get_api_client().delete(
+                        f'/api/user/files/{file_id}',
+                        headers=headers
                     )
                     
                     if response.status_code == 200:
+                        get_api_client().invalidate(*FILE_LISTS)
                         messagebox.showinfo("Succès", "Fichier supprimé avec succès!")
                         refresh_files_table()
                     else:
@@ -261,15 +278,17 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                 file_data_dict.clear()  # Clear the dictionary
                 
                 try:
-                    response = requests.get(
-                        'https://127.0.0.1:5000/api/user/admin/files',
-                        headers=headers,
-                        verify=False
+                    response = get_api_client().get_cached(
+                        '/api/user/admin/files',
+                        ttl=0,
+                        headers=headers
                     )
                     
                     if response.status_code == 200:
                         files_data = response.json()
                         all_files = files_data.get('files', [])
+                        pagination['next_cursor'] = files_data.get('next_cursor')
+                        update_load_more_state()
                         
                         for idx, file in enumerate(all_files):
                             tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
@@ -297,6 +316,51 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                 except Exception as e:
                     messagebox.showerror("Erreur", f"Impossible de rafraîchir les données: {e}")
 
+            def load_more_files():
+                """Append the next page of files to the table"""
+                if not pagination['next_cursor']:
+                    return
+                
+                try:
+                    response = get_api_client().get_cached(
+                        '/api/user/admin/files',
+                        params={'cursor': pagination['next_cursor']},
+                        headers=headers
+                    )
+                    
+                    if response.status_code != 200:
+                        messagebox.showerror("Erreur", f"Erreur lors de la récupération des fichiers: {response.text}")
+                        return
+                    
+                    files_data = response.json()
+                    start = len(tree.get_children())
+                    for idx, file in enumerate(files_data.get('files', []), start=start):
+                        tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
+                        file_type = "Propriétaire" if file.get('is_owner', False) else "Partagé"
+                        created_date = file.get('created_at', '').split('T')[0] if file.get('created_at') else ''
+                        owner = file.get('owner', 'Vous') if not file.get('is_owner', False) else 'Vous'
+                        
+                        item_id = tree.insert(
+                            '',
+                            'end',
+                            values=(
+                                file.get('filename', ''),
+                                file_type,
+                                created_date,
+                                owner,
+                                ''
+                            ),
+                            tags=(tag,)
+                        )
+                        file_data_dict[item_id] = file
+                    
+                    pagination['next_cursor'] = files_data.get('next_cursor')
+                    update_load_more_state()
+                    win.after(100, add_action_buttons)
+                    
+                except Exception as e:
+                    messagebox.showerror("Erreur", f"Impossible de charger plus de fichiers: {e}")
+
             def add_action_buttons():
                 """Add action buttons to each row"""
                 # Clear any existing buttons first
@@ -386,10 +450,9 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
             headers = {}
             if jwt_token_global:
                 headers['Authorization'] = f'Bearer {jwt_token_global}'
-            response = requests.get(
-                'https://127.0.0.1:5000/api/admin/users',
-                headers=headers,
-                verify=False
+            response = get_api_client().get_cached(
+                '/api/admin/users',
+                headers=headers
             )
             if response.status_code != 200:
                 messagebox.showerror(
@@ -512,7 +575,7 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                     headers = {}
                     if jwt_token_global:
                         headers['Authorization'] = f'Bearer {jwt_token_global}'
-                    response = requests.get('https://127.0.0.1:5000/api/admin/users', headers=headers, verify=False)
+                    response = get_api_client().get_cached('/api/admin/users', ttl=0, headers=headers)
                     if response.status_code == 200:
                         users = response.json().get('users', [])
                         for idx, user in enumerate(users):
@@ -539,12 +602,12 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                     headers = {}
                     if jwt_token_global:
                         headers['Authorization'] = f'Bearer {jwt_token_global}'
-                    response = requests.delete(
-                        f'https://127.0.0.1:5000/api/user-management/delete-user/{user_email}',
-                        headers=headers,
-                        verify=False
+                    response = get_api_client().delete(
+                        f'/api/user-management/delete-user/{user_email}',
+                        headers=headers
                     )
                     if response.status_code == 200:
+                        get_api_client().invalidate('/api/admin/users', *FILE_LISTS)
                         messagebox.showinfo("Succès", "Utilisateur supprimé avec succès!")
                         refresh_users_table(tree)
                     else:
@@ -617,10 +680,9 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
             headers = {}
             if jwt_token_global:
                 headers['Authorization'] = f'Bearer {jwt_token_global}'
-            response = requests.get(
-                'https://127.0.0.1:5000/api/zone/zones',
-                headers=headers,
-                verify=False
+            response = get_api_client().get_cached(
+                '/api/zone/zones',
+                headers=headers
             )
             if response.status_code != 200:
                 messagebox.showerror(
@@ -683,13 +745,13 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                         headers = {}
                         if jwt_token_global:
                             headers['Authorization'] = f'Bearer {jwt_token_global}'
-                        resp = requests.post(
-                            'https://127.0.0.1:5000/api/zone/zones',
+                        resp = get_api_client().post(
+                            '/api/zone/zones',
                             json=data,
-                            headers=headers,
-                            verify=False
+                            headers=headers
                         )
                         if resp.status_code == 201:
+                            get_api_client().invalidate('/api/zone/zones')
                             messagebox.showinfo("Succès", "Zone ajoutée avec succès!")
                             add_win.destroy()
                             refresh_zones_table(tree)
@@ -772,7 +834,7 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                     headers = {}
                     if jwt_token_global:
                         headers['Authorization'] = f'Bearer {jwt_token_global}'
-                    response = requests.get('https://127.0.0.1:5000/api/zone/zones', headers=headers, verify=False)
+                    response = get_api_client().get_cached('/api/zone/zones', ttl=0, headers=headers)
                     if response.status_code == 200:
                         zones = response.json().get('zones', [])
                         for idx, zone in enumerate(zones):
@@ -801,7 +863,7 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                     headers = {}
                     if jwt_token_global:
                         headers['Authorization'] = f'Bearer {jwt_token_global}'
-                    response = requests.get('https://127.0.0.1:5000/api/zone/zones', headers=headers, verify=False)
+                    response = get_api_client().get_cached('/api/zone/zones', ttl=0, headers=headers)
                     if response.status_code == 200:
                         zones = response.json().get('zones', [])
                         for zone in zones:
@@ -824,12 +886,12 @@ def create_admin_section(parent, button_size, jwt_token=None, role=None):
                     headers = {}
                     if jwt_token_global:
                         headers['Authorization'] = f'Bearer {jwt_token_global}'
-                    resp = requests.delete(
-                        f'https://127.0.0.1:5000/api/zone/zones/{zone_id}',
-                        headers=headers,
-                        verify=False
+                    resp = get_api_client().delete(
+                        f'/api/zone/zones/{zone_id}',
+                        headers=headers
                     )
                     if resp.status_code == 200:
+                        get_api_client().invalidate('/api/zone/zones')
                         messagebox.showinfo("Succès", "Zone supprimée avec succès!")
                         refresh_zones_table(tree)
                     else:
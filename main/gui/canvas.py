@@ -1,11 +1,12 @@
 import tkinter as tk
 from tkinter import ttk
-from utils.events import on_canvas_configure, on_frame_configure
+from utils.events import on_canvas_configure, on_canvas_scroll
+from gui.page_view import PageView
 
 def setup_canvas(app):
     app.canvas = tk.Canvas(app.content_frame, bg='#f5f5f5', highlightthickness=0)
     app.v_scroll = ttk.Scrollbar(app.content_frame, orient="vertical", command=app.canvas.yview)
-    app.canvas.configure(yscrollcommand=app.v_scroll.set)
+    app.canvas.configure(yscrollcommand=lambda first, last: on_canvas_scroll(app, first, last))
     
     app.canvas.grid(row=0, column=0, sticky="nsew")
     app.v_scroll.grid(row=0, column=1, sticky="ns")
@@ -13,9 +14,7 @@ def setup_canvas(app):
     app.content_frame.grid_rowconfigure(0, weight=1)
     app.content_frame.grid_columnconfigure(0, weight=1)
     
-    app.container = ttk.Frame(app.canvas)
-    app.canvas.create_window((app.canvas.winfo_width()//2, 20), 
-                           window=app.container, anchor="n", tags="container")
+    # Pages are canvas windows created by the page view as they scroll into view
+    app.page_view = PageView(app, app.canvas)
     
     app.canvas.bind("<Configure>", lambda e: on_canvas_configure(app, e))
-    app.container.bind("<Configure>", lambda e: on_frame_configure(app, e))
@@ -4,7 +4,7 @@ from core import crypto
 import os
 from PIL import Image, ImageTk
 from utils.auth_state import get_jwt_token_global
-import requests
+from utils.api_client import get_api_client, FILE_LISTS
 
 def create_crypto_section(parent, button_size):
     # Label and divider
@@ -147,10 +147,9 @@ def create_crypto_section(parent, button_size):
                 jwt_token = get_jwt_token_global()
                 headers = {'Authorization': f'Bearer {jwt_token}'}
                 
-                response = requests.get(
-                    f'https://127.0.0.1:5000/api/user/files/{file_id}/download',
-                    headers=headers,
-                    verify=False
+                response = get_api_client().get(
+                    f'/api/user/files/{file_id}/download',
+                    headers=headers
                 )
                 
                 if response.status_code == 200:
@@ -181,13 +180,13 @@ def create_crypto_section(parent, button_size):
                 jwt_token = get_jwt_token_global()
                 headers = {'Authorization': f'Bearer {jwt_token}'}
                 
-                response = requests.delete(
-                    f'https://127.0.0.1:5000/api/user/files/{file_id}',
-                    headers=headers,
-                    verify=False
+                response = get_api_client().delete(
+                    f'/api/user/files/{file_id}',
+                    headers=headers
                 )
                 
                 if response.status_code == 200:
+                    get_api_client().invalidate(*FILE_LISTS)
                     messagebox.showinfo("Succès", "Fichier supprimé avec succès!")
                     refresh_files()
                 else:
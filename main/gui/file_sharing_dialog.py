@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import requests
+from utils.api_client import get_api_client, FILE_LISTS
 from utils.auth_state import get_jwt_token_global
 
 class FileSharingDialog:
@@ -136,10 +136,9 @@ class FileSharingDialog:
             headers = {'Authorization': f'Bearer {jwt_token}'}
             
             # Get all users for sharing (including owner)
-            response = requests.get(
-                f'https://127.0.0.1:5000/api/user/files/{self.file_info.get("id")}/users-for-sharing',
-                headers=headers,
-                verify=False
+            response = get_api_client().get_cached(
+                f'/api/user/files/{self.file_info.get("id")}/users-for-sharing',
+                headers=headers
             )
             
             if response.status_code != 200:
@@ -237,14 +236,14 @@ class FileSharingDialog:
             
             share_data = {'user_ids': users_to_give_access}
             
-            response = requests.post(
-                f'https://127.0.0.1:5000/api/user/files/{self.file_info.get("id")}/share',
+            response = get_api_client().post(
+                f'/api/user/files/{self.file_info.get("id")}/share',
                 json=share_data,
-                headers=headers,
-                verify=False
+                headers=headers
             )
             
             if response.status_code == 200:
+                get_api_client().invalidate(*FILE_LISTS)
                 data = response.json()
                 messagebox.showinfo("Succès", f"Accès donné à {len(data.get('shared_with', []))} utilisateur(s)")
                 self.load_data()  # Refresh the list
@@ -309,14 +308,14 @@ class FileSharingDialog:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(
-                f'https://127.0.0.1:5000/api/user/files/{self.file_info.get("id")}/unshare',
+            response = get_api_client().post(
+                f'/api/user/files/{self.file_info.get("id")}/unshare',
                 json={'user_ids': users_to_remove_access},
-                headers=headers,
-                verify=False
+                headers=headers
             )
             
             if response.status_code == 200:
+                get_api_client().invalidate(*FILE_LISTS)
                 data = response.json()
                 messagebox.showinfo("Succès", f"Accès retiré pour {len(data.get('removed_from', []))} utilisateur(s)")
                 self.load_data()  # Refresh the list
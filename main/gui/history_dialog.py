@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import requests
+from utils.api_client import get_api_client
 from utils.auth_state import get_jwt_token_global
 from datetime import datetime
 
@@ -22,6 +22,9 @@ class HistoryDialog:
         y = (self.dialog.winfo_screenheight() // 2) - (600 // 2)
         self.dialog.geometry(f"1000x600+{x}+{y}")
         
+        # Keyset cursor of the next (older) page, None once everything is loaded
+        self.next_cursor = None
+        
         self.create_widgets()
         self.load_data()
 
@@ -54,6 +57,48 @@ class HistoryDialog:
         )
         refresh_btn.pack(side='right')
         
+        # Older entries button
+        self.load_more_btn = tk.Button(
+            header_frame,
+            text="Plus anciens",
+            command=self.load_more,
+            bg='#3498db',
+            fg='white',
+            relief='flat',
+            padx=10,
+            pady=5,
+            state='disabled'
+        )
+        self.load_more_btn.pack(side='right', padx=(0, 10))
+        
+        # Filters (applied server-side)
+        filter_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        filter_frame.pack(fill='x', pady=(0, 10))
+        
+        tk.Label(filter_frame, text="Recherche:", bg='#f0f0f0').pack(side='left')
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(filter_frame, textvariable=self.search_var, width=30)
+        search_entry.pack(side='left', padx=(5, 15))
+        search_entry.bind('<Return>', lambda e: self.load_data())
+        
+        tk.Label(filter_frame, text="Statut:", bg='#f0f0f0').pack(side='left')
+        self.status_var = tk.StringVar()
+        ttk.Combobox(
+            filter_frame,
+            textvariable=self.status_var,
+            values=['', 'success', 'error', 'warning'],
+            state='readonly',
+            width=10
+        ).pack(side='left', padx=(5, 15))
+        
+        tk.Button(
+            filter_frame,
+            text="Filtrer",
+            command=self.load_data,
+            relief='flat',
+            padx=10
+        ).pack(side='left')
+        
         # Create treeview
         columns = ('Date/Heure', 'Utilisateur', 'Action', 'Détails', 'Statut', 'IP')
         self.tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=20)
@@ -97,7 +142,17 @@ class HistoryDialog:
         self.status_label.pack(side='bottom', pady=(10, 0))
 
     def load_data(self):
-        """Load activity logs from the backend"""
+        """Load the newest activity logs matching the filters"""
+        self.next_cursor = None
+        self._fetch_page(append=False)
+
+    def load_more(self):
+        """Append the next page of older activity logs"""
+        if self.next_cursor:
+            self._fetch_page(append=True)
+
+    def _fetch_page(self, append):
+        """Fetch one page of activity logs from the backend"""
         try:
             jwt_token = get_jwt_token_global()
             if not jwt_token:
@@ -105,19 +160,30 @@ class HistoryDialog:
                 return
             
             headers = {'Authorization': f'Bearer {jwt_token}'}
-            response = requests.get(
-                'https://127.0.0.1:5000/api/user/activity-logs',
+            params = {}
+            if self.search_var.get().strip():
+                params['q'] = self.search_var.get().strip()
+            if self.status_var.get():
+                params['status'] = self.status_var.get()
+            if append:
+                params['cursor'] = self.next_cursor
+            
+            response = get_api_client().get(
+                '/api/user/activity-logs',
                 headers=headers,
-                verify=False
+                params=params
             )
             
             if response.status_code == 200:
                 data = response.json()
                 logs = data.get('logs', [])
+                self.next_cursor = data.get('next_cursor')
+                self.load_more_btn.config(state='normal' if self.next_cursor else 'disabled')
                 
                 # Clear existing items
-                for item in self.tree.get_children():
-                    self.tree.delete(item)
+                if not append:
+                    for item in self.tree.get_children():
+                        self.tree.delete(item)
                 
                 # Add logs to treeview
                 for log in logs:
@@ -152,7 +218,7 @@ class HistoryDialog:
                         log.get('ip_address', 'N/A')
                     ), tags=(tag,))
                 
-                self.status_label.config(text=f"{len(logs)} activités chargées")
+                self.status_label.config(text=f"{len(self.tree.get_children())} activités chargées")
                 
             elif response.status_code == 403:
                 messagebox.showerror("Erreur", "Vous n'avez pas les permissions pour voir l'historique")
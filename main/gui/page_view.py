@@ -0,0 +1,176 @@
+"""
+Virtualized page list for the main canvas.
+
+Pages are kept as plain data in app.pages (the same column and box dicts
+a .sincus file stores); only the pages within OVERSCAN pages of the
+viewport have widgets. Each of those is its own canvas window, placed at
+its page's slot, so the scroll region covers every page while the number
+of widgets stays constant. Pages leaving the viewport write their text
+back into app.pages and their widgets go to a small pool, to be refilled
+with the next page that scrolls into view.
+"""
+from functions.new_page import build_page, fill_page, read_column, render_log_boxes
+from utils.text_formatting import set_current_page
+
+PAGE_GAP = 20   # space above each page
+FOOTER_HEIGHT = 30
+OVERSCAN = 1    # pages kept materialized above and below the viewport
+POOL_SIZE = 3   # spare page widget sets kept for reuse
+
+
+def visible_range(top, bottom, slot_height, page_count, overscan=OVERSCAN):
+    """Indices (start, stop) of the pages overlapping canvas y range [top, bottom)."""
+    if page_count == 0:
+        return 0, 0
+    first = int(top // slot_height) - overscan
+    last = int(max(top, bottom - 1) // slot_height) + overscan
+    return max(0, first), min(page_count, last + 1)
+
+
+class PageView:
+    def __init__(self, app, canvas):
+        self.app = app
+        self.canvas = canvas
+        self.slot_height = PAGE_GAP + app.a4_height + FOOTER_HEIGHT
+        self.views = {}     # page index -> view dict (see new_page.build_page)
+        self._pool = []
+        self._windows = {}  # id(view) -> canvas window item
+        self._update_pending = False
+
+    def page_top(self, index):
+        return index * self.slot_height + PAGE_GAP
+
+    def refresh(self):
+        """Resize the scroll region to the page count and update the views."""
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, len(self.app.pages) * self.slot_height + PAGE_GAP))
+        self.update()
+
+    def schedule_update(self):
+        """Update the materialized pages once the pending scroll events are handled."""
+        if not self._update_pending:
+            self._update_pending = True
+            self.canvas.after_idle(self.update)
+
+    def update(self):
+        self._update_pending = False
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        start, stop = visible_range(top, bottom, self.slot_height, len(self.app.pages))
+        for index in [i for i in self.views if not start <= i < stop]:
+            self._release(index)
+        for index in range(start, stop):
+            if index not in self.views:
+                self._materialize(index)
+
+    def on_canvas_configure(self, event):
+        for item in self._windows.values():
+            self.canvas.coords(item, event.width // 2, self.canvas.coords(item)[1])
+        self.refresh()
+
+    def _materialize(self, index):
+        view = self._pool.pop() if self._pool else build_page(self.app, self.canvas)
+        fill_page(self.app, view, index)
+        x, y = self.canvas.winfo_width() // 2, self.page_top(index)
+        item = self._windows.get(id(view))
+        if item is None:
+            self._windows[id(view)] = self.canvas.create_window(x, y, window=view['frame'], anchor="n")
+        else:
+            self.canvas.coords(item, x, y)
+            self.canvas.itemconfigure(item, state='normal')
+        self.views[index] = view
+
+    def _release(self, index, store=True):
+        view = self.views.pop(index)
+        if store:
+            self._store(view)
+        # The view's widgets are about to show another page (or go away),
+        # so formatting must not be applied through a stale focus
+        if self.app.current_text_widget in view['texts']:
+            self.app.current_text_widget = None
+            self.app.current_page = None
+        item = self._windows[id(view)]
+        if len(self._pool) < POOL_SIZE:
+            self.canvas.itemconfigure(item, state='hidden')
+            self._pool.append(view)
+        else:
+            self._destroy(view)
+
+    def _store(self, view):
+        """Write a view's edited text columns back into its page data."""
+        if view['index'] >= len(self.app.pages):
+            return
+        columns = self.app.pages[view['index']]['columns']
+        for i, text_widget in enumerate(view['texts']):
+            if text_widget.edit_modified():
+                columns[i] = read_column(text_widget)
+                text_widget.edit_modified(False)
+                self.app.dirty_pages.add(view['index'])
+
+    def _destroy(self, view):
+        self.canvas.delete(self._windows.pop(id(view)))
+        view['frame'].destroy()
+
+    def sync(self):
+        """Write the text of the materialized pages into app.pages (before saving or exporting)."""
+        for view in self.views.values():
+            self._store(view)
+
+    def clear(self):
+        """Destroy every page widget (app.pages is left as is)."""
+        for view in list(self.views.values()) + self._pool:
+            self._destroy(view)
+        self.views.clear()
+        self._pool = []
+        if self.app.current_text_widget is not None and not self.app.current_text_widget.winfo_exists():
+            self.app.current_text_widget = None
+
+    def reset(self):
+        """Rebuild the views after app.pages was replaced."""
+        for index in list(self.views):
+            self._release(index, store=False)
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def show(self, index, focus=False):
+        """Scroll page index to the top of the viewport."""
+        self.canvas.yview_moveto(self.page_top(index) / (len(self.app.pages) * self.slot_height + PAGE_GAP))
+        self.update()
+        if focus and index in self.views:
+            text_widget = self.views[index]['texts'][0]
+            text_widget.focus_set()
+            set_current_page(self.app, text_widget)
+
+    def text_widgets(self):
+        return [t for view in self.views.values() for t in view['texts']]
+
+    def page_of(self, text_widget):
+        """Index of the page a text widget is showing, or None."""
+        for index, view in self.views.items():
+            if text_widget in view['texts']:
+                return index
+        return None
+
+    def render_boxes(self, index):
+        """Redraw the log boxes of a page after its box data changed."""
+        if index in self.views:
+            render_log_boxes(self.app, self.views[index])
+
+    def box_page(self, box):
+        """Index of the page holding a log box (by its data dict), or None."""
+        for index, page in enumerate(self.app.pages):
+            if any(b is box for b in page['boxes']):
+                return index
+        return None
+
+    def remove_box(self, box):
+        """Remove a log box (by its data dict) from its page."""
+        index = self.box_page(box)
+        if index is None:
+            return
+        page = self.app.pages[index]
+        page['boxes'] = [b for b in page['boxes'] if b is not box]
+        if page['boxes']:
+            page['boxes'][-1]['expandable'] = True
+        self.app.dirty_pages.add(index)
+        self.render_boxes(index)
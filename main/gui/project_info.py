@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
-import requests
+from utils.api_client import get_api_client
 from utils.auth_state import get_jwt_token_global
 
 class ProjectInfoWindow:
@@ -93,7 +93,7 @@ class ProjectInfoWindow:
             token = get_jwt_token_global() or self.jwt_token
             if token:
                 headers = {'Authorization': f'Bearer {token}'}
-                resp = requests.get('https://127.0.0.1:5000/api/zone/zones', headers=headers, verify=False)
+                resp = get_api_client().get_cached('/api/zone/zones', headers=headers)
                 if resp.status_code == 200:
                     zones = resp.json().get('zones', [])
                     if zones is None:
@@ -2,15 +2,16 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkinter import font
 from tkinter import simpledialog
-import requests
-import json
+from utils.api_client import get_api_client
 from gui.crypto_section import create_crypto_section
 from gui.admin_section import create_admin_section, set_jwt_token
 from PIL import Image, ImageTk
 import os
 from gui.settings_dialog import show_settings_dialog
 from gui.history_dialog import show_history_dialog
-from core.app import Sincus
+from core.app import Sincus, ask_recover_unsaved
+from utils.sincus_file import SincusReader
+from functions.edit_journal import EditJournal, recover, has_unsaved, autosave_path, open_project, untitled_path
 from utils.auth_state import get_jwt_token_global, set_jwt_token_global
 
 class SplashWindow:
@@ -123,6 +124,9 @@ class SplashWindow:
         # --- RIGHT SECTION ---
         self._refresh_right_section()
 
+        # A crash may have left an unsaved project behind
+        self.master.after_idle(self._offer_recovery)
+
     def _refresh_right_section(self):
         # Destroy current right section
         for widget in self.master.grid_slaves(row=1, column=1):
@@ -213,78 +217,57 @@ class SplashWindow:
 
     def _open(self):
         """Open an existing .sincus project file"""
-        print("=== Starting _open in splash screen ===")
         file_path = filedialog.askopenfilename(
             filetypes=[("Sincus Files", "*.sincus"), ("All Files", "*.*")],
             title="Ouvrir un projet existant"
         )
         
         if not file_path:
-            print("No file selected, aborting")
             return
             
-        print(f"Selected file: {file_path}")
-        
         try:
-            print("Reading file...")
-            with open(file_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            print("File read successfully")
-            
-            # Extract project info from the saved file
-            project_info = save_data.get('project_info', {})
-            print(f"Project info extracted: {list(project_info.keys())}")
-            
-            # Clear the splash screen and start the main app
-            print("Clearing splash screen...")
-            self.master.state('normal')
-            
-            print("Destroying splash widgets...")
-            for widget in self.master.winfo_children():
-                try:
-                    widget.destroy()
-                    print("  Widget destroyed successfully")
-                except Exception as e:
-                    print(f"  WARNING: Could not destroy widget: {e}")
-            
-            print("Resetting grid configuration...")
-            for i in range(self.master.grid_size()[0]):
-                self.master.columnconfigure(i, weight=0)
-            for i in range(self.master.grid_size()[1]):
-                self.master.rowconfigure(i, weight=0)
-            
-            print("Creating Sincus app...")
-            # Start main application with loaded project info and global JWT token
-            app = Sincus(self.master, project_info, get_jwt_token_global())
-            print("Sincus app created successfully")
-            
-            # Load the saved data into the app after ensuring it's initialized
-            def load_when_ready():
-                print("=== load_when_ready called ===")
-                try:
-                    if app.is_initialized():
-                        print("App is initialized, loading project data...")
-                        app.load_project_data(save_data)
-                    else:
-                        print("App not yet initialized, retrying...")
-                        # Retry after a longer delay
-                        self.master.after(200, load_when_ready)
-                except Exception as e:
-                    print(f"ERROR in load_when_ready: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    messagebox.showerror("Erreur", f"Erreur lors de l'initialisation :\n{str(e)}")
-            
-            print("Scheduling load_when_ready...")
-            self.master.after(1000, load_when_ready)  # Increased delay to 1 second
-            print("load_when_ready scheduled")
-            
+            # Only the header is read here; the pages are read as they load
+            self._start_project(open_project(file_path, lambda: ask_recover_unsaved(file_path)))
         except Exception as e:
-            print(f"ERROR in _open: {str(e)}")
-            import traceback
-            traceback.print_exc()
             messagebox.showerror("Erreur", f"Erreur lors de l'ouverture du fichier :\n{str(e)}")
 
+    def _offer_recovery(self):
+        """Offer to reopen a never-saved project autosaved by a session that did not end cleanly"""
+        path = untitled_path()
+        if not has_unsaved(path):
+            return
+        if not messagebox.askyesno(
+            "Récupération",
+            "Un projet non sauvegardé a été retrouvé.\n\nVoulez-vous le récupérer ?",
+            icon='question'
+        ):
+            EditJournal(path).discard(delete_project=True)
+            return
+        try:
+            recover(path)
+            # Read whole: the untitled project's files are reset when the app starts
+            with SincusReader(autosave_path(path)) as reader:
+                project = SincusReader.from_dict(reader.to_dict())
+            self._start_project(project)
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la récupération du projet :\n{str(e)}")
+
+    def _start_project(self, project):
+        """Replace the splash screen by the main app showing an open SincusReader"""
+        # Clear the splash screen and start the main app
+        self.master.state('normal')
+        for widget in self.master.winfo_children():
+            widget.destroy()
+        for i in range(self.master.grid_size()[0]):
+            self.master.columnconfigure(i, weight=0)
+        for i in range(self.master.grid_size()[1]):
+            self.master.rowconfigure(i, weight=0)
+
+        # Start main application with loaded project info and global JWT token;
+        # the pages stream in behind the first one
+        app = Sincus(self.master, project.project_info, get_jwt_token_global())
+        app.load_project_data(project)
+
     def _on_account_click(self):
         if self.jwt_token:
             response = messagebox.askquestion(
@@ -386,10 +369,9 @@ class SplashWindow:
                 messagebox.showerror("Erreur", "Le mot de passe doit contenir au moins 8 caractères.")
                 return
             try:
-                response = requests.post(
-                    'https://127.0.0.1:5000/api/auth/login',
-                    json={"email": email, "password": password},
-                    verify=False
+                response = get_api_client().post(
+                    '/api/auth/login',
+                    json={"email": email, "password": password}
                 )
                 if response.status_code == 200:
                     data = response.json()
@@ -0,0 +1,174 @@
+"""
+Tiled texture images for the log boxes.
+
+Each texture the box configurator offers has a small pixel tile in
+PATTERNS. TextureCache paints a tile once per (texture, colour) with
+PhotoImage.put and tiles it over a box-sized image with Tk's photo copy,
+keeping the images by (texture, colour, size) so boxes of the same kind
+share one image. Sizes are rounded up to whole tiles: a box is drawn as
+a canvas image item clipped by its canvas, so nearby heights reuse the
+same image and resizing a box rarely builds a new one.
+"""
+import tkinter as tk
+from collections import OrderedDict
+
+TILE = 12          # tile side, px
+INK = '#000000'    # colour of the pattern
+MAX_IMAGES = 64    # box images kept, least recently used dropped first
+
+# One string per pixel row; '#' is ink, anything else the box colour
+PATTERNS = {
+    "----": [
+        "............",
+        "............",
+        "............",
+        "##########..",
+        "............",
+        "............",
+        "............",
+        "............",
+        "............",
+        "..##########",
+        "............",
+        "............",
+    ],
+    "||||": [
+        "..#.....#...",
+    ] * TILE,
+    "////": [
+        "...........#",
+        "..........#.",
+        ".........#..",
+        "........#...",
+        ".......#....",
+        "......#.....",
+        ".....#......",
+        "....#.......",
+        "...#........",
+        "..#.........",
+        ".#..........",
+        "#...........",
+    ],
+    "∿∿∿": [
+        "............",
+        "............",
+        "..###.......",
+        ".#...#......",
+        "#.....#....#",
+        ".......#..#.",
+        "........##..",
+        "............",
+        "............",
+        "............",
+        "............",
+        "............",
+    ],
+    "●●●": [
+        "............",
+        "............",
+        "....###.....",
+        "...#####....",
+        "...#####....",
+        "...#####....",
+        "....###.....",
+        "............",
+        "............",
+        "............",
+        "............",
+        "............",
+    ],
+    "xxxx": [
+        "............",
+        "..#.....#...",
+        "...#...#....",
+        "....#.#.....",
+        ".....#......",
+        "....#.#.....",
+        "...#...#....",
+        "..#.....#...",
+        "............",
+        "............",
+        "............",
+        "............",
+    ],
+    "○ ○ ○": [
+        "............",
+        "............",
+        "....###.....",
+        "...#...#....",
+        "...#...#....",
+        "...#...#....",
+        "....###.....",
+        "............",
+        "............",
+        "............",
+        "............",
+        "............",
+    ],
+    "+ + +": [
+        "............",
+        "............",
+        ".....#......",
+        ".....#......",
+        "...#####....",
+        ".....#......",
+        ".....#......",
+        "............",
+        "............",
+        "............",
+        "............",
+        "............",
+    ],
+}
+
+
+def cover_size(width, height):
+    """Smallest whole-tile size covering width x height."""
+    return (max(1, -(-int(width) // TILE)) * TILE,
+            max(1, -(-int(height) // TILE)) * TILE)
+
+
+def tile_data(pattern, color, ink=INK):
+    """PhotoImage.put() data for a pattern: rows of pixel colours."""
+    return ' '.join(
+        '{' + ' '.join(ink if pixel == '#' else color for pixel in row) + '}'
+        for row in pattern
+    )
+
+
+class TextureCache:
+    def __init__(self, master, max_images=MAX_IMAGES):
+        self.master = master
+        self.max_images = max_images
+        self._tiles = {}                # (texture, colour) -> tile image
+        self._images = OrderedDict()    # (texture, colour, size) -> box image
+
+    def image(self, texture, color, width, height):
+        """
+        A PhotoImage covering width x height with texture tiled on color,
+        or None for textures without a pattern. Callers drawing it must
+        keep a reference: the cache may drop it later.
+        """
+        if texture not in PATTERNS:
+            return None
+        color = color.lower()
+        size = cover_size(width, height)
+        key = (texture, color, size)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+
+        tile = self._tiles.get((texture, color))
+        if tile is None:
+            tile = tk.PhotoImage(master=self.master, width=TILE, height=TILE)
+            tile.put(tile_data(PATTERNS[texture], color))
+            self._tiles[(texture, color)] = tile
+
+        image = tk.PhotoImage(master=self.master, width=size[0], height=size[1])
+        # A copy into a larger region repeats the source across it
+        image.tk.call(image, 'copy', tile, '-to', 0, 0, *size)
+        self._images[key] = image
+        if len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        return image
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-import requests
+from utils.api_client import get_api_client, FILE_LISTS
 
 class CreateUserDialog:
     def __init__(self, parent, jwt_token):
@@ -175,14 +175,15 @@ class CreateUserDialog:
                 'is_admin': self.role_var.get() == 'Responsable'
             }
 
-            response = requests.post(
-                'https://127.0.0.1:5000/api/user-management/create-user',
+            response = get_api_client().post(
+                '/api/user-management/create-user',
                 json=data,
-                headers=headers,
-                verify=False
+                headers=headers
             )
 
             if response.status_code == 201:
+                # New users appear in the user list and in every file's sharing list
+                get_api_client().invalidate('/api/admin/users', *FILE_LISTS)
                 messagebox.showinfo("Succès", "Utilisateur créé avec succès!")
                 self.result = response.json()
                 self.dialog.destroy()
@@ -1,3 +1,4 @@
+import multiprocessing
 import tkinter as tk
 from gui.splash import SplashWindow
 from gui.project_info import ProjectInfoWindow
@@ -17,6 +18,8 @@ def start_main_app(project_info, jwt_token=None):
     app = Sincus(root, project_info, get_jwt_token_global())
 
 if __name__ == "__main__":
+    # Needed by the PDF export process pool in frozen builds
+    multiprocessing.freeze_support()
     root = tk.Tk()
 
     # show splash first
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the activity-log query engine
+
+This script tests that:
+1. Logs can be filtered by user, action, status and time range
+2. Malformed filters are rejected with 400 instead of being ignored
+3. next_cursor pages through older entries without gaps or repeats
+4. q= searches details through the full-text index, including later inserts
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from app import create_app
+from app.models import db, ActivityLog
+from config import Config
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def test_activity_log_search():
+    """Filters, keyset pages and full-text search"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        assert app.extensions['activity_log_fts']
+        base = datetime(2025, 1, 1)
+        with app.app_context():
+            for i in range(30):
+                db.session.add(ActivityLog(
+                    user_id=2 if i % 3 == 0 else 3,
+                    user_email='geo@example.com' if i % 3 == 0 else 'geophy@example.com',
+                    action='File Download' if i % 2 else 'File Upload',
+                    details=f"Uploaded file: puits_{i}_NWT-2.pdf" if i % 2 == 0 else f"Downloaded file: carotte_{i}.pdf",
+                    status='error' if i == 7 else 'success',
+                    created_at=base + timedelta(hours=i)
+                ))
+            db.session.commit()
+
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        until = (base + timedelta(days=2)).isoformat()
+
+        def fetch(**params):
+            response = client.get('/api/user/activity-logs', query_string=params, headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            return response.get_json()
+
+        assert len(fetch(user_id=2, until=until)['logs']) == 10
+        assert len(fetch(action='File Upload', until=until)['logs']) == 15
+        assert [log['details'] for log in fetch(status='error')['logs']] == ['Downloaded file: carotte_7.pdf']
+        assert len(fetch(since=(base + timedelta(hours=25)).isoformat(), until=until)['logs']) == 5
+
+        for params in ({'user_id': 'abc'}, {'user_id': ''}, {'since': 'yesterday'},
+                       {'limit': 'ten'}, {'cursor': 'not-a-cursor'}):
+            response = client.get('/api/user/activity-logs', query_string=params, headers=headers)
+            assert response.status_code == 400, params
+
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 7, 'until': until}
+            if cursor:
+                params['cursor'] = cursor
+            page = fetch(**params)
+            seen.extend(log['id'] for log in page['logs'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        assert len(seen) == len(set(seen)) == 30
+
+        assert len(fetch(q='carotte')['logs']) == 15
+        assert [log['details'] for log in fetch(q='carotte_21')['logs']] == ['Downloaded file: carotte_21.pdf']
+        assert fetch(q='"unbalanced AND (')['logs'] == []
+
+        with app.app_context():
+            db.session.add(ActivityLog(user_email='x@example.com', action='Zone Creation',
+                                       details='Created zone: HMD - Hassi Messaoud', status='success'))
+            db.session.commit()
+        assert len(fetch(q='messaoud')['logs']) == 1
+
+
+if __name__ == "__main__":
+    test_activity_log_search()
+    print("✅ Activity log search tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the background activity-log writer
+
+This script tests that:
+1. log_activity() only queues the entry; rows appear once the writer flushes
+2. The writer counters report written entries and an empty backlog
+3. Stopping the writer drains entries that are still queued
+"""
+
+import os
+import sys
+import tempfile
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from app import create_app
+from app.models import ActivityLog
+from app.logging_utils import log_activity
+from config import Config
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_BATCH_SIZE = 4
+        ACTIVITY_LOG_FLUSH_INTERVAL = 0.05
+    return create_app(TestConfig)
+
+
+def test_activity_log_writer():
+    """Logins are logged through the background writer"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        writer = app.extensions['activity_log_writer']
+        client = app.test_client()
+
+        for _ in range(10):
+            response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+            assert response.status_code == 200
+        client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'wrong'})
+
+        writer.flush(timeout=5)
+        with app.app_context():
+            assert ActivityLog.query.filter_by(action='User Login').count() == 10
+            assert ActivityLog.query.filter_by(action='Login Failed').count() == 1
+
+        stats = writer.stats()
+        assert stats['written'] == 11
+        assert stats['backlog'] == 0
+        assert stats['dropped'] == 0
+
+        headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        response = client.get('/api/user/activity-logs/writer-stats', headers=headers)
+        assert response.status_code == 200
+        assert response.get_json()['written'] >= 11
+
+        with app.test_request_context():
+            for i in range(7):
+                log_activity("Drain Check", details=str(i), user_email='admin@example.com')
+        writer.stop()
+        with app.app_context():
+            assert ActivityLog.query.filter_by(action='Drain Check').count() == 7
+
+
+if __name__ == "__main__":
+    test_activity_log_writer()
+    print("✅ Activity log writer tests passed!")
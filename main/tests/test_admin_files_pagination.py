@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the paginated admin file listing
+
+This script tests that:
+1. /api/user/admin/files returns pages of the requested size
+2. Following next_cursor walks every file exactly once, newest first
+3. Owner, filename prefix and date filters are applied server-side
+4. A malformed cursor is rejected
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from app import create_app
+from app.models import db, User, File
+from config import Config
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def login(client, email, password):
+    response = client.post('/api/auth/login', json={'email': email, 'password': password})
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+def test_admin_files_pagination():
+    """Walk the admin file listing page by page"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        base = datetime(2025, 1, 1)
+        with app.app_context():
+            owner = User(email='geo@example.com', role='Geologue')
+            owner.set_password('Password1')
+            db.session.add(owner)
+            db.session.flush()
+            # Two files share each timestamp so the id tie-breaker matters
+            for i in range(25):
+                db.session.add(File(
+                    filename=f"{'well' if i % 2 else 'core'}_{i}.pdf",
+                    path=f"/tmp/{i}.pdf",
+                    owner_id=owner.id,
+                    created_at=base + timedelta(minutes=i // 2)
+                ))
+            db.session.commit()
+
+        client = app.test_client()
+        headers = login(client, 'admin@example.com', 'admin123')
+
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 10}
+            if cursor:
+                params['cursor'] = cursor
+            response = client.get('/api/user/admin/files', query_string=params, headers=headers)
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data['count'] <= 10
+            assert data['total_count'] == data['count']
+            seen.extend(data['files'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        assert len(seen) == 25
+        assert len({f['id'] for f in seen}) == 25
+        keys = [(f['created_at'], f['id']) for f in seen]
+        assert keys == sorted(keys, reverse=True)
+        assert all(f['owner'] == 'geo@example.com' for f in seen)
+
+        response = client.get('/api/user/admin/files', query_string={'filename_prefix': 'core_'}, headers=headers)
+        assert {f['filename'][:5] for f in response.get_json()['files']} == {'core_'}
+
+        response = client.get('/api/user/admin/files', query_string={'owner': 'admin@example.com'}, headers=headers)
+        assert response.get_json()['files'] == []
+
+        response = client.get('/api/user/admin/files', query_string={
+            'created_after': (base + timedelta(minutes=10)).isoformat()
+        }, headers=headers)
+        assert response.get_json()['count'] == 5
+
+        response = client.get('/api/user/admin/files', query_string={'cursor': 'not-a-cursor'}, headers=headers)
+        assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    test_admin_files_pagination()
+    print("✅ Admin file pagination tests passed!")
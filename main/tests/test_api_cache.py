@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the client response cache and backend ETags
+
+This script tests that:
+1. JSON reads carry an ETag and If-None-Match is answered with an empty 304
+2. A cached GET is served from memory within its TTL, then revalidated with a 304
+3. Entries are kept apart per token and per parameters
+4. invalidate() makes the next read see a mutation
+5. Identical GETs in flight at the same time share one request
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from werkzeug.serving import make_server
+from utils.api_client import ApiClient
+from config import Config
+from test_api_client import make_app, free_port
+
+
+def test_api_cache():
+    """Repeat reads stay local until they expire or are invalidated"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        hits = []
+        app.before_request(lambda: hits.append(1))
+
+        test_client = app.test_client()
+        token = test_client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'}).get_json()['token']
+        headers = {'Authorization': f'Bearer {token}'}
+        response = test_client.get('/api/zone/zones', headers=headers)
+        etag = response.headers['ETag']
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+        response = test_client.get('/api/zone/zones', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304 and response.data == b''
+
+        port = free_port()
+        server = make_server('127.0.0.1', port, app, threaded=True,
+                             ssl_context=(Config.SERVER_CERT, Config.SERVER_KEY))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = ApiClient(f'https://127.0.0.1:{port}')
+            hits.clear()
+            first = client.get_cached('/api/zone/zones', headers=headers)
+            second = client.get_cached('/api/zone/zones', headers=headers)
+            assert second is first and len(hits) == 1
+
+            revalidated = client.get_cached('/api/zone/zones', ttl=0, headers=headers)
+            assert len(hits) == 2
+            assert revalidated is first and revalidated.status_code == 200
+
+            other = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'}).json()['token']
+            client.get_cached('/api/zone/zones', headers={'Authorization': f'Bearer {other}'})
+            client.get_cached('/api/user/admin/files', headers=headers)
+            client.get_cached('/api/user/admin/files', params={'limit': 1}, headers=headers)
+            assert len(hits) == 6  # login + one request per key
+
+            # A mutation is only seen once the cached path is invalidated
+            zone = {'sigle': 'HMD', 'puits': 'HMD-1', 'bloc': '421', 'permis': 'Hassi'}
+            assert client.post('/api/zone/zones', json=zone, headers=headers).status_code == 201
+            assert client.get_cached('/api/zone/zones', headers=headers).json()['zones'] == []
+            client.invalidate('/api/zone/zones')
+            zones = client.get_cached('/api/zone/zones', headers=headers).json()['zones']
+            assert [z['sigle'] for z in zones] == ['HMD']
+
+            # Concurrent identical reads share one request
+            calls = []
+            original_get = client.get
+
+            def slow_get(*args, **kwargs):
+                calls.append(1)
+                time.sleep(0.3)
+                return original_get(*args, **kwargs)
+
+            client.get = slow_get
+            client.invalidate()
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(client.get_cached('/api/zone/zones', headers=headers)))
+                       for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+            assert len(calls) == 1 and len(results) == 5
+            assert all(result is results[0] for result in results)
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    test_api_cache()
+    print("✅ API cache tests passed!")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared API client
+
+This script tests that:
+1. Paths are joined to the configured base URL and every request gets a timeout
+2. The server certificate is verified against the backend CA, and a missing CA refuses to connect
+3. Consecutive requests reuse one kept-alive connection (no new TLS handshake)
+4. Connection failures surface as requests exceptions once retries are exhausted
+"""
+
+import os
+import sys
+import socket
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+import requests
+from werkzeug.serving import make_server
+from utils.api_client import ApiClient, CACertificateError, DEFAULT_CA_CERT
+from app import create_app
+from config import Config
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_api_client():
+    """Requests go through one verified, kept-alive HTTPS connection"""
+    client = ApiClient('https://127.0.0.1:5000/', timeout=(1, 2))
+    assert client.url('/api/zone/zones') == 'https://127.0.0.1:5000/api/zone/zones'
+    assert client.session.verify == str(DEFAULT_CA_CERT)
+
+    # No CA certificate: fail closed unless insecure mode is asked for
+    missing = os.path.join(tempfile.gettempdir(), 'no-such-ca.pem')
+    try:
+        ApiClient(ca_cert=missing)
+        assert False, 'a missing CA certificate should refuse to connect'
+    except CACertificateError as e:
+        assert isinstance(e, requests.exceptions.RequestException)
+    assert ApiClient(ca_cert=missing, insecure=True).session.verify is False
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        port = free_port()
+        server = make_server('127.0.0.1', port, app, threaded=True,
+                             ssl_context=(Config.SERVER_CERT, Config.SERVER_KEY))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = ApiClient(f'https://127.0.0.1:{port}', timeout=(5, 10))
+            response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+            assert response.status_code == 200
+            headers = {'Authorization': f"Bearer {response.json()['token']}"}
+            for _ in range(5):
+                assert client.get('/api/zone/zones', headers=headers).status_code == 200
+
+            pools = client.session.get_adapter(client.base_url).poolmanager.pools
+            assert sum(pools[key].num_connections for key in pools.keys()) == 1
+
+            # Without the backend CA, the self-signed chain is rejected
+            untrusted = requests.Session()
+            try:
+                untrusted.get(client.url('/api/zone/zones'), timeout=5)
+                assert False, 'certificate should not verify against the system store'
+            except requests.exceptions.SSLError:
+                pass
+        finally:
+            server.shutdown()
+
+    closed = ApiClient(f'https://127.0.0.1:{free_port()}', timeout=(1, 1), retries=1)
+    try:
+        closed.get('/api/zone/zones')
+        assert False, 'nothing listens on this port'
+    except requests.exceptions.ConnectionError:
+        pass
+
+
+if __name__ == "__main__":
+    test_api_client()
+    print("✅ API client tests passed!")
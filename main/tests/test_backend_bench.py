@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Test script for the backend benchmark suite
+
+This script tests that:
+1. benchmarks/backend_bench.py seeds a small database and runs every scenario
+2. Each result reports latency percentiles, throughput and query counts
+3. The JSON output can be fed back with --compare
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'benchmarks'))
+
+import backend_bench
+
+
+def test_backend_bench():
+    """Run the suite on tiny volumes"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, 'results.json')
+        results = backend_bench.main(['--users', '10', '--files', '200', '--logs', '500',
+                                      '--zones', '5', '--iterations', '3', '--warmup', '1', '-o', output])
+        assert set(results['results']) >= {'user_files', 'admin_files_first_page', 'activity_logs_search',
+                                           'zones', 'upload', 'download'}
+        for result in results['results'].values():
+            assert 0 < result['p50_ms'] <= result['p95_ms'] <= result['max_ms']
+            assert result['throughput_rps'] > 0
+            assert result['queries_per_request'] >= 1
+
+        with open(output, encoding='utf-8') as f:
+            assert json.load(f)['meta']['volumes']['files'] == 200
+        backend_bench.main(['--users', '10', '--files', '200', '--logs', '500', '--iterations', '2',
+                            '--warmup', '0', '--only', 'zones', '--compare', output])
+
+
+if __name__ == "__main__":
+    test_backend_bench()
+    print("✅ Backend benchmark tests passed!")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the deduplicated blob store
+
+This script tests that:
+1. Exporting identical bytes twice stores them once, with two references
+2. Blobs are fanned out under UPLOAD_FOLDER/blobs/ab/cd/
+3. Deleting a file only unlinks the blob once nothing references it
+4. A blob released but not yet collected survives a new upload of the same content
+5. Deleting a user releases the blobs of their files
+"""
+
+import io
+import os
+import sys
+import hashlib
+import tempfile
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from app import create_app
+from app.models import db, Blob, File
+from app.storage import release_blob, collect_blobs
+from config import Config
+
+PDF_BYTES = b"%PDF-1.4\n" + b"1 0 obj << /Type /Catalog >> endobj\n" * 100 + b"%%EOF\n"
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def test_blob_store():
+    """Identical exports share one blob"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+        file_ids = []
+        for name in ('first.pdf', 'second.pdf'):
+            response = client.post('/api/user/files/export-pdf', headers=headers, data={
+                'file': (io.BytesIO(PDF_BYTES), name)
+            }, content_type='multipart/form-data')
+            assert response.status_code == 201
+            file_ids.append(response.get_json()['file_id'])
+
+        sha256 = hashlib.sha256(PDF_BYTES).hexdigest()
+        expected_path = os.path.join(tmp_dir, 'uploads', 'blobs', sha256[:2], sha256[2:4], sha256)
+        with app.app_context():
+            blob = Blob.query.get(sha256)
+            assert blob.ref_count == 2
+            assert blob.size == len(PDF_BYTES)
+            assert {File.query.get(i).path for i in file_ids} == {expected_path}
+        assert os.path.exists(expected_path)
+
+        response = client.delete(f'/api/user/files/{file_ids[0]}', headers=headers)
+        assert response.status_code == 200
+        assert os.path.exists(expected_path)
+        with app.app_context():
+            assert Blob.query.get(sha256).ref_count == 1
+
+        response = client.delete(f'/api/user/files/{file_ids[1]}', headers=headers)
+        assert response.status_code == 200
+        assert not os.path.exists(expected_path)
+        with app.app_context():
+            assert Blob.query.get(sha256) is None
+
+
+def upload(client, headers, name, content=PDF_BYTES):
+    response = client.post('/api/user/files/export-pdf', headers=headers, data={
+        'file': (io.BytesIO(content), name)
+    }, content_type='multipart/form-data')
+    assert response.status_code == 201
+    return response.get_json()['file_id']
+
+
+def test_collection_and_user_delete():
+    """Collection re-checks the reference count; deleting a user releases their blobs"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        admin_headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        sha256 = hashlib.sha256(PDF_BYTES).hexdigest()
+
+        # A delete committed its release, then the same content is uploaded
+        # again before the blob is collected: the bytes must stay
+        file_id = upload(client, admin_headers, 'first.pdf')
+        with app.app_context():
+            path = File.query.get(file_id).path
+            db.session.delete(File.query.get(file_id))
+            release_blob(sha256)
+            db.session.commit()
+            assert Blob.query.get(sha256).ref_count == 0
+        upload(client, admin_headers, 'again.pdf')
+        with app.app_context():
+            assert collect_blobs() == 0
+            assert Blob.query.get(sha256).ref_count == 1
+        assert os.path.exists(path)
+
+        response = client.post('/api/user-management/create-user', headers=admin_headers, json={
+            'email': 'geo@example.com', 'password': 'Geologue123', 'role': 'Geologue'
+        })
+        assert response.status_code == 201
+        response = client.post('/api/auth/login', json={'email': 'geo@example.com', 'password': 'Geologue123'})
+        geo_headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        upload(client, geo_headers, 'shared.pdf')
+        own_content = PDF_BYTES + b"% geo\n"
+        upload(client, geo_headers, 'own.pdf', own_content)
+        own_sha256 = hashlib.sha256(own_content).hexdigest()
+
+        response = client.delete('/api/user-management/delete-user/geo@example.com', headers=admin_headers)
+        assert response.status_code == 200
+        with app.app_context():
+            assert Blob.query.get(sha256).ref_count == 1
+            assert Blob.query.get(own_sha256) is None
+            assert File.query.count() == 1
+        assert os.path.exists(path)
+        blobs = os.path.join(tmp_dir, 'uploads', 'blobs')
+        assert not os.path.exists(os.path.join(blobs, own_sha256[:2], own_sha256[2:4], own_sha256))
+
+
+if __name__ == "__main__":
+    test_blob_store()
+    test_collection_and_user_delete()
+    print("✅ Blob store tests passed!")
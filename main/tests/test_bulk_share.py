@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk file sharing
+
+This script tests that:
+1. /api/user/files/bulk-share grants every file x user pair in one call
+2. Pairs that already exist are not reported again
+3. A request including a file the caller may not share is refused with 403
+4. Missing files are skipped and reported per file
+5. action=unshare removes the pairs and one log entry is written per call
+6. A body that is not a JSON object is rejected with 400
+"""
+
+import os
+import sys
+import tempfile
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from app import create_app
+from app.models import db, User, File, ActivityLog, file_access
+from config import Config
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def login(client, email, password):
+    response = client.post('/api/auth/login', json={'email': email, 'password': password})
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+def test_bulk_share():
+    """Share and unshare many files with many users at once"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        with app.app_context():
+            owner = User(email='geo@example.com', role='Geologue')
+            other = User(email='other@example.com', role='Geologue')
+            team = [User(email=f'team{i}@example.com', role='Geophysicien') for i in range(3)]
+            for user in [owner, other] + team:
+                user.set_password('Password1')
+                db.session.add(user)
+            db.session.flush()
+            files = [File(filename=f'well_{i}.pdf', path=f'/tmp/{i}.pdf', owner_id=owner.id) for i in range(4)]
+            foreign = File(filename='foreign.pdf', path='/tmp/foreign.pdf', owner_id=other.id)
+            db.session.add_all(files + [foreign])
+            db.session.flush()
+            files[0].users_with_access.append(team[0])
+            db.session.commit()
+            file_ids = [f.id for f in files]
+            foreign_id = foreign.id
+            team_ids = [u.id for u in team]
+
+        client = app.test_client()
+        headers = login(client, 'geo@example.com', 'Password1')
+
+        response = client.post('/api/user/files/bulk-share', headers=headers, json={
+            'file_ids': file_ids + [foreign_id],
+            'user_ids': team_ids
+        })
+        assert response.status_code == 403
+        assert response.get_json()['file_ids'] == [foreign_id]
+        with app.app_context():
+            assert db.session.query(file_access).count() == 1
+
+        response = client.post('/api/user/files/bulk-share', headers=headers, json={
+            'file_ids': file_ids + [9999],
+            'user_ids': team_ids
+        })
+        assert response.status_code == 200
+        results = {r['file_id']: r for r in response.get_json()['results']}
+        assert results[9999]['status'] == 'not_found'
+        assert len(results[file_ids[0]]['changed']) == 2
+        assert all(len(results[i]['changed']) == 3 for i in file_ids[1:])
+
+        with app.app_context():
+            assert db.session.query(file_access).count() == 12
+            assert ActivityLog.query.filter_by(action='File Share').count() == 1
+
+        response = client.post('/api/user/files/bulk-share', headers=headers, json={
+            'file_ids': file_ids,
+            'user_ids': team_ids[:2],
+            'action': 'unshare'
+        })
+        assert response.status_code == 200
+        assert all(len(r['changed']) == 2 for r in response.get_json()['results'])
+        with app.app_context():
+            assert db.session.query(file_access).count() == 4
+            assert ActivityLog.query.filter_by(action='File Unshare').count() == 1
+
+        response = client.post('/api/user/files/bulk-share', headers=headers, json={
+            'file_ids': file_ids, 'user_ids': team_ids, 'action': 'move'
+        })
+        assert response.status_code == 400
+
+        for body in ([file_ids], 'share', {'file_ids': 5, 'user_ids': team_ids}):
+            response = client.post('/api/user/files/bulk-share', headers=headers, json=body)
+            assert response.status_code == 400, body
+
+
+if __name__ == "__main__":
+    test_bulk_share()
+    print("✅ Bulk share tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for conditional and partial downloads
+
+This script tests that:
+1. Downloads carry a strong ETag equal to the content SHA-256
+2. If-None-Match with that ETag returns 304 Not Modified
+3. Range requests return 206 Partial Content with the requested bytes
+"""
+
+import io
+import os
+import sys
+import hashlib
+import tempfile
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from app import create_app
+from config import Config
+
+PDF_BYTES = b"%PDF-1.4\n" + b"1 0 obj << /Type /Catalog >> endobj\n" * 100 + b"%%EOF\n"
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def test_download_ranges():
+    """ETag, 304 and 206 on file downloads"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+        response = client.post('/api/user/files/upload', headers=headers, data={
+            'file': (io.BytesIO(PDF_BYTES), 'report.pdf')
+        }, content_type='multipart/form-data')
+        url = f"/api/user/files/{response.get_json()['file_id']}/download"
+
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.data == PDF_BYTES
+        etag = response.headers['ETag']
+        assert etag == f'"{hashlib.sha256(PDF_BYTES).hexdigest()}"'
+        assert response.headers['Accept-Ranges'] == 'bytes'
+
+        response = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+        response = client.get(url, headers={**headers, 'Range': 'bytes=100-'})
+        assert response.status_code == 206
+        assert response.data == PDF_BYTES[100:]
+        assert response.headers['Content-Range'] == f'bytes 100-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}'
+
+        response = client.get(url, headers={**headers, 'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        assert response.status_code == 200
+        assert response.data == PDF_BYTES
+
+
+if __name__ == "__main__":
+    test_download_ranges()
+    print("✅ Download range tests passed!")
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Test script for the autosave edit journal
+
+This script tests that:
+1. Recorded pages are appended to <project>.journal, not to the project file
+2. recover() folds the journal into <project>.autosave and removes it
+3. A line torn by a crash is ignored, the records before it are kept
+4. Compaction folds the journal into the autosave on a background thread,
+   and reports a failure as an event
+5. open_project() reopens or drops unsaved edits as asked, leaving the project file alone
+6. save() and discard() leave no journal or autosave behind
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from functions import edit_journal
+from functions.edit_journal import EditJournal, recover, journal_paths, autosave_path, open_project
+from utils.sincus_file import SincusReader, write_project
+
+HEADER = {'project_info': {'tete': 'Journal'}, 'font_size': 14}
+
+
+def make_page(text, height=40):
+    return {
+        'columns': [{'content': f'{text} {c}', 'bold_ranges': []} for c in range(8)],
+        'boxes': [{'bg_color': '#FFFF00', 'texture': '', 'height': height}]
+    }
+
+
+def make_project(pages):
+    return {
+        'project_info': {'tete': 'Base'},
+        'font_size': 12,
+        'pages_data': [make_page(f'base {i}')['columns'] for i in range(pages)],
+        'log_boxes_data': [make_page(f'base {i}')['boxes'] for i in range(pages)]
+    }
+
+
+def read_project(path):
+    with SincusReader(path) as reader:
+        return reader.to_dict()
+
+
+def test_record_and_recover():
+    """Records stay in the journal until recover() folds them in"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'project.sincus')
+        write_project(path, make_project(3))
+        size = os.path.getsize(path)
+
+        journal = EditJournal(path)
+        journal.record(HEADER, {1: make_page('edited', 80)}, 3)
+        journal.record(HEADER, {3: make_page('added')}, 4)
+        assert os.path.getsize(path) == size
+        assert os.path.exists(f"{path}.journal")
+
+        # A crash in the middle of the next append
+        with open(f"{path}.journal", 'a', encoding='utf-8') as f:
+            f.write('{"page": 0, "columns": [')
+
+        assert recover(path)
+        assert not any(os.path.exists(p) for p in journal_paths(path))
+        assert os.path.getsize(path) == size
+        project = read_project(autosave_path(path))
+        assert project['project_info'] == HEADER['project_info'] and project['font_size'] == 14
+        assert len(project['pages_data']) == 4
+        assert project['pages_data'][0][0]['content'] == 'base 0 0'
+        assert project['pages_data'][1][0]['content'] == 'edited 0'
+        assert project['log_boxes_data'][1][0]['height'] == 80
+        assert project['pages_data'][3][7]['content'] == 'added 7'
+
+        # Later edits build on the autosave
+        journal.record(HEADER, {2: make_page('again')}, 4)
+        assert recover(path)
+        project = read_project(autosave_path(path))
+        assert [columns[0]['content'] for columns in project['pages_data']] == [
+            'base 0 0', 'edited 0', 'again 0', 'added 0']
+        journal.discard()
+        assert not recover(path)
+    print("✅ Journaled pages are recovered, the torn line is ignored")
+
+
+def test_untitled_and_removed_pages():
+    """A journal without a project file creates it; a smaller page count drops pages"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'untitled.sincus')
+        journal = EditJournal(path)
+        journal.record(HEADER, {0: make_page('a'), 1: make_page('b'), 2: make_page('c')}, 3)
+        journal.record(HEADER, {}, 2)
+        assert recover(path)
+        assert not os.path.exists(path)
+        project = read_project(autosave_path(path))
+        assert [columns[0]['content'] for columns in project['pages_data']] == ['a 0', 'b 0']
+    print("✅ Untitled projects are recovered")
+
+
+def test_compaction():
+    """Past COMPACT_RECORDS lines the journal is folded in the background"""
+    saved, saved_fold = edit_journal.COMPACT_RECORDS, edit_journal.fold
+    edit_journal.COMPACT_RECORDS = 10
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'project.sincus')
+            write_project(path, make_project(5))
+            size = os.path.getsize(path)
+            journal = EditJournal(path)
+            for i in range(5):
+                journal.record(HEADER, {i: make_page(f'edit {i}')}, 5)
+            journal._thread.join()
+            assert not any(os.path.exists(p) for p in journal_paths(path))
+            assert os.path.getsize(path) == size
+            project = read_project(autosave_path(path))
+            assert [columns[0]['content'] for columns in project['pages_data']] == [
+                f'edit {i} 0' for i in range(5)]
+
+            # Records after the compaction start a new journal
+            journal.record(HEADER, {0: make_page('later')}, 5)
+            with open(f"{path}.journal", encoding='utf-8') as f:
+                assert len(f.readlines()) == 2
+
+            # A failed compaction keeps the journal and tells the app
+            def broken_fold(path, journals):
+                raise OSError('disk full')
+            edit_journal.fold = broken_fold
+            for i in range(5):
+                journal.record(HEADER, {i: make_page(f'lost {i}')}, 5)
+            journal._thread.join()
+            assert journal.events.get_nowait() == ('compaction_failed', 'disk full')
+            assert os.path.exists(journal_paths(path)[0])
+    finally:
+        edit_journal.COMPACT_RECORDS = saved
+        edit_journal.fold = saved_fold
+    print("✅ The journal is compacted into the autosave file")
+
+
+def test_open_project():
+    """Unsaved edits are only reopened when the user agrees"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'project.sincus')
+        write_project(path, make_project(2))
+        with open(path, 'rb') as f:
+            saved = f.read()
+
+        asked = []
+        with open_project(path, lambda: asked.append(path)) as reader:
+            assert reader.page(0)[0][0]['content'] == 'base 0 0'
+        assert asked == []  # nothing to recover
+
+        EditJournal(path).record(HEADER, {0: make_page('unsaved')}, 2)
+        with open_project(path, lambda: True) as reader:
+            assert reader.path == path
+            assert reader.page(0)[0][0]['content'] == 'unsaved 0'
+        with open(path, 'rb') as f:
+            assert f.read() == saved
+
+        # Declined: the edits are dropped, the project is opened as saved
+        with open_project(path, lambda: False) as reader:
+            assert reader.page(0)[0][0]['content'] == 'base 0 0'
+        assert not os.path.exists(autosave_path(path))
+        assert not any(os.path.exists(p) for p in journal_paths(path))
+    print("✅ Unsaved edits are reopened or dropped as asked")
+
+
+def test_save_and_discard():
+    """A full save or a discard leaves no journal behind"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'project.sincus')
+        journal = EditJournal(path)
+        journal.record(HEADER, {0: make_page('draft')}, 1)
+        journal._compact()
+        assert os.path.exists(autosave_path(path))
+        journal.save(json.loads(json.dumps(make_project(2))))
+        assert not os.path.exists(f"{path}.journal") and not os.path.exists(autosave_path(path))
+        assert len(read_project(path)['pages_data']) == 2
+
+        journal.record(HEADER, {0: make_page('draft')}, 1)
+        journal._compact()
+        journal.discard()
+        assert not os.path.exists(f"{path}.journal") and not os.path.exists(autosave_path(path))
+        assert os.path.exists(path)
+        journal.discard(delete_project=True)
+        assert not os.path.exists(path)
+    print("✅ save() and discard() remove the journal and autosave")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing the autosave edit journal...")
+    test_record_and_recover()
+    test_untitled_and_removed_pages()
+    test_compaction()
+    test_open_project()
+    test_save_and_discard()
+    print("✅ All edit journal tests passed!")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script for the PDF export benchmark
+
+This script tests that:
+1. Synthetic projects follow the save_project() structure
+2. Exporting one through PDFExporter without a display yields a PDF with one page per project page
+3. The results report per-stage timings, peak memory and output size
+4. Parallel runs report the parent process's peak memory
+"""
+
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'benchmarks'))
+
+import export_bench
+
+
+def test_export_bench():
+    """Run the export benchmark on small projects"""
+    project = export_bench.synthetic_project(3, 5, 60, random.Random(1))
+    assert set(project) == {'project_info', 'pages_data', 'log_boxes_data', 'font_size', 'version'}
+    assert len(project['pages_data']) == 3 and len(project['log_boxes_data'][0]) == 5
+
+    pdf, elapsed, stages, _ = export_bench.export_once(project)
+    assert pdf.startswith(b'%PDF')
+    # PDFExporter ends every export with one blank page
+    assert pdf.count(b'/Type /Page\n') + pdf.count(b'/Type /Page ') == 4
+    assert sum(stages.values()) <= elapsed
+
+    results = export_bench.main(['--pages', '1', '2', '--boxes', '4', '--iterations', '1', '--warmup', '0'])
+    for result in results['results'].values():
+        assert set(result['stages_ms']) == set(export_bench.STAGES)
+        assert result['peak_memory_kb'] > 0
+        assert result['pdf_bytes'] > 0
+
+    results = export_bench.main(['--pages', '8', '--boxes', '4', '--iterations', '1', '--warmup', '0',
+                                 '--workers', '2'])
+    result = results['results']['8p_4b']
+    assert result['peak_memory_kb'] > 0 and result['pdf_bytes'] > 0
+
+
+if __name__ == "__main__":
+    test_export_bench()
+    print("✅ Export benchmark tests passed!")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for snapshot-based PDF export
+
+This script tests that:
+1. A project dict becomes an immutable snapshot of tuples
+2. Each page is rendered with its own text, with bold ranges kept
+3. Rendering the same snapshot twice gives the same PDF (no state is mutated)
+4. Rendering works from a worker thread
+"""
+
+import os
+import sys
+import re
+import zlib
+import base64
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from functions.export_pdf import PDFExporter
+from functions.snapshot import snapshot_from_project, column_markup, ColumnSnapshot
+
+
+def make_project():
+    return {
+        'project_info': {
+            'carotte_summary': 'Carotté : 18 m', 'puits': 'Nord West Trig-2', 'sigle': 'NWT-2',
+            'permis': 'Ohanet II', 'bloc': '234a', 'echelle': '1/40', 'carottier': '12440525',
+            'mud_type': 'OBM', 'carotte': '11', 'couronne': '6"', 'd_value': '1,08',
+            'tete': '2930m', 'core_type': 'Ci3126', 'fun_vis': '46', 'pied': '3948m'
+        },
+        'pages_data': [
+            [{'content': '', 'bold_ranges': []}] * 7 +
+            [{'content': f'page{n} description', 'bold_ranges': [['1.0', '1.5']]}]
+            for n in range(3)
+        ],
+        'log_boxes_data': [[{'bg_color': '#FFFF00', 'texture': '...', 'height': 40}] for _ in range(3)],
+        'font_size': 12
+    }
+
+
+def page_texts(pdf):
+    """Decoded (ASCII85 + Flate) content streams of a PDF, in order."""
+    texts = []
+    for stream in re.findall(rb'stream\r?\n(.*?)endstream', pdf, re.S):
+        try:
+            texts.append(zlib.decompress(base64.a85decode(stream.strip(), adobe=True)))
+        except (ValueError, zlib.error):
+            pass
+    return b''.join(texts)
+
+
+def test_export_snapshot():
+    """Render pages from a plain-data snapshot"""
+    snapshot = snapshot_from_project(make_project())
+    assert isinstance(snapshot.pages, tuple) and isinstance(snapshot.pages[0].columns, tuple)
+    assert snapshot.tete_start == 2930
+
+    assert column_markup(ColumnSnapshot('Grès <fin>\nargile', (('1.0', '1.4'),))) == '<b>Grès</b> &lt;fin&gt;<br/>argile'
+
+    first = PDFExporter(app=None).render(snapshot)
+    second = PDFExporter(app=None).render(snapshot)
+    assert len(first) == len(second)
+    assert snapshot.pages[0].boxes == snapshot_from_project(make_project()).pages[0].boxes
+
+    texts = page_texts(first)
+    for n in range(3):
+        assert f'(page{n}) Tj'.encode() in texts
+
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(pdf=PDFExporter(app=None).render(snapshot)))
+    thread.start()
+    thread.join(30)
+    assert result['pdf'].startswith(b'%PDF')
+
+
+if __name__ == "__main__":
+    test_export_snapshot()
+    print("✅ Export snapshot tests passed!")
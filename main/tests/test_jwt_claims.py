@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for role claims and the revocation cache
+
+This script tests that:
+1. The login token carries email/role/is_admin claims
+2. Role-protected endpoints authorize without querying the user table
+3. Deleting a user revokes the tokens already issued to them
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from sqlalchemy import event
+from flask_jwt_extended import decode_token
+from app import create_app
+from app.models import db
+from config import Config
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def test_jwt_claims():
+    """Authorization comes from the token, revocation from the cache"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        token = response.get_json()['token']
+        headers = {'Authorization': f'Bearer {token}'}
+
+        with app.app_context():
+            claims = decode_token(token)
+        assert claims['role'] == 'Responsable'
+        assert claims['is_admin'] is True
+        assert claims['email'] == 'admin@example.com'
+
+        user_queries = []
+        with app.app_context():
+            engine = db.engine
+
+        def count_user_queries(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT') and 'FROM user' in statement:
+                user_queries.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', count_user_queries)
+        try:
+            response = client.post('/api/zone/zones', headers=headers, json={
+                'sigle': 'NWT-2', 'puits': 'Nord West Trig-2', 'bloc': '234a', 'permis': 'Ohanet II'
+            })
+            assert response.status_code == 201
+            response = client.get('/api/admin/users', headers=headers)
+            assert response.status_code == 200
+        finally:
+            event.remove(engine, 'before_cursor_execute', count_user_queries)
+        # Only the /users listing itself reads the user table
+        assert len(user_queries) == 1
+
+        response = client.post('/api/user-management/create-user', headers=headers, json={
+            'email': 'geo@example.com', 'password': 'Password1', 'role': 'Geologue'
+        })
+        assert response.status_code == 201
+        response = client.post('/api/auth/login', json={'email': 'geo@example.com', 'password': 'Password1'})
+        geo_headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        assert client.get('/api/user/files', headers=geo_headers).status_code == 200
+        assert client.get('/api/user/admin/files', headers=geo_headers).status_code == 403
+
+        # Revocation has one-second resolution, like the token's iat
+        time.sleep(1.1)
+        response = client.delete('/api/user-management/delete-user/geo@example.com', headers=headers)
+        assert response.status_code == 200
+        response = client.get('/api/user/files', headers=geo_headers)
+        assert response.status_code == 401
+        assert client.get('/api/user/files', headers=headers).status_code == 200
+
+if __name__ == "__main__":
+    test_jwt_claims()
+    print("✅ JWT claims tests passed!")
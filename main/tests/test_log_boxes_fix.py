@@ -47,38 +47,8 @@ def create_test_project():
     temp_file = tempfile.NamedTemporaryFile(suffix='.sincus', delete=False, mode='w')
     temp_file.close()
     
-    # Create save data manually
-    save_data = {
-        'project_info': project_info,
-        'pages_data': [],
-        'log_boxes_data': [],
-        'font_size': app.root.taille,
-        'version': '1.0'
-    }
-    
-    # Save text content from all pages
-    for page in app.pages:
-        page_data = []
-        for text_widget in page:
-            text_content = text_widget.get("1.0", "end-1c")
-            page_data.append({
-                'content': text_content,
-                'bold_ranges': []
-            })
-        save_data['pages_data'].append(page_data)
-    
-    # Save log boxes data
-    for page_log_boxes in app.log_boxes:
-        page_boxes_data = []
-        for box in page_log_boxes['boxes']:
-            box_data = {
-                'bg_color': getattr(box['frame'], 'bg_color', '#FFFFFF'),
-                'texture': getattr(box['frame'], 'texture', ''),
-                'height': box['frame'].winfo_height(),
-                'expandable': box.get('expandable', False)
-            }
-            page_boxes_data.append(box_data)
-        save_data['log_boxes_data'].append(page_boxes_data)
+    # Same data as save_project() writes
+    save_data = app.project_data()
     
     # Save to file
     with open(temp_file.name, 'w', encoding='utf-8') as f:
@@ -110,14 +80,13 @@ def test_load_project(file_path):
         # Load the project data
         app.load_project_data(save_data)
         
-        # Test if log boxes structure is properly initialized
-        print(f"Number of log box pages: {len(app.log_boxes)}")
+        # Test if the log boxes were loaded into the page data
+        print(f"Number of pages: {len(app.pages)}")
         
-        if app.log_boxes:
-            last_page = app.log_boxes[-1]
+        if app.pages:
+            last_page = app.pages[-1]
             print(f"Last page has {len(last_page['boxes'])} boxes")
-            print(f"Current expandable: {last_page['current_expandable'] is not None}")
-            print(f"Container valid: {last_page.get('container') is not None}")
+            print(f"Last box expandable: {last_page['boxes'][-1]['expandable']}")
             
             # Test adding a new log box
             print("Testing add_log_box...")
@@ -134,7 +103,7 @@ def test_load_project(file_path):
                 print("FAILURE: Add Log button did not add a new box")
                 return False
         else:
-            print("FAILURE: No log boxes structure found")
+            print("FAILURE: No pages found")
             return False
             
     except Exception as e:
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test script for the virtualized page view
+
+This script tests that:
+1. visible_range() covers the pages in the viewport plus the overscan
+2. Only pages near the viewport get widgets, however many pages there are
+3. Page widgets leaving the viewport are pooled and reused for other pages
+4. Text typed in a page is written back to app.pages (and the page marked for
+   autosave) when it scrolls away or on sync()
+5. The focused text widget is forgotten when its page's widgets are released
+
+The canvas and page widgets are replaced by fakes, so no display is needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from types import SimpleNamespace
+from gui import page_view
+from gui.page_view import PageView, visible_range
+
+
+class FakeCanvas:
+    """Just enough of tk.Canvas for PageView: scrolling and window items"""
+
+    def __init__(self, width=800, height=900):
+        self.width, self.height = width, height
+        self.top = 0
+        self.region_height = 0
+        self.items = {}
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def configure(self, scrollregion):
+        self.region_height = scrollregion[3]
+
+    def yview_moveto(self, fraction):
+        self.top = fraction * self.region_height
+
+    def after_idle(self, callback):
+        callback()
+
+    def create_window(self, x, y, window, anchor):
+        item = len(self.items) + 1
+        self.items[item] = {'coords': [x, y], 'state': 'normal'}
+        return item
+
+    def coords(self, item, *xy):
+        if xy:
+            self.items[item]['coords'] = list(xy)
+        return self.items[item]['coords']
+
+    def itemconfigure(self, item, state):
+        self.items[item]['state'] = state
+
+    def delete(self, item):
+        del self.items[item]
+
+
+class FakeText:
+    def __init__(self):
+        self.content = ''
+        self.modified = False
+
+    def edit(self, content):
+        self.content = content
+        self.modified = True
+
+    def edit_modified(self, flag=None):
+        if flag is None:
+            return self.modified
+        self.modified = flag
+
+
+def make_view(built):
+    def build_page(app, parent):
+        built.append(1)
+        return {'frame': SimpleNamespace(destroy=lambda: None), 'texts': [FakeText() for _ in range(8)],
+                'boxes': [], 'index': None}
+    return build_page
+
+
+def fill_page(app, view, index):
+    view['index'] = index
+    for text, column in zip(view['texts'], app.pages[index]['columns']):
+        text.content = column['content']
+
+
+def read_column(text):
+    return {'content': text.content, 'bold_ranges': []}
+
+
+def make_app(page_count):
+    app = SimpleNamespace(a4_height=841, current_text_widget=None, current_page=None, dirty_pages=set())
+    app.pages = [
+        {'columns': [{'content': f'page {i}', 'bold_ranges': []} for _ in range(8)], 'boxes': []}
+        for i in range(page_count)
+    ]
+    return app
+
+
+def test_visible_range():
+    """The viewport's pages plus one page of overscan on each side"""
+    assert visible_range(0, 900, 891, 0) == (0, 0)
+    assert visible_range(0, 900, 891, 100) == (0, 3)
+    assert visible_range(891 * 10, 891 * 10 + 900, 891, 100) == (9, 13)
+    assert visible_range(891 * 99, 891 * 99 + 900, 891, 100) == (98, 100)
+    assert visible_range(0, 900, 891, 100, overscan=0) == (0, 2)
+    print("✅ visible_range covers the viewport and overscan")
+
+
+def test_page_view():
+    """Widgets exist only near the viewport and are recycled while scrolling"""
+    built = []
+    saved = page_view.build_page, page_view.fill_page, page_view.read_column
+    page_view.build_page, page_view.fill_page, page_view.read_column = make_view(built), fill_page, read_column
+    try:
+        app = make_app(200)
+        canvas = FakeCanvas()
+        view = PageView(app, canvas)
+        view.refresh()
+        assert sorted(view.views) == [0, 1, 2]
+        assert canvas.region_height == 200 * view.slot_height + page_view.PAGE_GAP
+
+        # Type in page 1, then scroll through the whole document
+        view.views[1]['texts'][0].edit('edited')
+        app.current_text_widget, app.current_page = view.views[1]['texts'][0], 1
+        for index in range(0, 200, 3):
+            view.show(index)
+            assert len(view.views) <= 4
+            assert index in view.views
+            shown = view.views[index]
+            assert shown['index'] == index and shown['texts'][1].content == f'page {index}'
+            y = canvas.items[view._windows[id(shown)]]['coords'][1]
+            assert y == view.page_top(index)
+        assert len(built) <= 4 + page_view.POOL_SIZE
+        assert len(canvas.items) == len(view.views) + len(view._pool)
+        assert app.pages[1]['columns'][0]['content'] == 'edited'
+        assert app.dirty_pages == {1}
+        assert app.current_text_widget is None and app.current_page is None
+
+        # Materialized pages are written back on sync()
+        last = max(view.views)
+        view.views[last]['texts'][7].edit('last page')
+        view.sync()
+        assert app.pages[last]['columns'][7]['content'] == 'last page'
+        assert app.dirty_pages == {1, last}
+
+        # After the pages are replaced, reset() shows the new ones from the top
+        app.pages = make_app(5).pages
+        view.reset()
+        assert sorted(view.views) == [0, 1, 2]
+        assert view.views[0]['texts'][0].content == 'page 0'
+        print(f"✅ 200 pages scrolled with {len(built)} page widget sets")
+    finally:
+        page_view.build_page, page_view.fill_page, page_view.read_column = saved
+
+
+if __name__ == "__main__":
+    print("🧪 Testing the virtualized page view...")
+    test_visible_range()
+    test_page_view()
+    print("✅ All page view tests passed!")
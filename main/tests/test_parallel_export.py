@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel PDF export
+
+This script tests that:
+1. Pages are split into contiguous chunks of similar size
+2. Short projects are rendered in-process, like PDFExporter.render()
+3. Chunks rendered in worker processes are merged back in page order
+4. The merged PDF keeps the closing blank page
+5. A pool broken by a dead worker is replaced instead of failing every later export
+6. Chunks are merged from disk: the parent's peak memory does not grow with the document
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from io import BytesIO
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pypdf import PdfReader
+from functions.export_pdf import PDFExporter
+from functions import parallel_export
+from functions.parallel_export import render_snapshot, split_pages
+from functions.pdf_merge import merge_pdfs, PDFMergeError
+from functions.snapshot import snapshot_from_project
+from test_export_snapshot import make_project
+
+
+def make_long_project(pages):
+    project = make_project()
+    project['pages_data'] = [
+        [{'content': '', 'bold_ranges': []}] * 7 +
+        [{'content': f'page{n} description', 'bold_ranges': []}]
+        for n in range(pages)
+    ]
+    project['log_boxes_data'] = [[{'bg_color': '#808080', 'texture': '- - -', 'height': 20}]] * pages
+    return project
+
+
+def test_split_pages():
+    """Chunks are contiguous, cover every page and are not too small"""
+    pages = tuple(range(10))
+    assert split_pages(pages, 1) == [pages]
+    assert split_pages(pages, 2) == [pages[:5], pages[5:]]
+    assert split_pages(pages, 8) == [pages[:5], pages[5:]]
+    assert split_pages(tuple(range(13)), 3) == [tuple(range(5)), tuple(range(5, 9)), tuple(range(9, 13))]
+    assert split_pages(pages[:3], 4) == [pages[:3]]
+
+
+def test_parallel_export():
+    """Merged chunks come back in page order with the closing blank page"""
+    pages = 12
+    snapshot = snapshot_from_project(make_long_project(pages))
+
+    serial = PdfReader(BytesIO(render_snapshot(snapshot, workers=1)))
+    merged = PdfReader(BytesIO(render_snapshot(snapshot, workers=3)), strict=True)
+    assert len(serial.pages) == len(merged.pages) == pages + 1
+
+    for n in range(pages):
+        content = merged.pages[n].get_contents().get_data()
+        assert f'(page{n} description) Tj'.encode() in content
+        assert f'(page{n + 1} description) Tj'.encode() not in content
+    assert not merged.pages[pages].get_contents() or b'Tj' not in merged.pages[pages].get_contents().get_data()
+
+    # Writing to a file gives the same document
+    out = BytesIO()
+    render_snapshot(snapshot, out, workers=3)
+    assert len(PdfReader(BytesIO(out.getvalue())).pages) == pages + 1
+
+    # A chunk leaves out the closing blank page
+    chunk = PDFExporter(app=None).render(snapshot._replace(pages=snapshot.pages[:2]), trailing_page=False)
+    assert len(PdfReader(BytesIO(chunk)).pages) == 2
+
+
+def test_broken_pool():
+    """A worker that died breaks the shared pool; the next export starts a new one"""
+    pages = 8
+    snapshot = snapshot_from_project(make_long_project(pages))
+    broken = parallel_export._get_pool(2)
+    try:
+        broken.submit(os._exit, 1).result()
+    except BrokenProcessPool:
+        pass
+    else:
+        raise AssertionError("the pool should be broken")
+
+    merged = PdfReader(BytesIO(render_snapshot(snapshot, workers=2)))
+    assert len(merged.pages) == pages + 1
+    assert parallel_export._pool is not broken
+
+
+def parent_peak(snapshot, out_path):
+    """Peak memory allocated in this process while exporting snapshot to out_path"""
+    tracemalloc.start()
+    try:
+        with open(out_path, 'wb') as out:
+            render_snapshot(snapshot, out, workers=2)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_merge_memory():
+    """A ten times longer export needs about the same parent memory"""
+    small = snapshot_from_project(make_long_project(16))
+    large = snapshot_from_project(make_long_project(160))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        out_path = os.path.join(tmp_dir, 'export.pdf')
+        render_snapshot(small, workers=2)  # start the pool outside the measure
+        small_peak = parent_peak(small, out_path)
+        large_peak = parent_peak(large, out_path)
+        large_size = os.path.getsize(out_path)
+        with open(out_path, 'rb') as f:
+            assert len(PdfReader(f, strict=True).pages) == 161
+
+        # Whole-document merging held several copies of the PDF
+        assert large_peak < small_peak + large_size / 2, (small_peak, large_peak, large_size)
+
+        broken = os.path.join(tmp_dir, 'broken.pdf')
+        with open(broken, 'wb') as f:
+            f.write(b'%PDF-1.4\nnot a chunk')
+        try:
+            merge_pdfs([broken])
+            assert False, 'a file without xref table should not merge'
+        except PDFMergeError:
+            pass
+    print(f"✅ Parent peak {small_peak // 1024} KB for 16 pages, {large_peak // 1024} KB for 160")
+
+
+if __name__ == "__main__":
+    test_split_pages()
+    test_parallel_export()
+    test_broken_pool()
+    test_merge_memory()
+    print("✅ Parallel export tests passed!")
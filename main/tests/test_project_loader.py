@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental project loading
+
+This script tests that:
+1. The first page is loaded before start() returns, the rest in LOAD_SLICE idle slices
+2. Progress is reported between slices and the scroll region follows the loaded pages
+3. finish() loads the remaining pages at once; cancel() stops the loading
+4. Saved text, bold ranges and log boxes come through to the page data
+
+The Tk root and page view are replaced by fakes, so no display is needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from types import SimpleNamespace
+from functions.project_loader import ProjectLoader, LOAD_SLICE
+from utils.sincus_file import SincusReader
+
+
+class FakeRoot:
+    """Idle callbacks are queued and run by run_idle()"""
+
+    def __init__(self):
+        self.idle = {}
+        self.next_id = 0
+
+    def after_idle(self, callback, *args):
+        self.next_id += 1
+        self.idle[self.next_id] = (callback, args)
+        return self.next_id
+
+    def after_cancel(self, job):
+        self.idle.pop(job, None)
+
+    def run_idle(self):
+        job = min(self.idle)
+        callback, args = self.idle.pop(job)
+        callback(*args)
+
+
+def make_app():
+    app = SimpleNamespace(root=FakeRoot(), pages=[], _log_min_height=18, refreshes=[])
+    app.page_view = SimpleNamespace(refresh=lambda: app.refreshes.append(len(app.pages)))
+    return app
+
+
+def make_project(pages):
+    return SincusReader.from_dict({
+        'pages_data': [
+            [{'content': f'page {i} col {c}', 'bold_ranges': [['1.0', '1.4']]} for c in range(8)]
+            for i in range(pages)
+        ],
+        'log_boxes_data': [
+            [{'bg_color': '#FFFF00', 'texture': '----', 'height': 40},
+             {'bg_color': '#0000FF', 'height': 60}]
+            for _ in range(pages)
+        ],
+        'font_size': 12
+    })
+
+
+def test_loads_in_slices():
+    """First page at once, the others one slice per idle callback"""
+    app = make_app()
+    progress, done = [], []
+    loader = ProjectLoader(app, make_project(50), on_progress=lambda n, total: progress.append((n, total)),
+                           on_done=done.append)
+    loader.start()
+    assert len(app.pages) == 1 and progress == [(1, 50)] and not done
+
+    slices = 0
+    while app.root.idle:
+        app.root.run_idle()
+        slices += 1
+    assert slices == -(-49 // LOAD_SLICE)
+    assert len(app.pages) == 50 and done == [None]
+    assert app.refreshes[-1] == 50 and progress[-1][0] < 50
+
+    page = app.pages[7]
+    assert page['columns'][3] == {'content': 'page 7 col 3', 'bold_ranges': [('1.0', '1.4')]}
+    assert [box['height'] for box in page['boxes']] == [40, 60]
+    assert [box['expandable'] for box in page['boxes']] == [False, True]
+    assert page['boxes'][1]['texture'] == ''
+    print(f"✅ 50 pages loaded in 1 + {slices} slices")
+
+
+def test_finish_and_cancel():
+    """finish() completes a load at once; cancel() leaves it where it is"""
+    app = make_app()
+    done = []
+    loader = ProjectLoader(app, make_project(100), on_done=done.append)
+    loader.start()
+    app.root.run_idle()
+    loader.finish()
+    assert len(app.pages) == 100 and done == [None] and not app.root.idle
+    loader.finish()
+    assert done == [None]
+
+    app = make_app()
+    loader = ProjectLoader(app, make_project(100), on_done=done.append)
+    loader.start()
+    loader.cancel()
+    assert len(app.pages) == 1 and not app.root.idle
+
+    app = make_app()
+    done = []
+    ProjectLoader(app, SincusReader.from_dict({'pages_data': []}), on_done=done.append).start()
+    assert app.pages == [] and done == [None]
+    print("✅ finish() and cancel() work")
+
+
+def test_load_error():
+    """A malformed page stops the load and reports the error"""
+    app = make_app()
+    pages_data = [[{'content': 'text'}] for _ in range(30)]
+    pages_data[25] = None
+    done = []
+    loader = ProjectLoader(app, SincusReader.from_dict({'pages_data': pages_data}), on_done=done.append)
+    loader.start()
+    while app.root.idle:
+        app.root.run_idle()
+    assert len(done) == 1 and isinstance(done[0], TypeError)
+    print("✅ Load errors are reported")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing incremental project loading...")
+    test_loads_in_slices()
+    test_finish_and_cancel()
+    test_load_error()
+    print("✅ All project loader tests passed!")
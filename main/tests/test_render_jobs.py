@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Test script for server-side PDF rendering jobs
+
+This script tests that:
+1. A .sincus document posted as JSON or as a file (version 1 or 2) is queued and returns a job id
+2. The job renders one PDF page per document page into a File owned by the caller
+3. A document that fails to render marks the job as 'error'
+4. Malformed documents are rejected up front, including malformed or oversized
+   version 2 records (400, not a server error)
+5. The server renders a document byte for byte like the desktop client's layout
+6. Jobs left queued by a stopped server are marked as failed when it starts again,
+   but not by other apps created on the same database
+7. A job whose PDF cannot be stored is marked 'error' and leaves no blob behind
+"""
+
+import io
+import os
+import sys
+import json
+import zlib
+import struct
+import tempfile
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from app import create_app
+from app import render_jobs
+from app.models import db, Blob, File, RenderJob
+from app.rendering import render_to_file
+from config import Config
+from reportlab import rl_config
+from functions.pdf_layout import PDFLayout
+from functions.snapshot import snapshot_from_project
+from utils.sincus_file import write_project, MAGIC, MAX_RECORD_BYTES
+
+PROJECT_INFO = {
+    'carotte_summary': 'Carotté : 18 m', 'puits': 'Nord West Trig-2', 'sigle': 'NWT-2',
+    'permis': 'Ohanet II', 'bloc': '234a', 'echelle': '1/40', 'carottier': '12440525',
+    'mud_type': 'OBM', 'carotte': '11', 'couronne': '6" x 2 5/8"', 'd_value': '1,08',
+    'tete': '2930m', 'core_type': 'Ci3126', 'fun_vis': '46', 'pied': '3948m'
+}
+
+
+def make_document(pages, bg_color='#FFFF00'):
+    return {
+        'project_info': PROJECT_INFO,
+        'pages_data': [
+            [{'content': f'Grès fin <{p}>\nligne 2', 'bold_ranges': [('1.0', '1.4')]}] +
+            [{'content': '', 'bold_ranges': []}] * 7
+            for p in range(pages)
+        ],
+        'log_boxes_data': [
+            [{'bg_color': bg_color, 'texture': '...', 'height': 120, 'expandable': False}]
+            for _ in range(pages)
+        ],
+        'font_size': 12,
+        'version': '1.0'
+    }
+
+
+def pack(obj):
+    return zlib.compress(json.dumps(obj).encode('utf-8'))
+
+
+def sincus_bytes(header, records):
+    """A version 2 file from already compressed header and page records"""
+    data = MAGIC + struct.pack('<I', len(header)) + header
+    index = b''
+    for record in records:
+        index += struct.pack('<QI', len(data), len(record))
+        data += record
+    return data + index + struct.pack('<QI', len(data), len(records))
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+        RENDER_WORKERS = 2
+    return create_app(TestConfig)
+
+
+def test_render_jobs():
+    """Render .sincus documents in the background"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+        response = client.post('/api/render/jobs', headers=headers,
+                               json={'document': make_document(3), 'filename': 'NWT-2 carotte 11'})
+        assert response.status_code == 202
+        json_job = response.get_json()['job_id']
+
+        response = client.post('/api/render/jobs', headers=headers, data={
+            'file': (io.BytesIO(json.dumps(make_document(1)).encode('utf-8')), 'puits.sincus')
+        }, content_type='multipart/form-data')
+        assert response.status_code == 202
+        file_job = response.get_json()['job_id']
+
+        # A project saved by the client is a version 2 file, not JSON
+        saved_path = os.path.join(tmp_dir, 'saved.sincus')
+        write_project(saved_path, make_document(2))
+        with open(saved_path, 'rb') as f:
+            response = client.post('/api/render/jobs', headers=headers, data={
+                'file': (f, 'saved.sincus')
+            }, content_type='multipart/form-data')
+        assert response.status_code == 202
+        saved_job = response.get_json()['job_id']
+
+        response = client.post('/api/render/jobs', headers=headers,
+                               json={'document': make_document(1, bg_color='not-a-colour')})
+        bad_job = response.get_json()['job_id']
+
+        assert app.extensions['render_queue'].wait(timeout=60)
+
+        job = client.get(f'/api/render/jobs/{json_job}', headers=headers).get_json()
+        assert job['status'] == 'done', job
+        assert job['filename'] == 'NWT-2_carotte_11.pdf'
+        with app.app_context():
+            rendered = File.query.get(job['file_id'])
+            with open(rendered.path, 'rb') as f:
+                pdf = f.read()
+        assert pdf.startswith(b'%PDF')
+        assert pdf.count(b'/Type /Page\n') + pdf.count(b'/Type /Page ') == 3
+        assert len(pdf) == rendered.size
+
+        job = client.get(f'/api/render/jobs/{file_job}', headers=headers).get_json()
+        assert job['status'] == 'done'
+        assert job['filename'] == 'puits.pdf'
+
+        job = client.get(f'/api/render/jobs/{saved_job}', headers=headers).get_json()
+        assert job['status'] == 'done', job
+        with app.app_context():
+            with open(File.query.get(job['file_id']).path, 'rb') as f:
+                pdf = f.read()
+        assert pdf.count(b'/Type /Page\n') + pdf.count(b'/Type /Page ') == 2
+
+        job = client.get(f'/api/render/jobs/{bad_job}', headers=headers).get_json()
+        assert job['status'] == 'error'
+        assert job['file_id'] is None
+
+        response = client.post('/api/render/jobs', headers=headers, json={'document': {'pages_data': []}})
+        assert response.status_code == 400
+        response = client.post('/api/render/jobs', headers=headers, data={
+            'file': (io.BytesIO(b'not json'), 'broken.sincus')
+        }, content_type='multipart/form-data')
+        assert response.status_code == 400
+        with open(saved_path, 'rb') as f:
+            truncated = f.read()[:-40]
+        response = client.post('/api/render/jobs', headers=headers, data={
+            'file': (io.BytesIO(truncated), 'truncated.sincus')
+        }, content_type='multipart/form-data')
+        assert response.status_code == 400
+
+
+def test_malformed_uploads():
+    """Malformed version 2 files are a 400, never a server error"""
+    page = {'columns': make_document(1)['pages_data'][0], 'boxes': None}
+    bomb = zlib.compress(b' ' * MAX_RECORD_BYTES + b'{}')
+    malformed = {
+        'header is a list': sincus_bytes(pack([1, 2]), []),
+        'header is a string': sincus_bytes(pack('header'), []),
+        'page is a list': sincus_bytes(pack({'page_count': 1}), [pack([page])]),
+        'page count is a string': sincus_bytes(pack({'page_count': '1'}), [pack(page)]),
+        'negative page count': sincus_bytes(pack({'page_count': -1}), []),
+        'header bomb': sincus_bytes(bomb, []),
+        'page bomb': sincus_bytes(pack({'page_count': 1}), [bomb]),
+        'truncated record': sincus_bytes(pack({'page_count': 1}), [pack(page)[:-5]]),
+    }
+    assert len(bomb) < 100 * 1024
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+        valid = sincus_bytes(pack({'page_count': 1}), [pack(page)])
+        for name, content in dict(malformed, valid=valid).items():
+            response = client.post('/api/render/jobs', headers=headers, data={
+                'file': (io.BytesIO(content), 'upload.sincus')
+            }, content_type='multipart/form-data')
+            assert response.status_code == (202 if name == 'valid' else 400), (name, response.get_json())
+        assert app.extensions['render_queue'].wait(timeout=60)
+
+
+def test_same_layout_as_client():
+    """Server and client PDFs come from the same layout code"""
+    saved = rl_config.invariant
+    rl_config.invariant = 1  # no timestamps or random ids in the PDF
+    try:
+        document = make_document(2)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path, _, _ = render_to_file(document, tmp_dir, logo_path=Config.REPORT_LOGO)
+            with open(path, 'rb') as f:
+                server_pdf = f.read()
+        client_pdf = PDFLayout(Config.REPORT_LOGO).render(snapshot_from_project(document), trailing_page=False)
+        assert server_pdf == client_pdf
+    finally:
+        rl_config.invariant = saved
+
+
+def test_interrupted_jobs():
+    """Only a starting server fails the jobs whose documents were lost"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        with app.app_context():
+            db.session.add(RenderJob(owner_id=1, filename='lost.pdf'))
+            db.session.commit()
+
+        # Another app on the same database (a migration, a CLI command)
+        # leaves the live server's queued jobs alone
+        other = make_app(tmp_dir)
+        with other.app_context():
+            assert RenderJob.query.filter_by(filename='lost.pdf').one().status == 'queued'
+
+        # What run.py and serve.py do at start-up
+        restarted = make_app(tmp_dir)
+        assert restarted.extensions['render_queue'].fail_interrupted() == 1
+        with restarted.app_context():
+            job = RenderJob.query.filter_by(filename='lost.pdf').one()
+            assert job.status == 'error' and job.finished_at is not None
+            assert 'restart' in job.error
+
+
+def test_recording_failure():
+    """A failure after the render is recorded on the job, and the PDF is dropped"""
+    saved = render_jobs.store_temp
+
+    def store_then_fail(tmp):
+        saved(tmp)
+        raise OSError('disk full')
+
+    render_jobs.store_temp = store_then_fail
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = make_app(tmp_dir)
+            client = app.test_client()
+            response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+            headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+            response = client.post('/api/render/jobs', headers=headers, json={'document': make_document(1)})
+            job_id = response.get_json()['job_id']
+            assert app.extensions['render_queue'].wait(timeout=60)
+
+            job = client.get(f'/api/render/jobs/{job_id}', headers=headers).get_json()
+            assert job['status'] == 'error' and job['error'] == 'disk full'
+            assert job['file_id'] is None
+            with app.app_context():
+                assert Blob.query.count() == 0 and File.query.count() == 0
+            blobs = os.path.join(tmp_dir, 'uploads', 'blobs')
+            assert [files for _, _, files in os.walk(blobs) if files] == []
+    finally:
+        render_jobs.store_temp = saved
+
+
+if __name__ == "__main__":
+    test_render_jobs()
+    test_malformed_uploads()
+    test_same_layout_as_client()
+    test_interrupted_jobs()
+    test_recording_failure()
+    print("✅ Render job tests passed!")
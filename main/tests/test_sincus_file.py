@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the .sincus file format
+
+This script tests that:
+1. A project written as version 2 reads back page by page, identical to the dict
+2. The header is read without decoding any page record
+3. Version 1 (JSON) files are read transparently
+4. A large project is several times smaller than its version 1 JSON
+5. Truncated or garbage files raise SincusFormatError
+"""
+
+import os
+import sys
+import json
+import random
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'benchmarks'))
+
+from utils import sincus_file
+from utils.sincus_file import SincusReader, SincusFormatError, write_project, MAGIC
+from export_bench import synthetic_project
+
+
+def make_project(pages):
+    project = synthetic_project(pages, 5, 60, random.Random(7))
+    project['pages_data'][0][0]['bold_ranges'] = [['1.0', '1.4']]
+    # A page without log box data keeps the default box when loaded
+    project['log_boxes_data'] = project['log_boxes_data'][:-1]
+    # As a JSON file would hold it (bold ranges as lists)
+    return json.loads(json.dumps(project))
+
+
+def test_round_trip():
+    """Every page reads back as saved, in any order"""
+    project = make_project(40)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'project.sincus')
+        write_project(path, project)
+        assert not os.path.exists(f"{path}.tmp")
+        with open(path, 'rb') as f:
+            assert f.read(len(MAGIC)) == MAGIC
+
+        with SincusReader(path) as reader:
+            assert reader.version == sincus_file.VERSION
+            assert reader.project_info == project['project_info']
+            assert reader.font_size == project['font_size']
+            assert reader.page_count == 40
+            for page_idx in [39, 0, 17, 38]:
+                columns, boxes = reader.page(page_idx)
+                assert columns == project['pages_data'][page_idx]
+                expected = project['log_boxes_data'][page_idx] if page_idx < 39 else None
+                assert boxes == expected
+            try:
+                reader.page(40)
+                assert False, "page 40 does not exist"
+            except IndexError:
+                pass
+    print("✅ Version 2 round trip works")
+
+
+def test_header_only():
+    """Opening reads the header; a damaged page only fails when it is read"""
+    project = make_project(10)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'project.sincus')
+        write_project(path, project)
+        with SincusReader(path) as reader:
+            columns, _ = reader.page(3)
+            with open(path, 'r+b') as f:
+                f.seek(reader._index_offset + 5 * 12)
+                offset = int.from_bytes(f.read(8), 'little')
+                f.seek(offset)
+                f.write(b'garbage')
+        with SincusReader(path) as reader:
+            assert reader.page_count == 10 and reader.project_info == project['project_info']
+            assert reader.page(3)[0] == columns
+            try:
+                reader.page(5)
+                assert False, "page 5 is damaged"
+            except SincusFormatError:
+                pass
+    print("✅ The header is read without the pages")
+
+
+def test_v1_and_size():
+    """JSON files still open, and version 2 is several times smaller"""
+    project = make_project(200)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        v1_path = os.path.join(tmp_dir, 'v1.sincus')
+        v2_path = os.path.join(tmp_dir, 'v2.sincus')
+        with open(v1_path, 'w', encoding='utf-8') as f:
+            json.dump(project, f, indent=2, ensure_ascii=False)
+        write_project(v2_path, project)
+
+        with SincusReader(v1_path) as reader:
+            assert reader.version == '1.0' and reader.page_count == 200
+            assert reader.page(12) == (project['pages_data'][12], project['log_boxes_data'][12])
+            assert reader.page(199)[1] is None
+
+        v1_size, v2_size = os.path.getsize(v1_path), os.path.getsize(v2_path)
+        assert v2_size * 3 < v1_size, (v1_size, v2_size)
+    print(f"✅ Version 1 files open; 200 pages: {v1_size} bytes as v1, {v2_size} as v2")
+
+
+def test_invalid_files():
+    """Truncated and foreign files are reported as SincusFormatError"""
+    project = make_project(5)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'project.sincus')
+        write_project(path, project)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        for content in [b'', b'not a project', b'[1, 2]', MAGIC + b'\x05', data[:len(data) // 2]]:
+            with open(path, 'wb') as f:
+                f.write(content)
+            try:
+                with SincusReader(path) as reader:
+                    reader.page(reader.page_count - 1)
+                assert False, f"{content[:20]!r} should not load"
+            except SincusFormatError:
+                pass
+    print("✅ Invalid files are rejected")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing the .sincus file format...")
+    test_round_trip()
+    test_header_only()
+    test_v1_and_size()
+    test_invalid_files()
+    print("✅ All .sincus file format tests passed!")
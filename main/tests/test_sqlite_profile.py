@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for the production SQLite profile
+
+This script tests that:
+1. Connections run in WAL mode with the configured pragmas
+2. The db-upgrade command adds the secondary indexes to an existing database
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from sqlalchemy import text
+from app import create_app
+from app.models import db
+from config import Config
+
+
+def test_sqlite_profile():
+    """Pragmas on connect and the index migration"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'app.db')
+        # A database created before the indexes existed
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE file (id INTEGER PRIMARY KEY, filename VARCHAR(255) NOT NULL, "
+                     "path VARCHAR(512) NOT NULL, owner_id INTEGER NOT NULL, created_at DATETIME)")
+        conn.commit()
+        conn.close()
+
+        class TestConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+            UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+            ACTIVITY_LOG_ASYNC = False
+
+        app = create_app(TestConfig)
+        with app.app_context():
+            with db.engine.connect() as conn:
+                assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+                assert conn.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+                assert conn.execute(text('PRAGMA busy_timeout')).scalar() == 5000
+
+        result = app.test_cli_runner().invoke(args=['db-upgrade'])
+        assert result.exit_code == 0, result.output
+        assert 'Created index ix_file_owner_id' in result.output
+
+        conn = sqlite3.connect(db_path)
+        indexes = {row[1] for row in conn.execute("SELECT * FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        assert {'ix_file_owner_id', 'ix_file_created_at_id'} <= indexes
+
+        result = app.test_cli_runner().invoke(args=['db-upgrade'])
+        assert 'Created index' not in result.output
+
+
+if __name__ == "__main__":
+    test_sqlite_profile()
+    print("✅ SQLite profile tests passed!")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming PDF export and upload
+
+This script tests that:
+1. The export worker renders straight into the destination file, then queues the upload
+2. A failed render does not leave a partial file behind
+3. Past the parallel threshold the export still streams: the worker's peak memory
+   does not grow with the document
+4. The multipart body is streamed by requests with a Content-Length
+5. The backend accepts the streamed body like a regular upload
+"""
+
+import os
+import sys
+import queue
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+import requests
+from functions.export_pdf import PDFExporter
+from functions.snapshot import snapshot_from_project
+from utils.multipart import MultipartFileBody
+from test_export_snapshot import make_project
+from test_parallel_export import make_long_project
+from app import create_app
+from app.models import File
+from config import Config
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def test_export_to_file():
+    """The worker writes the PDF to its destination and cleans up on failure"""
+    snapshot = snapshot_from_project(make_project())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        exporter = PDFExporter(app=None)
+        queued = []
+        exporter._queue_upload = lambda path, filename: queued.append(filename)
+        local_path = Path(tmp_dir) / 'export.pdf'
+        results = queue.Queue()
+        exporter._export_worker(snapshot, local_path, 'export.pdf', results)
+        assert results.get_nowait()[0] == 'success'
+        assert queued == ['export.pdf']
+        with open(local_path, 'rb') as f:
+            assert f.read(5) == b'%PDF-'
+
+        broken = snapshot._replace(pages=None)
+        failed_path = Path(tmp_dir) / 'broken.pdf'
+        exporter._export_worker(broken, failed_path, 'broken.pdf', results)
+        assert results.get_nowait()[0] == 'error'
+        assert not failed_path.exists()
+        assert queued == ['export.pdf']
+
+
+def test_parallel_export_to_file():
+    """Long exports render in worker processes and are merged into the file from disk"""
+    def export_peak(pages, local_path):
+        exporter = PDFExporter(app=None)
+        exporter.workers = 2
+        exporter._queue_upload = lambda path, filename: None
+        results = queue.Queue()
+        snapshot = snapshot_from_project(make_long_project(pages))
+        tracemalloc.start()
+        try:
+            exporter._export_worker(snapshot, local_path, 'export.pdf', results)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert results.get_nowait()[0] == 'success'
+        return peak
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        local_path = Path(tmp_dir) / 'export.pdf'
+        export_peak(16, local_path)  # start the pool outside the measure
+        small_peak = export_peak(16, local_path)
+        large_peak = export_peak(160, local_path)
+        assert large_peak < small_peak + local_path.stat().st_size / 2, (small_peak, large_peak)
+        with open(local_path, 'rb') as f:
+            assert f.read(5) == b'%PDF-'
+
+
+def test_streamed_upload():
+    """The multipart body streams from disk and parses like files= uploads"""
+    snapshot = snapshot_from_project(make_project())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, 'report.pdf')
+        PDFExporter(app=None).render(snapshot, pdf_path)
+
+        body = MultipartFileBody('file', pdf_path, 'report.pdf', 'application/pdf')
+        prepared = requests.Request('POST', 'https://localhost:5000/api/user/files/export-pdf', data=body,
+                                    headers={'Content-Type': body.content_type}).prepare()
+        assert prepared.body is body
+        assert int(prepared.headers['Content-Length']) == len(body)
+        assert 'Transfer-Encoding' not in prepared.headers
+
+        # Small reads cross the head / file / tail boundaries
+        chunks = []
+        while True:
+            chunk = body.read(1000)
+            if not chunk:
+                break
+            assert len(chunk) <= 1000
+            chunks.append(chunk)
+        data = b''.join(chunks)
+        assert len(data) == len(body)
+
+        app = make_app(tmp_dir)
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        response = client.post('/api/user/files/export-pdf', data=data, headers=headers,
+                               content_type=body.content_type)
+        assert response.status_code == 201, response.get_data(as_text=True)
+        with app.app_context():
+            stored = File.query.filter_by(filename='report.pdf').first()
+            assert stored.size == os.path.getsize(pdf_path)
+
+
+if __name__ == "__main__":
+    test_export_to_file()
+    test_parallel_export_to_file()
+    test_streamed_upload()
+    print("✅ Streaming export tests passed!")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming upload ingestion
+
+This script tests that:
+1. A PDF upload is stored with its SHA-256 and size recorded on the File row
+2. A non-PDF upload is rejected without leaving anything on disk
+3. The export endpoint goes through the same path
+"""
+
+import io
+import os
+import sys
+import hashlib
+import tempfile
+
+# Make the backend package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend'))
+
+from app import create_app
+from app.models import File
+from config import Config
+
+PDF_BYTES = b"%PDF-1.4\n" + b"1 0 obj << /Type /Catalog >> endobj\n" * 5000 + b"%%EOF\n"
+
+
+def make_app(tmp_dir):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp_dir, 'test.db')
+        UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+        ACTIVITY_LOG_ASYNC = False
+    return create_app(TestConfig)
+
+
+def test_streaming_upload():
+    """Uploads are sniffed, hashed and renamed into place"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(tmp_dir)
+        client = app.test_client()
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+        headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+        response = client.post('/api/user/files/upload', headers=headers, data={
+            'file': (io.BytesIO(PDF_BYTES), 'report.pdf')
+        }, content_type='multipart/form-data')
+        assert response.status_code == 201
+        file_id = response.get_json()['file_id']
+
+        with app.app_context():
+            stored = File.query.get(file_id)
+            assert stored.sha256 == hashlib.sha256(PDF_BYTES).hexdigest()
+            assert stored.size == len(PDF_BYTES)
+            with open(stored.path, 'rb') as f:
+                assert f.read() == PDF_BYTES
+            tmp_blob_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'blobs', 'tmp')
+
+        response = client.post('/api/user/files/upload', headers=headers, data={
+            'file': (io.BytesIO(b"just some text\n" * 1000), 'notes.pdf')
+        }, content_type='multipart/form-data')
+        assert response.status_code == 400
+        assert os.listdir(tmp_blob_dir) == []
+        with app.app_context():
+            assert File.query.count() == 1
+
+        response = client.post('/api/user/files/export-pdf', headers=headers, data={
+            'file': (io.BytesIO(PDF_BYTES), 'export.pdf')
+        }, content_type='multipart/form-data')
+        assert response.status_code == 201
+        assert os.listdir(tmp_blob_dir) == []
+
+
+if __name__ == "__main__":
+    test_streaming_upload()
+    print("✅ Streaming upload tests passed!")
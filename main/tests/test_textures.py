@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the log box texture cache
+
+This script tests that:
+1. Every texture offered by the box configurator has a square TILE pattern
+2. Image sizes are rounded up to whole tiles
+3. Boxes of the same texture, colour and (rounded) size share one image
+4. Each (texture, colour) tile is painted once, and old images are dropped past max_images
+
+PhotoImage is replaced by a fake, so no display is needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from gui import textures
+from gui.textures import TextureCache, PATTERNS, TILE, cover_size, tile_data
+
+
+class FakePhotoImage:
+    created = []
+
+    def __init__(self, master=None, width=0, height=0):
+        self.width, self.height = width, height
+        self.data = None
+        self.copies = []
+        self.tk = self
+        FakePhotoImage.created.append(self)
+
+    def put(self, data):
+        self.data = data
+
+    def call(self, image, command, tile, option, *region):
+        assert image is self and command == 'copy' and option == '-to'
+        self.copies.append((tile, region))
+
+
+def test_patterns():
+    """The configurator's textures all have a TILE x TILE pattern"""
+    offered = ["----", "||||", "////", "∿∿∿", "●●●", "xxxx", "○ ○ ○", "+ + +"]
+    assert sorted(PATTERNS) == sorted(offered)
+    for pattern in PATTERNS.values():
+        assert len(pattern) == TILE and all(len(row) == TILE for row in pattern)
+
+    data = tile_data(["#.", ".#"], '#ffff00')
+    assert data == '{#000000 #ffff00} {#ffff00 #000000}'
+    assert cover_size(100, 40) == (108, 48)
+    assert cover_size(96, 1) == (96, 12)
+    print("✅ Texture patterns are valid")
+
+
+def test_cache():
+    """Images are shared by (texture, colour, rounded size) and bounded in number"""
+    saved = textures.tk.PhotoImage
+    textures.tk.PhotoImage = FakePhotoImage
+    FakePhotoImage.created = []
+    try:
+        cache = TextureCache(None, max_images=3)
+        assert cache.image('', '#FFFFFF', 60, 40) is None
+        assert cache.image('~~', '#FFFFFF', 60, 40) is None
+        assert FakePhotoImage.created == []
+
+        first = cache.image('----', '#FFFF00', 60, 40)
+        assert (first.width, first.height) == (60, 48)
+        tile = first.copies[0][0]
+        assert first.copies == [(tile, (0, 0, 60, 48))]
+        assert tile.data == tile_data(PATTERNS['----'], '#ffff00')
+
+        # Same colour in another case, a height in the same tile row: same image
+        assert cache.image('----', '#ffff00', 60, 45) is first
+        assert len(FakePhotoImage.created) == 2
+
+        # A taller box reuses the tile
+        taller = cache.image('----', '#FFFF00', 60, 200)
+        assert taller is not first and taller.copies[0][0] is tile
+        assert len(FakePhotoImage.created) == 3
+
+        # Past max_images the least recently used image is dropped
+        cache.image('////', '#FFFF00', 60, 40)
+        cache.image('xxxx', '#FFFF00', 60, 40)
+        assert cache.image('----', '#FFFF00', 60, 200) is taller
+        assert cache.image('----', '#FFFF00', 60, 40) is not first
+    finally:
+        textures.tk.PhotoImage = saved
+    print(f"✅ {len(FakePhotoImage.created)} images built for 8 texture lookups")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing the log box texture cache...")
+    test_patterns()
+    test_cache()
+    print("✅ All texture cache tests passed!")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test script for the background export upload queue
+
+This script tests that:
+1. A queued PDF is uploaded in the background with progress events
+2. Failed uploads are retried with backoff and only reported once retries are exhausted
+3. A file the server rejects is reported without retrying
+4. Pending uploads are kept on disk and resume in a new queue (app restart)
+5. Uploads are only sent, and only use up attempts, while their owner is logged in
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import functions.upload_queue as upload_queue
+from functions.upload_queue import UploadQueue, UploadError, retry_delay
+from utils.multipart import MultipartFileBody
+
+
+def wait_for(events, kinds, timeout=10):
+    """Collect events until one of the given kinds arrives."""
+    seen = []
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            event = events.get(timeout=0.1)
+        except Exception:
+            continue
+        seen.append(event)
+        if event[0] in kinds:
+            return seen
+    raise AssertionError(f'no {kinds} event, got {seen}')
+
+
+def make_token(user_id):
+    """A JWT-shaped token for user_id (the queue does not check signatures)."""
+    claims = base64.urlsafe_b64encode(json.dumps({'sub': str(user_id)}).encode()).decode().rstrip('=')
+    return f'header.{claims}.signature'
+
+
+def fake_upload(calls, failures=0, retryable=True):
+    """An upload that fails `failures` times, then reads the whole body."""
+    def upload(path, filename, token=None, progress=None):
+        calls.append(time.time())
+        if len(calls) <= failures:
+            raise UploadError('Serveur injoignable', retryable)
+        body = MultipartFileBody('file', path, filename, progress=progress)
+        while body.read(1024):
+            pass
+        body.close()
+    return upload
+
+
+def test_upload_queue():
+    """Uploads run in the background, retry, report and persist"""
+    original = upload_queue.RETRY_BASE_DELAY, upload_queue.MAX_ATTEMPTS
+    upload_queue.RETRY_BASE_DELAY, upload_queue.MAX_ATTEMPTS = 0.05, 3
+    try:
+        assert retry_delay(1) == 0.05 and retry_delay(3) == 0.2
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, 'export.pdf')
+            with open(pdf_path, 'wb') as f:
+                f.write(b'%PDF-1.4\n' + b'0' * 10000)
+            queue_file = os.path.join(tmp_dir, 'upload_queue.json')
+
+            # Success after two retryable failures
+            calls = []
+            uploads = UploadQueue(queue_file, upload=fake_upload(calls, failures=2), token=lambda: make_token(1))
+            uploads.start()
+            uploads.enqueue(pdf_path, 'export.pdf')
+            events = wait_for(uploads.events, ('done', 'failed'))
+            kinds = [event[0] for event in events]
+            assert kinds.count('retry') == 2 and kinds[-1] == 'done'
+            assert calls[2] - calls[1] >= calls[1] - calls[0] >= 0.04  # backoff grows
+            assert events[-2][0] == 'progress' and events[-2][2] == events[-2][3]
+            assert uploads.pending() == []
+
+            # Retries exhausted: a single failure report
+            calls.clear()
+            uploads.upload = fake_upload(calls, failures=99)
+            uploads.enqueue(pdf_path, 'export.pdf')
+            events = wait_for(uploads.events, ('done', 'failed'))
+            assert [event[0] for event in events] == ['retry', 'retry', 'failed']
+            assert len(calls) == 3
+
+            # Rejected by the server: no retry
+            calls.clear()
+            uploads.upload = fake_upload(calls, failures=99, retryable=False)
+            uploads.enqueue(pdf_path, 'export.pdf')
+            events = wait_for(uploads.events, ('done', 'failed'))
+            assert [event[0] for event in events] == ['failed'] and len(calls) == 1
+            uploads.stop(5)
+
+            # Queued while stopped (app closed), resumed by a new queue on the same file
+            stopped = UploadQueue(queue_file, token=lambda: make_token(1))
+            stopped.enqueue(pdf_path, 'later.pdf')
+            calls.clear()
+            resumed = UploadQueue(queue_file, upload=fake_upload(calls), token=lambda: make_token(1))
+            assert [entry['filename'] for entry in resumed.pending()] == ['later.pdf']
+            resumed.start()
+            events = wait_for(resumed.events, ('done', 'failed'))
+            assert events[-1] == ('done', 'later.pdf')
+            resumed.stop(5)
+            assert UploadQueue(queue_file).pending() == []
+
+            # The local file was deleted before it could be sent
+            missing = UploadQueue(queue_file, upload=fake_upload(calls), token=lambda: make_token(1))
+            missing.start()
+            missing.enqueue(os.path.join(tmp_dir, 'gone.pdf'), 'gone.pdf')
+            assert wait_for(missing.events, ('done', 'failed'))[-1][0] == 'failed'
+            missing.stop(5)
+    finally:
+        upload_queue.RETRY_BASE_DELAY, upload_queue.MAX_ATTEMPTS = original
+
+
+def test_upload_owner():
+    """An upload waits, attempts untouched, until its owner is logged in"""
+    original = upload_queue.IDENTITY_POLL_INTERVAL
+    upload_queue.IDENTITY_POLL_INTERVAL = 0.05
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, 'export.pdf')
+            with open(pdf_path, 'wb') as f:
+                f.write(b'%PDF-1.4\n')
+            logged_in = [make_token(1)]
+            calls = []
+            uploads = UploadQueue(os.path.join(tmp_dir, 'upload_queue.json'),
+                                  upload=fake_upload(calls, failures=99), token=lambda: logged_in[0])
+            uploads.enqueue(pdf_path, 'export.pdf')
+            assert uploads.pending()[0]['owner'] == '1'
+
+            # Not logged in, nothing can be queued
+            logged_in[0] = None
+            try:
+                uploads.enqueue(pdf_path, 'anonymous.pdf')
+            except UploadError as e:
+                assert not e.retryable
+            else:
+                raise AssertionError('enqueue should need a login')
+
+            # Logged out, then logged in as someone else: nothing is sent
+            uploads.start()
+            time.sleep(0.2)
+            logged_in[0] = make_token(2)
+            time.sleep(0.2)
+            assert calls == []
+            assert uploads.pending()[0]['attempts'] == 0
+
+            # The owner logs in again
+            uploads.upload = fake_upload(calls)
+            logged_in[0] = make_token(1)
+            assert wait_for(uploads.events, ('done', 'failed'))[-1] == ('done', 'export.pdf')
+            assert len(calls) == 1
+            uploads.stop(5)
+    finally:
+        upload_queue.IDENTITY_POLL_INTERVAL = original
+
+
+if __name__ == "__main__":
+    test_upload_queue()
+    test_upload_owner()
+    print("✅ Upload queue tests passed!")
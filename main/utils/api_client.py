@@ -0,0 +1,188 @@
+import json
+import time
+import hashlib
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.settings import get_settings_file
+
+DEFAULT_BASE_URL = 'https://127.0.0.1:5000'
+# CA that signs the backend certificate (backend/certs, next to this client in the source tree)
+DEFAULT_CA_CERT = Path(__file__).resolve().parents[2] / 'backend' / 'certs' / 'ca.cert.pem'
+DEFAULT_TIMEOUT = (5, 30)  # connect, read (seconds)
+POOL_SIZE = 8
+CACHE_TTL = 30  # seconds a cached GET is served without asking the server
+
+# Cached paths whose content depends on files and their sharing
+FILE_LISTS = ('/api/user/files', '/api/user/admin/files')
+
+CacheEntry = namedtuple('CacheEntry', ['response', 'etag', 'fetched'])
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class CACertificateError(requests.exceptions.SSLError):
+    """The backend CA certificate is missing, so the server cannot be verified."""
+
+
+class ApiClient:
+    """HTTPS client for the backend API, shared by the whole app.
+
+    One requests.Session keeps connections to the server alive, so calls
+    after the first skip the TCP and TLS handshakes. The server certificate
+    is verified against the backend CA only (not the system store); without
+    that CA the client refuses to connect, unless insecure is set. Every
+    request gets a timeout; connection failures are retried for all
+    methods, and 502/503/504 or read errors only for idempotent ones.
+
+    get_cached() adds a response cache for lists that rarely change: an
+    entry is served from memory while younger than the caller's TTL, then revalidated with
+    If-None-Match (a 304 costs the server no serialization or transfer).
+    Entries are keyed by path, parameters and token, identical GETs in
+    flight at the same time share one request, and invalidate() must be
+    called after any call that changes what a cached path returns.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, ca_cert=None, timeout=DEFAULT_TIMEOUT, retries=2,
+                 insecure=False):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._cache = {}
+        self._inflight = {}
+        self._cache_lock = threading.Lock()
+        self._generation = 0
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # POST is never replayed
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        ca_cert = ca_cert or DEFAULT_CA_CERT
+        if insecure:
+            self.session.verify = False
+        elif Path(ca_cert).exists():
+            self.session.verify = str(ca_cert)
+        else:
+            raise CACertificateError(
+                f"Certificat CA introuvable : {ca_cert}. "
+                "Renseignez api_ca_cert dans les paramètres pour vérifier le serveur."
+            )
+
+    @classmethod
+    def from_settings(cls):
+        """Client configured from settings.json (api_base_url, api_ca_cert, api_timeout).
+
+        api_insecure: true turns certificate verification off; it is never
+        turned off otherwise.
+        """
+        settings = {}
+        settings_path = get_settings_file()
+        if settings_path.exists():
+            try:
+                with open(settings_path, 'r', encoding='utf-8') as f:
+                    settings = json.load(f)
+            except Exception:
+                pass
+        timeout = settings.get('api_timeout')
+        return cls(
+            base_url=settings.get('api_base_url', DEFAULT_BASE_URL),
+            ca_cert=settings.get('api_ca_cert'),
+            timeout=tuple(timeout) if isinstance(timeout, list) else (timeout or DEFAULT_TIMEOUT),
+            insecure=settings.get('api_insecure') is True
+        )
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        """Send a request to path (e.g. '/api/user/files'); same arguments as requests."""
+        kwargs.setdefault('timeout', self.timeout)
+        # Passed explicitly: requests lets REQUESTS_CA_BUNDLE override Session.verify
+        kwargs.setdefault('verify', self.session.verify)
+        return self.session.request(method, self.url(path), **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def get_cached(self, path, ttl=CACHE_TTL, params=None, headers=None, **kwargs):
+        """GET through the response cache.
+
+        A cached response younger than ttl seconds is returned as is; ttl=0
+        always revalidates with the server (e.g. for refresh buttons).
+        """
+        authorization = (headers or {}).get('Authorization', '')
+        key = (
+            path,
+            tuple(sorted((params or {}).items())),
+            hashlib.sha256(authorization.encode()).hexdigest()
+        )
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() - entry.fetched < ttl:
+                return entry.response
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                future = self._inflight[key] = Future()
+                generation = self._generation
+        if inflight is not None:
+            return inflight.result()
+
+        try:
+            request_headers = dict(headers or {})
+            if entry is not None and entry.etag:
+                request_headers['If-None-Match'] = entry.etag
+            response = self.get(path, params=params, headers=request_headers, **kwargs)
+            if response.status_code == 304 and entry is not None:
+                response = entry.response
+            with self._cache_lock:
+                # Not stored if an invalidation happened while the request was in flight
+                if response.status_code == 200 and generation == self._generation:
+                    self._cache[key] = CacheEntry(response, response.headers.get('ETag'), time.monotonic())
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, *prefixes):
+        """Drop cached responses for paths starting with any prefix (all if none given)."""
+        with self._cache_lock:
+            self._generation += 1
+            for key in list(self._cache):
+                if not prefixes or key[0].startswith(prefixes):
+                    del self._cache[key]
+
+    def close(self):
+        self.session.close()
+
+
+def get_api_client():
+    """The app-wide ApiClient, created from the settings on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ApiClient.from_settings()
+        return _client
@@ -1,3 +1,6 @@
+import json
+import base64
+
 # Global variable to store JWT token across all modules
 JWT_TOKEN_GLOBAL = None
 
@@ -8,4 +11,17 @@ def set_jwt_token_global(token):
 
 def get_jwt_token_global():
     """Get the global JWT token"""
-    return JWT_TOKEN_GLOBAL 
\ No newline at end of file
+    return JWT_TOKEN_GLOBAL 
+
+def token_identity(token):
+    """The user id ('sub' claim) a JWT was issued to, or None.
+
+    The signature is not checked (the server does that); this only tells
+    which account a token belongs to.
+    """
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return str(claims['sub'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
@@ -1,6 +1,6 @@
 def on_canvas_configure(app, event):
-    app.canvas.itemconfigure("container", width=event.width)
-    app.canvas.configure(scrollregion=app.canvas.bbox("all"))
+    app.page_view.on_canvas_configure(event)
 
-def on_frame_configure(app, event):
-    app.canvas.configure(scrollregion=app.canvas.bbox("all"))
+def on_canvas_scroll(app, first, last):
+    app.v_scroll.set(first, last)
+    app.page_view.schedule_update()
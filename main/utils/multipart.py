@@ -0,0 +1,77 @@
+import os
+import uuid
+
+CHUNK_SIZE = 64 * 1024
+
+
+class MultipartFileBody:
+    """multipart/form-data body for one file field, read from disk as it is sent.
+
+    requests builds the body of files= uploads in memory; passing this as
+    data= instead streams it with a Content-Length, so uploading a file
+    costs one chunk of memory whatever its size. progress, if given, is
+    called with (bytes sent, total bytes) after each read.
+    """
+
+    def __init__(self, field, path, filename=None, content_type='application/octet-stream', progress=None):
+        self.path = path
+        self.progress = progress
+        self._sent = 0
+        self.boundary = uuid.uuid4().hex
+        filename = (filename or os.path.basename(path)).replace('"', '')
+        self._head = (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode('utf-8')
+        self._tail = f'\r\n--{self.boundary}--\r\n'.encode('ascii')
+        self._size = os.path.getsize(path)
+        self._file = None
+        self._parts = None
+
+    @property
+    def content_type(self):
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self):
+        return len(self._head) + self._size + len(self._tail)
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        if self._parts is None:
+            self._file = open(self.path, 'rb')
+            self._parts = [self._head, None, self._tail]
+        if size is None or size < 0:
+            size = len(self)
+        out = b''
+        while self._parts and len(out) < size:
+            part = self._parts[0]
+            wanted = size - len(out)
+            if part is None:
+                # The file itself, between the head and the tail
+                data = self._file.read(wanted)
+                if data:
+                    out += data
+                    continue
+                self._file.close()
+                self._parts.pop(0)
+            else:
+                out += part[:wanted]
+                if len(part) > wanted:
+                    self._parts[0] = part[wanted:]
+                else:
+                    self._parts.pop(0)
+        self._sent += len(out)
+        if self.progress is not None and out:
+            self.progress(self._sent, len(self))
+        return out
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
@@ -0,0 +1,211 @@
+"""
+Reading and writing .sincus project files.
+
+Version 1 files hold the project dict (see Sincus.project_data) as JSON.
+Version 2 files are a compressed binary container:
+
+    MAGIC
+    header   u32 length + zlib(JSON: version, project_info, font_size, page_count)
+    pages    one zlib(JSON {"columns": [...], "boxes": [...]}) record per page
+    index    u64 offset + u32 length of each page record
+    trailer  u64 offset of the index + u32 page count
+
+The header is read without touching the pages, and the trailer and index
+locate any page, so opening a project and reading one page take the same
+time whatever its size. SincusReader reads both versions; write_project()
+writes version 2.
+"""
+import os
+import json
+import zlib
+import struct
+
+MAGIC = b'SINCUS\x00\x02'
+VERSION = '2.0'
+COMPRESSION_LEVEL = 6
+# Largest decompressed header or page record; a page is a few KB of text
+MAX_RECORD_BYTES = 16 * 1024 * 1024
+
+_LENGTH = struct.Struct('<I')
+_INDEX_ENTRY = struct.Struct('<QI')
+_TRAILER = struct.Struct('<QI')
+
+
+class SincusFormatError(ValueError):
+    """The file is not a readable .sincus project."""
+
+
+def _pack(obj):
+    data = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return zlib.compress(data, COMPRESSION_LEVEL)
+
+
+def _unpack(data):
+    """Decode a header or page record, which must be a JSON object."""
+    decompressor = zlib.decompressobj()
+    try:
+        raw = decompressor.decompress(data, MAX_RECORD_BYTES)
+    except zlib.error as e:
+        raise SincusFormatError(f"Fichier .sincus endommagé : {e}")
+    # Bounded, so a small file cannot expand into gigabytes
+    if decompressor.unconsumed_tail or len(raw) >= MAX_RECORD_BYTES:
+        raise SincusFormatError("Fichier .sincus endommagé : enregistrement trop volumineux")
+    if not decompressor.eof:
+        raise SincusFormatError("Fichier .sincus tronqué")
+    try:
+        record = json.loads(raw.decode('utf-8'))
+    except ValueError as e:
+        raise SincusFormatError(f"Fichier .sincus endommagé : {e}")
+    if not isinstance(record, dict):
+        raise SincusFormatError("Fichier .sincus endommagé : enregistrement invalide")
+    return record
+
+
+def write_project(path, save_data):
+    """Write a project dict (pages_data, log_boxes_data, ...) as a version 2 file."""
+    pages_data = save_data.get('pages_data', [])
+    log_boxes_data = save_data.get('log_boxes_data', [])
+    header = _pack({
+        'version': VERSION,
+        'project_info': save_data.get('project_info', {}),
+        'font_size': save_data.get('font_size', 12),
+        'page_count': len(pages_data)
+    })
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header)))
+        f.write(header)
+        index = []
+        for page_idx, columns in enumerate(pages_data):
+            # None keeps the new-page default box, as for v1 pages without log_boxes_data
+            boxes = log_boxes_data[page_idx] if page_idx < len(log_boxes_data) else None
+            record = _pack({'columns': columns, 'boxes': boxes})
+            index.append(_INDEX_ENTRY.pack(f.tell(), len(record)))
+            f.write(record)
+        index_offset = f.tell()
+        f.write(b''.join(index))
+        f.write(_TRAILER.pack(index_offset, len(index)))
+    os.replace(tmp_path, path)
+
+
+class SincusReader:
+    """An open .sincus project (either version).
+
+    project_info, font_size, version and page_count are available as soon
+    as it is open; page(i) returns the (columns, boxes) of one page, boxes
+    being None when the file has none for it. A version 2 file stays open
+    until close().
+
+    source is a path or a seekable binary file, such as an uploaded file;
+    a file passed in is closed along with the reader.
+    """
+
+    def __init__(self, source):
+        if hasattr(source, 'read'):
+            self.path = getattr(source, 'name', None)
+            self._file = source
+        else:
+            self.path = source
+            self._file = open(source, 'rb')
+        try:
+            if self._file.read(len(MAGIC)) == MAGIC:
+                self._read_header()
+            else:
+                self._file.seek(0)
+                data = self._file.read()
+                self.close()
+                try:
+                    self._set_dict(json.loads(data.decode('utf-8')))
+                except (UnicodeDecodeError, ValueError) as e:
+                    raise SincusFormatError(f"Fichier .sincus invalide : {e}")
+        except BaseException:
+            self.close()
+            raise
+
+    @classmethod
+    def from_dict(cls, save_data):
+        """Reader over a project dict already in memory (version 1 layout)."""
+        reader = cls.__new__(cls)
+        reader.path = None
+        reader._file = None
+        reader._set_dict(save_data)
+        return reader
+
+    def _set_dict(self, save_data):
+        if not isinstance(save_data, dict):
+            raise SincusFormatError("Fichier .sincus invalide")
+        self.version = str(save_data.get('version', '1.0'))
+        self.project_info = save_data.get('project_info', {})
+        self.font_size = save_data.get('font_size', 12)
+        self._pages_data = save_data.get('pages_data', [])
+        self._log_boxes_data = save_data.get('log_boxes_data', [])
+        self.page_count = len(self._pages_data)
+        self._index_offset = None  # version 2 only
+
+    def _read_header(self):
+        self._pages_data = None
+        self._index_offset = None
+        raw = self._file.read(_LENGTH.size)
+        if len(raw) != _LENGTH.size:
+            raise SincusFormatError("Fichier .sincus tronqué")
+        header = _unpack(self._file.read(_LENGTH.unpack(raw)[0]))
+        self.version = header.get('version', VERSION)
+        self.project_info = header.get('project_info', {})
+        self.font_size = header.get('font_size', 12)
+        self.page_count = header.get('page_count', 0)
+        if not isinstance(self.page_count, int) or isinstance(self.page_count, bool) or self.page_count < 0:
+            raise SincusFormatError("Nombre de pages du fichier .sincus invalide")
+
+    def _read_trailer(self):
+        try:
+            self._file.seek(-_TRAILER.size, os.SEEK_END)
+        except OSError:
+            raise SincusFormatError("Fichier .sincus tronqué")
+        index_offset, count = _TRAILER.unpack(self._file.read(_TRAILER.size))
+        if count != self.page_count:
+            raise SincusFormatError("Index du fichier .sincus incohérent")
+        self._index_offset = index_offset
+
+    def page(self, page_idx):
+        """(columns, boxes) of one page, decoding only that page."""
+        if not 0 <= page_idx < self.page_count:
+            raise IndexError(page_idx)
+        if self._pages_data is not None:
+            boxes = self._log_boxes_data[page_idx] if page_idx < len(self._log_boxes_data) else None
+            return self._pages_data[page_idx], boxes
+        if self._file is None:
+            raise SincusFormatError("Fichier .sincus fermé")
+        if self._index_offset is None:
+            self._read_trailer()
+        self._file.seek(self._index_offset + page_idx * _INDEX_ENTRY.size)
+        entry = self._file.read(_INDEX_ENTRY.size)
+        if len(entry) != _INDEX_ENTRY.size:
+            raise SincusFormatError("Fichier .sincus tronqué")
+        offset, length = _INDEX_ENTRY.unpack(entry)
+        self._file.seek(offset)
+        record = _unpack(self._file.read(length))
+        return record.get('columns', []), record.get('boxes')
+
+    def to_dict(self):
+        """The whole project as a dict in the version 1 layout."""
+        pages = [self.page(page_idx) for page_idx in range(self.page_count)]
+        return {
+            'project_info': self.project_info,
+            'font_size': self.font_size,
+            'pages_data': [columns for columns, _ in pages],
+            'log_boxes_data': [boxes for _, boxes in pages],
+            'version': self.version
+        }
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -2,6 +2,8 @@ import tkinter as tk
 
 def toggle_bold(app):
     text_widget = app.current_text_widget
+    if text_widget is None:
+        return  # No focused column (its page was scrolled away)
     try:
         start = text_widget.index("sel.first")
         end = text_widget.index("sel.last")
@@ -18,6 +20,8 @@ def toggle_bold(app):
     else:
         text_widget.tag_add("bold", start, end)
         app.bold_btn.state(['pressed'])
+    # Tag changes do not set the modified flag the autosave looks at
+    text_widget.edit_modified(True)
 
 def handle_key_press(app, event):
 
@@ -27,7 +31,4 @@ def handle_key_press(app, event):
 
 def set_current_page(app, text_widget):
     app.current_text_widget = text_widget
-    for page in app.pages:
-        if text_widget in page:
-            app.current_page = page
-            break
\ No newline at end of file
+    app.current_page = app.page_view.page_of(text_widget)
\ No newline at end of file
@@ -0,0 +1 @@
+flask --app backend/run.py db-upgrade
\ No newline at end of file